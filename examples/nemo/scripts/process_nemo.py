@@ -148,6 +148,8 @@ if __name__ == "__main__":
         # Since we're in Python we could call psyclone.generator.main()
         # directly but PSyclone is not designed to be called repeatedly
         # in that way and doesn't clear up state between invocations.
+        # (The psyclone-batch command does reset that state and so can
+        # process many files within a single process.)
         tstart = perf_counter()
         rtype = os.system(" ".join(args + extra_args))
         tstop = perf_counter()
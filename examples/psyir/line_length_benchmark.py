@@ -0,0 +1,140 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+'''A simple Python script that measures the time taken to line wrap
+the PSy-layer code that PSyclone generates for an LFRic algorithm
+(examples/lfric/code/gw_mixed_schur_preconditioner_alg_mod.x90). The
+generated code is repeated in order to obtain the amount of code of a
+large application. The lines are wrapped with a single precompiled
+regular expression to class them and the wrapped lines are joined once,
+whereas the original implementation, which is included for comparison,
+grew the output string line by line. The lines may also be wrapped by a
+pool of processes. In order to use it you must first install PSyclone.
+See README.md in the top-level psyclone directory.
+
+Once you have psyclone installed, this script may be run by doing:
+
+>>> python line_length_benchmark.py
+
+'''
+import os
+import re
+
+from psyclone.generator import generate
+from psyclone.line_length import FortLineLength, find_break_point
+
+from benchmark_utils import measure
+
+ALG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        os.pardir, "lfric", "code",
+                        "gw_mixed_schur_preconditioner_alg_mod.x90")
+
+
+class OriginalFortLineLength(FortLineLength):
+    ''' The original implementation of line wrapping, which classes each
+    long line with a separate regular expression per type and grows the
+    output string one line at a time.
+
+    :param int line_length: the maximum allowed line length.
+
+    '''
+    def __init__(self, line_length=132):
+        super().__init__(line_length)
+        self._stat = re.compile(r'^\s*(INTEGER|REAL|TYPE|CALL|SUBROUTINE|USE)',
+                                flags=re.I)
+        self._omp = re.compile(r'^\s*!\$OMP', flags=re.I)
+        self._acc = re.compile(r'^\s*!\$ACC', flags=re.I)
+        self._comment = re.compile(r'^\s*!')
+
+    def process(self, fortran_in, processes=1):
+        ''' takes fortran code as a string as input and output fortran
+        code as a string with any long lines wrapped appropriately '''
+
+        fortran_out = ""
+        for line in fortran_in.split('\n'):
+            if len(line) > self._line_length:
+                line_type = self._get_line_type(line)
+
+                c_start = self._cont_start[line_type]
+                c_end = self._cont_end[line_type]
+                key_list = self._key_lists[line_type]
+
+                break_point = find_break_point(
+                    line, self._line_length-len(c_end), key_list)
+                fortran_out += line[:break_point] + c_end + "\n"
+                line = line[break_point:]
+                while len(line) + len(c_start) > self._line_length:
+                    break_point = find_break_point(
+                        line, self._line_length-len(c_end)-len(c_start),
+                        key_list)
+                    fortran_out += c_start + line[:break_point] + c_end + "\n"
+                    line = line[break_point:]
+                if line:
+                    fortran_out += c_start + line + "\n"
+            else:
+                fortran_out += line + "\n"
+
+        # We add an extra newline so remove it when we return
+        return fortran_out[:-1]
+
+    def _get_line_type(self, line):
+        ''' Classes lines into diffrent types. '''
+        if self._stat.match(line):
+            return "statement"
+        if self._omp.match(line):
+            return "openmp_directive"
+        if self._acc.match(line):
+            return "openacc_directive"
+        if self._comment.match(line):
+            return "comment"
+        return "unknown"
+
+
+if __name__ == "__main__":
+    _, PSY = generate(ALG_FILE, api="dynamo0.3")
+    # Repeat the generated code to obtain a large amount of code.
+    CODE = "\n".join([str(PSY)] * 200)
+    LINES = CODE.split("\n")
+    for LENGTH in [132, 80]:
+        ORIGINAL = OriginalFortLineLength(line_length=LENGTH)
+        FLL = FortLineLength(line_length=LENGTH)
+        print(f"{len(LINES)} lines of PSy-layer code, of which "
+              f"{sum(len(line) > LENGTH for line in LINES)} are longer "
+              f"than {LENGTH} characters:")
+        assert ORIGINAL.process(CODE) == FLL.process(CODE)
+        assert FLL.process(CODE, processes=4) == FLL.process(CODE)
+        measure("original wrapping", lambda: ORIGINAL.process(CODE))
+        measure("wrapping", lambda: FLL.process(CODE))
+        for PROCESSES in [2, 4]:
+            measure(f"wrapping with {PROCESSES} processes",
+                    lambda: FLL.process(CODE, processes=PROCESSES))
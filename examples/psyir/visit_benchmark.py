@@ -0,0 +1,126 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+'''A simple Python script that measures the time taken by the Fortran
+back end to write the PSyIR of a large NEMO routine (the tracer-advection
+routine in examples/nemo/code). The back end looks up the method that
+handles each class of node once and then caches it whereas the original
+implementation, which is included for comparison, tried each of the
+candidate method names for every node that it visited. In order to use it
+you must first install PSyclone. See README.md in the top-level psyclone
+directory.
+
+Once you have psyclone installed, this script may be run by doing:
+
+>>> python visit_benchmark.py
+
+'''
+import inspect
+import os
+
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.backend.visitor import VisitorError
+from psyclone.psyir.frontend.fortran import FortranReader
+from psyclone.psyir.nodes import Node, Routine
+from psyclone.psyir.nodes.commentable_mixin import CommentableMixin
+
+from benchmark_utils import measure
+
+NEMO_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, "nemo", "code", "tra_adv.F90")
+
+
+class ProbingFortranWriter(FortranWriter):
+    ''' A FortranWriter that uses the original implementation of the
+    dispatch to the visitor methods.
+
+    '''
+    def _visit(self, node):
+        ''' The original implementation of PSyIRVisitor._visit which tries
+        each of the candidate method names in turn for every node.
+
+        :param node: a PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: text representation of the PSyIR node sub-tree.
+        :rtype: str
+
+        '''
+        if self._validate_nodes:
+            node.validate_global_constraints()
+        possible_method_names = [curr_class.__name__.lower()+"_node"
+                                 for curr_class in inspect.getmro(type(node))]
+        possible_method_names.remove("object_node")
+        for method_name in possible_method_names:
+            try:
+                # pylint: disable=eval-used
+                node_result = eval(f"self.{method_name}(node)")
+                if not isinstance(node_result, str):
+                    return node_result
+                result = ""
+                if isinstance(node, CommentableMixin):
+                    if node.preceding_comment and self._COMMENT_PREFIX:
+                        result += (self._nindent + self._COMMENT_PREFIX +
+                                   node.preceding_comment + "\n")
+                result += node_result
+                if isinstance(node, CommentableMixin):
+                    if node.inline_comment and self._COMMENT_PREFIX:
+                        result = (result[:-1] + "  " + self._COMMENT_PREFIX +
+                                  node.inline_comment + "\n")
+                return result
+            except AttributeError as excinfo:
+                if f"attribute '{method_name}'" not in str(excinfo):
+                    raise
+        raise VisitorError(f"Unsupported node '{type(node).__name__}'")
+
+
+if __name__ == "__main__":
+    PSYIR = FortranReader().psyir_from_file(NEMO_FILE)
+    WRITER = FortranWriter()
+    PROBING_WRITER = ProbingFortranWriter()
+    print(f"{os.path.basename(NEMO_FILE)} with "
+          f"{len(PSYIR.walk(Node))} nodes:")
+    assert WRITER(PSYIR) == PROBING_WRITER(PSYIR)
+    measure("probing write of the routine", lambda: PROBING_WRITER(PSYIR),
+            number=10)
+    measure("write of the routine", lambda: WRITER(PSYIR), number=10)
+    # Visit the statements of the routine directly in order to exclude the
+    # time taken to copy the tree (and to merge the symbol tables).
+    # pylint: disable=protected-access
+    STATEMENTS = PSYIR.walk(Routine)[0].children
+    measure(f"probing visit of the {len(STATEMENTS)} statements",
+            lambda: [PROBING_WRITER._visit(stmt) for stmt in STATEMENTS],
+            number=10)
+    measure(f"visit of the {len(STATEMENTS)} statements",
+            lambda: [WRITER._visit(stmt) for stmt in STATEMENTS],
+            number=10)
@@ -0,0 +1,126 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+'''A simple Python script that measures the throughput of the Fortran
+back end when it is used to write small parts (e.g. expressions) of a
+large PSyIR tree, as is done by many transformations and by the
+dependency analysis. The back end only copies (and lowers) the tree when
+this is required and so writing a node that does not contain any DSL
+concepts no longer requires a copy of the whole tree. In order to use it
+you must first install PSyclone. See README.md in the top-level psyclone
+directory.
+
+Once you have psyclone installed, this script may be run by doing:
+
+>>> python writer_benchmark.py
+
+'''
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.nodes import (
+    Assignment, BinaryOperation, Container, Literal, Loop, Node, Reference,
+    Routine)
+from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE, REAL_TYPE
+
+from benchmark_utils import measure
+
+
+def create_module(nloops=1000):
+    ''' Creates the PSyIR of a module containing a routine with many loops,
+    each of which contains a single assignment.
+
+    :param int nloops: the number of loops.
+
+    :returns: the PSyIR of the module.
+    :rtype: :py:class:`psyclone.psyir.nodes.Container`
+
+    '''
+    container = Container("big_mod")
+    routine = Routine("big")
+    container.addchild(routine)
+    table = routine.symbol_table
+    index = table.new_symbol("i", symbol_type=DataSymbol,
+                             datatype=INTEGER_TYPE)
+    scalar = table.new_symbol("a", symbol_type=DataSymbol,
+                              datatype=REAL_TYPE)
+    for _ in range(nloops):
+        rhs = BinaryOperation.create(BinaryOperation.Operator.ADD,
+                                     Reference(scalar), Reference(index))
+        body = [Assignment.create(Reference(scalar), rhs)]
+        routine.addchild(Loop.create(index, Literal("1", INTEGER_TYPE),
+                                     Literal("10", INTEGER_TYPE),
+                                     Literal("1", INTEGER_TYPE), body))
+    return container
+
+
+def copying_call(writer, node):
+    ''' The original implementation of calling a back end, which always
+    copies (and lowers) the whole tree of the node before visiting it.
+
+    :param writer: the back end to use.
+    :type writer: :py:class:`psyclone.psyir.backend.visitor.PSyIRVisitor`
+    :param node: the node to write.
+    :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+    :returns: the text representation of the node.
+    :rtype: str
+
+    '''
+    tree_copy = node.root.copy()
+    node_copy = tree_copy.walk(Node)[node.abs_position]
+    node_copy.lower_to_language_level()
+    # pylint: disable=protected-access
+    return writer._visit(tree_copy.walk(Node)[node.abs_position])
+
+
+if __name__ == "__main__":
+    WRITER = FortranWriter()
+    CONTAINER = create_module()
+    ROUTINE = CONTAINER.children[0]
+    # A sample of the expressions spread throughout the routine.
+    EXPRESSIONS = ROUTINE.walk(BinaryOperation)[::20]
+    print(f"Module with {len(ROUTINE.walk(Loop))} loops and "
+          f"{len(CONTAINER.walk(Node))} nodes:")
+    assert ([copying_call(WRITER, expr) for expr in EXPRESSIONS] ==
+            [WRITER(expr) for expr in EXPRESSIONS])
+    assert copying_call(WRITER, ROUTINE) == WRITER(ROUTINE)
+    assert copying_call(WRITER, CONTAINER) == WRITER(CONTAINER)
+    measure(f"copying write of {len(EXPRESSIONS)} expressions",
+            lambda: [copying_call(WRITER, expr) for expr in EXPRESSIONS])
+    measure(f"write of {len(EXPRESSIONS)} expressions",
+            lambda: [WRITER(expr) for expr in EXPRESSIONS])
+    measure("copying write of the routine",
+            lambda: copying_call(WRITER, ROUTINE))
+    measure("write of the routine", lambda: WRITER(ROUTINE))
+    measure("copying write of the module",
+            lambda: copying_call(WRITER, CONTAINER))
+    measure("write of the module", lambda: WRITER(CONTAINER))
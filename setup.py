@@ -170,7 +170,8 @@ if __name__ == '__main__':
                      "pytest-pylint", "pytest-flakes", "pytest-pep257"],
         },
         include_package_data=True,
-        scripts=['bin/psyclone', 'bin/psyclone-kern', 'bin/psyad'],
+        scripts=['bin/psyclone', 'bin/psyclone-kern', 'bin/psyad',
+                 'bin/psyclone-batch'],
         data_files=[
             ('share/psyclone',
              ['config/psyclone.cfg'])]+EXAMPLES+TUTORIAL+LIBS,)
@@ -0,0 +1,480 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''
+    This module provides the 'run' routine of the psyclone-batch tool
+    which is intended to be driven from the bin/psyclone-batch executable
+    script. It processes many source files (e.g. all of the NEMO source
+    files of a build) within a single Python interpreter so that the cost
+    of starting Python, importing PSyclone and the optimisation script and
+    loading the configuration file is only paid once rather than once per
+    file. The global state that PSyclone accumulates while processing a
+    file is reset before the next file is processed. Files may also be
+    distributed over a pool of worker processes, each of which sets up
+    the configuration and the fparser2 parser once.
+
+'''
+
+import argparse
+import contextlib
+import copy
+import io
+import itertools
+import multiprocessing
+import os
+import sys
+import traceback
+from collections import namedtuple
+from time import perf_counter
+
+from fparser.one import parsefortran
+from fparser.two.parser import ParserFactory
+from fparser.two.symbol_table import SYMBOL_TABLES
+
+from psyclone import configuration
+from psyclone.alg_gen import NoInvokesError
+from psyclone.configuration import Config, ConfigurationError
+from psyclone.core import SymbolicMaths
+from psyclone.errors import GenerationError
+from psyclone.generator import (API_WITHOUT_ALGORITHM, _generate,
+                                write_unicode_file)
+from psyclone.kernel_cache import KernelCache
+from psyclone.line_length import FortLineLength
+from psyclone.parse.kernel import KernelFileIndex
+from psyclone.parse.utils import ParseError
+from psyclone.profiler import Profiler
+from psyclone.version import __VERSION__
+
+# The outcome of processing a single file. 'error' is None if PSyclone
+# succeeded and otherwise holds the text describing the failure. 'output'
+# holds anything that was written to stdout or stderr while processing
+# the file so that it can be reported in the order in which the files
+# were supplied, even when they are processed in parallel.
+FileResult = namedtuple("FileResult", "filename time error output")
+
+# The state of a worker process in the pool used when processing files
+# in parallel: the pristine configuration, the API and the command-line
+# options. Set by _init_worker.
+_WORKER_STATE = None
+
+
+def reset_state(config, profile_options):
+    '''
+    Resets the global state that PSyclone accumulates while processing a
+    file so that the next file is processed exactly as it would be by a
+    fresh invocation of PSyclone.
+
+    :param config: the pristine configuration (i.e. as set up from the \
+        config file and the command-line options) to install as the \
+        Config singleton. A copy is installed so that any changes made \
+        while processing a file (e.g. by a transformation script) do not \
+        leak into the processing of subsequent files.
+    :type config: :py:class:`psyclone.configuration.Config`
+    :param profile_options: the automatic-profiling options to use.
+    :type profile_options: Optional[List[str]]
+
+    '''
+    # pylint: disable=protected-access
+    Config._instance = copy.deepcopy(config)
+    Profiler.set_options(profile_options)
+    SymbolicMaths._instance = None
+    # Clear any symbol tables and parse trees cached by fparser.
+    SYMBOL_TABLES.clear()
+    parsefortran.FortranParser.cache.clear()
+
+
+def output_filenames(filename, api, out_dir):
+    '''
+    Constructs the names of the files to which the transformed algorithm
+    layer and the generated PSy layer for the supplied source file are
+    written. For APIs without an algorithm layer (NEMO) the PSy layer
+    takes the name of the source file. Otherwise they are written to
+    '<stem>_alg.f90' and '<stem>_psy.f90', respectively.
+
+    :param str filename: the source file being processed.
+    :param str api: the PSyclone API in use.
+    :param str out_dir: the directory in which to put the output files.
+
+    :returns: the algorithm-layer and PSy-layer filenames. The former is \
+        None if the API has no algorithm layer.
+    :rtype: Tuple[Optional[str], str]
+
+    '''
+    base_name = os.path.basename(filename)
+    if api in API_WITHOUT_ALGORITHM:
+        return None, os.path.join(out_dir, base_name)
+    stem = os.path.splitext(base_name)[0]
+    return (os.path.join(out_dir, stem + "_alg.f90"),
+            os.path.join(out_dir, stem + "_psy.f90"))
+
+
+def process_file(filename, api, out_dir, options):
+    '''
+    Runs PSyclone on a single file and writes the results to the output
+    directory. Any error is caught and reported in the returned result
+    rather than raised so that processing of other files may continue.
+    Similarly, any output produced while processing the file is captured
+    and returned in the result.
+
+    :param str filename: the source file to process.
+    :param str api: the PSyclone API to use.
+    :param str out_dir: the directory in which to put the output files.
+    :param options: the parsed command-line options.
+    :type options: :py:class:`argparse.Namespace`
+
+    :returns: the outcome of processing the file.
+    :rtype: :py:class:`psyclone.batch.FileResult`
+
+    '''
+    alg_file, psy_file = output_filenames(filename, api, out_dir)
+    if os.path.abspath(psy_file) == os.path.abspath(filename):
+        return FileResult(filename, 0.0,
+                          f"Refusing to overwrite the source file "
+                          f"'{filename}' with the generated code", "")
+
+    output = io.StringIO()
+    error = None
+    tstart = perf_counter()
+    with contextlib.redirect_stdout(output), \
+            contextlib.redirect_stderr(output):
+        try:
+            _generate_and_write(filename, api, alg_file, psy_file, options)
+        except (OSError, ParseError, GenerationError, RuntimeError) as err:
+            error = str(err)
+        except Exception:  # pylint: disable=broad-except
+            error = "Unexpected exception:\n" + traceback.format_exc()
+    return FileResult(filename, perf_counter() - tstart, error,
+                      output.getvalue())
+
+
+def _generate_and_write(filename, api, alg_file, psy_file, options):
+    '''
+    Runs PSyclone on a single file and writes the generated code to the
+    supplied files.
+
+    :param str filename: the source file to process.
+    :param str api: the PSyclone API to use.
+    :param alg_file: the file to which to write the algorithm layer or \
+        None if there is no algorithm layer.
+    :type alg_file: Optional[str]
+    :param str psy_file: the file to which to write the PSy layer.
+    :param options: the parsed command-line options.
+    :type options: :py:class:`argparse.Namespace`
+
+    '''
+    try:
+        alg, psy = _generate(filename, api=api,
+                             kernel_paths=options.directory,
+                             script_name=options.script,
+                             line_length=(options.limit == 'all'),
+                             distributed_memory=options.dist_mem,
+                             kern_out_path=options.kern_out_path,
+                             kern_naming=options.kernel_renaming)
+        psy_pieces = psy.iter_gen()
+    except NoInvokesError:
+        # As in the psyclone command, the algorithm file is output
+        # unchanged and there is no PSy layer.
+        with open(filename, "r", encoding="utf-8") as alg_fobj:
+            alg = alg_fobj.read()
+        psy_pieces = iter(())
+    # As in the psyclone command, the PSy-layer code is generated as it is
+    # written out but its first piece is generated before any code is
+    # written.
+    first_piece = next(psy_pieces, "")
+    alg_str = str(alg)
+    fll = FortLineLength() if options.limit != 'off' else None
+    if alg_file:
+        write_unicode_file(alg_str, alg_file, fll)
+    if first_piece:
+        write_unicode_file(itertools.chain([first_piece], psy_pieces),
+                           psy_file, fll)
+
+
+def configure(options):
+    '''
+    Loads the configuration file and sets up the Config singleton from the
+    supplied command-line options.
+
+    :param options: the parsed command-line options.
+    :type options: :py:class:`argparse.Namespace`
+
+    :returns: the PSyclone API to use.
+    :rtype: str
+
+    :raises ConfigurationError: if the specified API is not supported or \
+        any of the include paths or the kernel-index or kernel-cache \
+        directory is invalid.
+
+    '''
+    # If no config file name is specified, options.config is None
+    # and config will load the default config file.
+    Config.get().load(options.config)
+
+    if options.api is None:
+        api = Config.get().api
+    elif options.api not in Config.get().supported_apis:
+        raise ConfigurationError(
+            f"Unsupported API '{options.api}' specified. Supported APIs are "
+            f"{Config.get().supported_apis}.")
+    else:
+        api = options.api
+        Config.get().api = api
+
+    if options.include:
+        Config.get().include_paths = options.include
+    else:
+        Config.get().include_paths = ["./"]
+    Config.get().kernel_index_dir = options.kernel_index_dir
+    Config.get().kernel_cache_dir = options.kernel_cache
+    # The kernel search paths are indexed afresh for each run (and then
+    # reused for all of the files that are processed).
+    KernelFileIndex.clear()
+    return api
+
+
+def _init_worker(options):
+    '''
+    Initialises a worker process of the pool used when processing files
+    in parallel. The configuration is set up and the fparser2 parser is
+    created once so that they are ready for every file that the worker
+    processes.
+
+    :param options: the parsed command-line options.
+    :type options: :py:class:`argparse.Namespace`
+
+    '''
+    # pylint: disable=global-statement, protected-access
+    global _WORKER_STATE
+    # A forked worker inherits the Config of the parent process so
+    # start afresh.
+    Config._instance = None
+    Config.get(do_not_load_file=True)
+    api = configure(options)
+    ParserFactory().create(std="f2008")
+    _WORKER_STATE = (copy.deepcopy(Config.get()), api, options)
+
+
+def _process_in_worker(filename):
+    '''
+    Processes a single file within a worker process of the pool.
+
+    :param str filename: the source file to process.
+
+    :returns: the outcome of processing the file.
+    :rtype: :py:class:`psyclone.batch.FileResult`
+
+    '''
+    config, api, options = _WORKER_STATE
+    reset_state(config, options.profile)
+    return process_file(filename, api, options.out_dir, options)
+
+
+def _report(result):
+    '''
+    Reports the outcome of processing a single file.
+
+    :param result: the outcome of processing the file.
+    :type result: :py:class:`psyclone.batch.FileResult`
+
+    '''
+    if result.output:
+        print(result.output, end="")
+    if result.error is None:
+        print(f"Processed '{result.filename}' in {result.time:.2f}s")
+    else:
+        print(f"PSyclone failed on '{result.filename}' after "
+              f"{result.time:.2f}s:\n{result.error}", file=sys.stderr)
+
+
+def run(args):
+    '''
+    Driver for the psyclone-batch tool.
+
+    Parses and checks the command-line arguments and then processes each
+    of the supplied source files, either in turn or in parallel by a pool
+    of worker processes, reporting the time taken for each and any
+    failures.
+
+    :param list args: the list of command-line arguments with which \
+                      psyclone-batch has been invoked.
+    '''
+    # pylint: disable=too-many-statements,too-many-branches
+
+    # Make sure we have the supported APIs defined in the Config singleton,
+    # but postpone loading the config file till the command line was parsed
+    # in case that the user specifies a different config file.
+    Config.get(do_not_load_file=True)
+
+    parser = argparse.ArgumentParser(
+        prog="psyclone-batch",
+        description="Run the PSyclone code generator on many files within "
+        "a single process.")
+    parser.add_argument('filenames', metavar='filename', nargs='+',
+                        help='algorithm-layer (or NEMO) source file(s)')
+    parser.add_argument('-o', dest='out_dir', required=True,
+                        help='directory in which to put the generated code')
+    parser.add_argument('-okern',
+                        help='directory in which to put transformed kernels, '
+                        'default is the current working directory.')
+    parser.add_argument('-api',
+                        help=f"choose a particular API from "
+                        f"{Config.get().supported_apis}, default "
+                        f"'{Config.get().default_api}'.")
+    parser.add_argument('-s', '--script', help='filename of a PSyclone'
+                        ' optimisation script')
+    parser.add_argument(
+        '-d', '--directory', default=[], action="append", help='path to a '
+        'root directory structure containing kernel source code. Multiple '
+        'roots can be specified by using multiple -d arguments.')
+    parser.add_argument(
+        '-I', '--include', default=[], action="append",
+        help='path to Fortran INCLUDE or module files')
+    parser.add_argument(
+        '--kernel-index-dir', help='directory in which to store the indices '
+        'of the kernel source directories (-d) so that they are reused by '
+        'subsequent invocations of PSyclone.')
+    parser.add_argument(
+        '--kernel-cache', help='directory in which to cache the metadata '
+        'and PSyIR created from kernel source so that they are reused by '
+        'subsequent invocations of PSyclone. The cache must only be '
+        'writeable by trusted users.')
+    parser.add_argument(
+        '--clear-kernel-cache', action='store_true', help='remove all '
+        'entries from the kernel cache (--kernel-cache) before processing.')
+    parser.add_argument(
+        '-l', '--limit', dest='limit', default='off',
+        choices=['off', 'all', 'output'],
+        help='limit the Fortran line length to 132 characters (default '
+        '\'%(default)s\'). Use \'all\' to apply limit to both input and '
+        'output Fortran. Use \'output\' to apply line-length limit to output '
+        'Fortran only.')
+    parser.add_argument(
+        '-dm', '--dist_mem', dest='dist_mem', action='store_true',
+        help='generate distributed memory code')
+    parser.add_argument(
+        '-nodm', '--no_dist_mem', dest='dist_mem', action='store_false',
+        help='do not generate distributed memory code')
+    parser.add_argument(
+        '--kernel-renaming', default="multiple",
+        choices=configuration.VALID_KERNEL_NAMING_SCHEMES,
+        help="Naming scheme to use when re-naming transformed kernels")
+    parser.add_argument(
+        '--profile', '-p', action="append", choices=Profiler.SUPPORTED_OPTIONS,
+        help="Add profiling hooks for either 'kernels' or 'invokes'")
+    parser.add_argument(
+        '-x', dest='exit_on_error', action='store_true',
+        help='stop as soon as PSyclone fails on a file')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of files to process in parallel (default 1)')
+    parser.set_defaults(dist_mem=Config.get().distributed_memory)
+    parser.add_argument("--config", help="Config file with "
+                        "PSyclone specific options.")
+    parser.add_argument(
+        '-v', '--version', dest='version', action="store_true",
+        help=f"Display version information ({__VERSION__})")
+
+    args = parser.parse_args(args)
+
+    if args.version:
+        print(f"psyclone-batch version: {__VERSION__}")
+
+    for dir_name, flag in [(args.out_dir, "-o"), (args.okern, "-okern")]:
+        if dir_name is None:
+            continue
+        if not os.path.isdir(dir_name):
+            print(f"Specified output directory ({dir_name}) for '{flag}' "
+                  f"does not exist.", file=sys.stderr)
+            sys.exit(1)
+        if not os.access(dir_name, os.W_OK):
+            print(f"Cannot write to specified output directory ({dir_name}) "
+                  f"for '{flag}'.", file=sys.stderr)
+            sys.exit(1)
+    args.kern_out_path = args.okern if args.okern else os.getcwd()
+    if args.jobs < 1:
+        print(f"The number of jobs must be at least 1 but got {args.jobs}.",
+              file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        api = configure(args)
+    except ConfigurationError as err:
+        print(str(err), file=sys.stderr)
+        sys.exit(1)
+    if args.clear_kernel_cache:
+        if not args.kernel_cache:
+            print("The --clear-kernel-cache option requires the cache "
+                  "directory to be specified with --kernel-cache.",
+                  file=sys.stderr)
+            sys.exit(1)
+        KernelCache.clear(args.kernel_cache)
+
+    # Keep a copy of the fully set-up configuration so that it can be
+    # restored before each file is processed.
+    pristine_config = copy.deepcopy(Config.get())
+
+    results = []
+    tstart = perf_counter()
+    if args.jobs > 1:
+        # The results are returned (and so reported) in the order in which
+        # the files were supplied, irrespective of which worker finishes
+        # first.
+        with multiprocessing.Pool(args.jobs, initializer=_init_worker,
+                                  initargs=(args,)) as pool:
+            for result in pool.imap(_process_in_worker, args.filenames):
+                results.append(result)
+                _report(result)
+                if result.error is not None and args.exit_on_error:
+                    pool.terminate()
+                    break
+    else:
+        for filename in args.filenames:
+            reset_state(pristine_config, args.profile)
+            result = process_file(filename, api, args.out_dir, args)
+            results.append(result)
+            _report(result)
+            if result.error is not None and args.exit_on_error:
+                break
+    total_time = perf_counter() - tstart
+
+    # Leave the configuration as it was set up from the command line.
+    reset_state(pristine_config, args.profile)
+
+    failed = [result.filename for result in results if result.error]
+    print(f"Processed {len(results) - len(failed)} of "
+          f"{len(args.filenames)} file(s) in {total_time:.2f}s.")
+    if failed:
+        print(f"PSyclone failed on the following file(s): {failed}",
+              file=sys.stderr)
+        sys.exit(1)
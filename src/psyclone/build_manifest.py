@@ -0,0 +1,194 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+
+'''
+    This module provides the BuildManifest class which supports the
+    incremental mode of the psyclone command (the --incremental option).
+    The manifest records the inputs (the algorithm file, the kernel files
+    that it uses, the optimisation script and the configuration file),
+    the options and the outputs of the invocation of PSyclone that
+    processed an algorithm file. A subsequent invocation can then skip
+    the generation of code if none of them has changed.
+
+'''
+
+import hashlib
+import json
+import os
+import tempfile
+
+from psyclone.version import __VERSION__
+
+
+class BuildManifest():
+    '''
+    The manifest of the code generated for an algorithm file, stored
+    as JSON in the specified file.
+
+    :param str filename: the path of the manifest file.
+
+    '''
+    def __init__(self, filename):
+        self._filename = filename
+
+    @property
+    def filename(self):
+        '''
+        :returns: the path of the manifest file.
+        :rtype: str
+
+        '''
+        return self._filename
+
+    @staticmethod
+    def file_hash(path):
+        '''
+        :param str path: the path of a file.
+
+        :returns: the SHA-256 hash of the content of the file or None if \
+            the file does not exist or cannot be read.
+        :rtype: Optional[str]
+
+        '''
+        try:
+            with open(path, "rb") as ffile:
+                return hashlib.sha256(ffile.read()).hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def directory_state(directory):
+        '''
+        :param str directory: the path of a directory.
+
+        :returns: the modification time and size of each file in the \
+            directory (but not in any sub-directories), indexed by path.
+        :rtype: dict of str: (int, int)
+
+        '''
+        state = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def _load(self):
+        '''
+        :returns: the content of the manifest file or None if it does \
+            not exist or is not a valid manifest.
+        :rtype: Optional[dict]
+
+        '''
+        try:
+            with open(self._filename, "r", encoding="utf-8") as mfile:
+                manifest = json.load(mfile)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(manifest, dict) or not all(
+                key in manifest for key in
+                ["version", "options", "inputs", "outputs"]):
+            return None
+        return manifest
+
+    def reasons_to_rebuild(self, options):
+        '''
+        Determines whether (and why) the code recorded in the manifest
+        must be generated again.
+
+        :param options: the options of the current invocation of PSyclone.
+        :type options: dict of str: object
+
+        :returns: the reasons why the code must be generated again (an \
+            empty list if the code recorded in the manifest is up to date).
+        :rtype: list of str
+
+        '''
+        manifest = self._load()
+        if manifest is None:
+            return [f"there is no valid manifest '{self._filename}'"]
+        reasons = []
+        if manifest["version"] != __VERSION__:
+            reasons.append(f"the PSyclone version has changed (from "
+                           f"{manifest['version']} to {__VERSION__})")
+        # The options are compared after a round trip through JSON so that
+        # e.g. tuples compare equal to lists.
+        options = json.loads(json.dumps(options))
+        changed = sorted(
+            key for key in set(options) | set(manifest["options"])
+            if options.get(key) != manifest["options"].get(key))
+        if changed:
+            reasons.append(f"the options have changed ({', '.join(changed)})")
+        for path, digest in manifest["inputs"].items():
+            if self.file_hash(path) != digest:
+                reasons.append(f"the input file '{path}' has changed")
+        for path, digest in manifest["outputs"].items():
+            if self.file_hash(path) != digest:
+                reasons.append(f"the output file '{path}' is missing or has "
+                               f"been modified")
+        return reasons
+
+    def record(self, options, inputs, outputs):
+        '''
+        Writes the manifest file. It is first written to a temporary file
+        which then replaces any existing manifest so that an interrupted
+        invocation never leaves a partially-written manifest behind.
+
+        :param options: the options of the current invocation of PSyclone.
+        :type options: dict of str: object
+        :param inputs: the paths of the input files.
+        :type inputs: list of str
+        :param outputs: the paths of the output files.
+        :type outputs: list of str
+
+        '''
+        manifest = {
+            "version": __VERSION__,
+            "options": options,
+            "inputs": {os.path.abspath(path): self.file_hash(path)
+                       for path in inputs},
+            "outputs": {os.path.abspath(path): self.file_hash(path)
+                        for path in outputs}}
+        directory = os.path.dirname(os.path.abspath(self._filename))
+        fdesc, tmp_name = tempfile.mkstemp(dir=directory, prefix=".",
+                                           suffix=".tmp")
+        try:
+            with os.fdopen(fdesc, "w", encoding="utf-8") as mfile:
+                json.dump(manifest, mfile, indent=2, sort_keys=True)
+            os.replace(tmp_name, self._filename)
+        except BaseException:
+            os.remove(tmp_name)
+            raise
@@ -206,6 +206,15 @@ class Config(object):
         # The list of directories to search for Fortran include files.
         self._include_paths = []
 
+        # Where to store the indices of the kernel search paths so that
+        # they can be reused by subsequent invocations (None if they are
+        # not to be stored) - set at runtime.
+        self._kernel_index_dir = None
+
+        # Where to cache the metadata and PSyIR created from kernel source
+        # (None if they are not to be cached) - set at runtime.
+        self._kernel_cache_dir = None
+
         # The root name to use when creating internal PSyIR names.
         self._psyir_root_name = None
 
@@ -663,6 +672,56 @@ class Config(object):
                                       "{0}". format(type(path_list))),
                            err)
 
+    @property
+    def kernel_index_dir(self):
+        '''
+        :returns: the directory in which to store the indices of the files \
+            below the kernel search paths or None if they are not stored.
+        :rtype: Optional[str]
+        '''
+        return self._kernel_index_dir
+
+    @kernel_index_dir.setter
+    def kernel_index_dir(self, value):
+        '''
+        Setter for the directory in which to store kernel-file indices.
+
+        :param value: the directory in which to store the indices or None \
+            if they are not to be stored.
+        :type value: Optional[str]
+
+        :raises ConfigurationError: if the directory does not exist.
+        '''
+        if value is not None and not os.path.isdir(value):
+            raise ConfigurationError(
+                f"Kernel-index directory '{value}' does not exist")
+        self._kernel_index_dir = value
+
+    @property
+    def kernel_cache_dir(self):
+        '''
+        :returns: the directory in which to cache the metadata and PSyIR \
+            created from kernel source or None if they are not cached.
+        :rtype: Optional[str]
+        '''
+        return self._kernel_cache_dir
+
+    @kernel_cache_dir.setter
+    def kernel_cache_dir(self, value):
+        '''
+        Setter for the directory in which to cache processed kernels.
+
+        :param value: the cache directory or None if kernels are not to \
+            be cached.
+        :type value: Optional[str]
+
+        :raises ConfigurationError: if the directory does not exist.
+        '''
+        if value is not None and not os.path.isdir(value):
+            raise ConfigurationError(
+                f"Kernel-cache directory '{value}' does not exist")
+        self._kernel_cache_dir = value
+
     @property
     def valid_psy_data_prefixes(self):
         ''':returns: The list of all valid class prefixes.
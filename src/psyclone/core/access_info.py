@@ -41,6 +41,8 @@
 
 from __future__ import print_function, absolute_import
 
+from array import array
+
 from psyclone.core.access_type import AccessType
 from psyclone.core.component_indices import ComponentIndices
 from psyclone.core.signature import Signature
@@ -72,6 +74,8 @@ class AccessInfo():
         :py:class:`psyclone.core.component_indices.ComponentIndices`
 
     '''
+    __slots__ = ("_location", "_access_type", "_node", "_component_indices")
+
     def __init__(self, access_type, location, node, component_indices=None):
         self._location = location
         self._access_type = access_type
@@ -84,7 +88,7 @@ class AccessInfo():
     def __str__(self):
         '''Returns a string representation showing the access mode
         and location, e.g.: WRITE(5).'''
-        return f"{self._access_type}({self._location})"
+        return f"{self.access_type}({self.location})"
 
     def change_read_to_write(self):
         '''This changes the access mode from READ to WRITE.
@@ -123,6 +127,19 @@ class AccessInfo():
         `[ [i], [j, k], [] ]` (with each element being the PSyIR of the
         index expression).
 
+        :param component_indices: indices used in the access.
+        :type component_indices: \
+            :py:class:`psyclone.core.component_indices.ComponentIndices`
+
+        '''
+        self._check_component_indices(component_indices)
+        self._component_indices = component_indices
+
+    @staticmethod
+    def _check_component_indices(component_indices):
+        '''Checks that the indices of an access are an instance of
+        ComponentIndices.
+
         :param component_indices: indices used in the access.
         :type component_indices: \
             :py:class:`psyclone.core.component_indices.ComponentIndices`
@@ -131,12 +148,10 @@ class AccessInfo():
             of :py:class:`psyclone.core.component_indices.ComponentIndices`.
 
         '''
-
         if not isinstance(component_indices, ComponentIndices):
             raise InternalError(f"The component_indices object in the setter "
                                 f"of AccessInfo must be an instance of "
                                 f"ComponentIndices, got '{component_indices}'")
-        self._component_indices = component_indices
 
     def is_array(self):
         '''Test if any of the components has an index. E.g. an access like
@@ -146,7 +161,7 @@ class AccessInfo():
             the variable is an array.
         :rtype: bool
         '''
-        return self._component_indices.is_array()
+        return self.component_indices.is_array()
 
     @property
     def access_type(self):
@@ -169,19 +184,117 @@ class AccessInfo():
         return self._node
 
 
+# =============================================================================
+class _StoredAccessInfo(AccessInfo):
+    '''The AccessInfo for one of the accesses that are stored by a
+    `SingleVariableAccessInfo` instance. It does not hold any data of its
+    own: all properties are read from, and all changes are written to, the
+    arrays of the `SingleVariableAccessInfo` instance.
+
+    :param var_info: the accesses to the variable.
+    :type var_info: :py:class:`psyclone.core.SingleVariableAccessInfo`
+    :param int index: the index of this access in `var_info`.
+
+    '''
+    # pylint: disable=protected-access
+    __slots__ = ("_var_info", "_index")
+
+    def __init__(self, var_info, index):
+        # pylint: disable=super-init-not-called
+        self._var_info = var_info
+        self._index = index
+
+    def change_read_to_write(self):
+        '''This changes the access mode from READ to WRITE.
+
+        :raises InternalError: if the variable originally does not have\
+            READ access.
+
+        '''
+        access_types = self._var_info._access_types
+        if access_types[self._index] != _ACCESS_TYPE_CODES[AccessType.READ]:
+            raise InternalError("Trying to change variable to 'WRITE' "
+                                "which does not have 'READ' access.")
+        access_types[self._index] = _ACCESS_TYPE_CODES[AccessType.WRITE]
+
+    @property
+    def component_indices(self):
+        ''':returns: the indices used in this access for each component.
+        :rtype: :py:class:`psyclone.core.component_indices.ComponentIndices`
+        '''
+        return self._var_info._get_component_indices(self._index)
+
+    @component_indices.setter
+    def component_indices(self, component_indices):
+        '''Sets the indices for this access.
+
+        :param component_indices: indices used in the access.
+        :type component_indices: \
+            :py:class:`psyclone.core.component_indices.ComponentIndices`
+
+        '''
+        self._check_component_indices(component_indices)
+        self._var_info._indices[self._index] = component_indices
+
+    @property
+    def access_type(self):
+        ''':returns: the access type.
+        :rtype: :py:class:`psyclone.core.access_type.AccessType`'''
+        return _ACCESS_TYPES[self._var_info._access_types[self._index]]
+
+    @property
+    def location(self):
+        ''':returns: the location information for this access.
+        :rtype: int
+        '''
+        return self._var_info._locations[self._index]
+
+    @property
+    def node(self):
+        ''':returns: the PSyIR node at which this access happens.
+        :rtype: :py:class:`psyclone.psyir.nodes.Node` '''
+        return self._var_info._nodes[self._index]
+
+
+# The access types are stored as their index in this tuple.
+_ACCESS_TYPES = tuple(AccessType)
+_ACCESS_TYPE_CODES = {access_type: code
+                      for code, access_type in enumerate(_ACCESS_TYPES)}
+_READ_CODES = frozenset(_ACCESS_TYPE_CODES[access_type] for access_type
+                        in AccessType.all_read_accesses())
+_WRITE_CODES = frozenset(_ACCESS_TYPE_CODES[access_type] for access_type
+                         in AccessType.all_write_accesses())
+
+
 # =============================================================================
 class SingleVariableAccessInfo():
-    '''This class stores a list with all accesses to one variable.
+    '''This class stores a list with all accesses to one variable. Since
+    the accesses of a large code region can number hundreds of thousands,
+    the location, access type, node and indices of the accesses are stored
+    in parallel arrays (with no indices stored for a scalar access). The
+    `AccessInfo` object for an access is only created when it is requested,
+    and it reads its properties from these arrays.
 
     :param signature: signature of the variable.
     :type signature: :py:class:`psyclone.core.Signature`
 
     '''
+    __slots__ = ("_signature", "_locations", "_access_types", "_nodes",
+                 "_indices", "_access_infos")
+
     def __init__(self, signature):
         self._signature = signature
-        # This is the list of AccessInfo instances for this variable.
-
-        self._accesses = []
+        # The location, access type (stored as an index into
+        # _ACCESS_TYPES), node and component indices of each access.
+        # The component indices of a scalar access are None until they
+        # are requested.
+        self._locations = array("l")
+        self._access_types = array("B")
+        self._nodes = []
+        self._indices = []
+        # The AccessInfo instances that have been created so far, with
+        # None for the accesses that have not been requested.
+        self._access_infos = []
 
     def __str__(self):
         '''Returns a string representation of this object with the format:
@@ -192,10 +305,55 @@ class SingleVariableAccessInfo():
         the same statement as another access.
 
         '''
-        all_accesses = ",".join([str(access) for access in self._accesses])
+        all_accesses = ",".join([f"{_ACCESS_TYPES[code]}({location})"
+                                 for code, location in
+                                 zip(self._access_types, self._locations)])
 
         return f"{self._signature}:{all_accesses}"
 
+    def _get_access_info(self, index):
+        '''Returns the AccessInfo instance for the access with the
+        specified index, creating it if required.
+
+        :param int index: the index of the access.
+
+        :returns: the access information for the specified index.
+        :rtype: py:class:`psyclone.core.access_info.AccessInfo`
+
+        :raises IndexError: If there is no access with the specified index.
+
+        '''
+        num_accesses = len(self._nodes)
+        if index < 0:
+            index += num_accesses
+        if not 0 <= index < num_accesses:
+            raise IndexError(f"Access index {index} is out of range for "
+                             f"variable '{self._signature}'.")
+        if len(self._access_infos) < num_accesses:
+            self._access_infos.extend(
+                [None] * (num_accesses - len(self._access_infos)))
+        access_info = self._access_infos[index]
+        if access_info is None:
+            access_info = _StoredAccessInfo(self, index)
+            self._access_infos[index] = access_info
+        return access_info
+
+    def _get_component_indices(self, index):
+        '''Returns the component indices of the access with the specified
+        index, creating the ComponentIndices of a scalar access if required.
+
+        :param int index: the index of the access.
+
+        :returns: the indices used in the access for each component.
+        :rtype: :py:class:`psyclone.core.component_indices.ComponentIndices`
+
+        '''
+        component_indices = self._indices[index]
+        if component_indices is None:
+            component_indices = ComponentIndices([[]] * len(self._signature))
+            self._indices[index] = component_indices
+        return component_indices
+
     @property
     def signature(self):
         ''':returns: the signature for which the accesses are stored.
@@ -214,9 +372,7 @@ class SingleVariableAccessInfo():
         ''':returns: True if this variable is written (at least once).
         :rtype: bool
         '''
-        return any(access_info.access_type in
-                   AccessType.all_write_accesses()
-                   for access_info in self._accesses)
+        return any(code in _WRITE_CODES for code in self._access_types)
 
     def is_read_only(self):
         '''Checks if this variable is always read, and never
@@ -225,15 +381,14 @@ class SingleVariableAccessInfo():
         :returns: True if this variable is read only.
         :rtype: bool
         '''
-        return all(access_info.access_type == AccessType.READ
-                   for access_info in self._accesses)
+        read = _ACCESS_TYPE_CODES[AccessType.READ]
+        return all(code == read for code in self._access_types)
 
     def is_read(self):
         ''':returns: True if this variable is read (at least once).
         :rtype: bool
         '''
-        return any(access_info.access_type in AccessType.all_read_accesses()
-                   for access_info in self._accesses)
+        return any(code in _READ_CODES for code in self._access_types)
 
     def has_read_write(self):
         '''Checks if this variable has at least one READWRITE access.
@@ -241,8 +396,7 @@ class SingleVariableAccessInfo():
         :returns: True if this variable is read (at least once).
         :rtype: bool
         '''
-        return any(access_info.access_type == AccessType.READWRITE
-                   for access_info in self._accesses)
+        return _ACCESS_TYPE_CODES[AccessType.READWRITE] in self._access_types
 
     def __getitem__(self, index):
         ''':return: the access information for the specified index.
@@ -250,14 +404,18 @@ class SingleVariableAccessInfo():
 
         :raises IndexError: If there is no access with the specified index.
         '''
-        return self._accesses[index]
+        if isinstance(index, slice):
+            return [self._get_access_info(i) for i in
+                    range(*index.indices(len(self._nodes)))]
+        return self._get_access_info(index)
 
     @property
     def all_accesses(self):
         ''':returns: a list with all AccessInfo data for this variable.
         :rtype: List[:py:class:`psyclone.core.access_info.AccessInfo`]
         '''
-        return self._accesses
+        return [self._get_access_info(index)
+                for index in range(len(self._nodes))]
 
     @property
     def all_read_accesses(self):
@@ -265,8 +423,9 @@ class SingleVariableAccessInfo():
             that involve reading this variable.
         :rtype: List[:py:class:`psyclone.core.access_info.AccessInfo`]
         '''
-        return [access for access in self._accesses
-                if access.access_type in AccessType.all_read_accesses()]
+        return [self._get_access_info(index)
+                for index, code in enumerate(self._access_types)
+                if code in _READ_CODES]
 
     @property
     def all_write_accesses(self):
@@ -274,8 +433,9 @@ class SingleVariableAccessInfo():
             that involve writing this variable.
         :rtype: List[:py:class:`psyclone.core.access_info.AccessInfo`]
         '''
-        return [access for access in self._accesses
-                if access.access_type in AccessType.all_write_accesses()]
+        return [self._get_access_info(index)
+                for index, code in enumerate(self._access_types)
+                if code in _WRITE_CODES]
 
     def add_access_with_location(self, access_type, location, node,
                                  component_indices):
@@ -289,12 +449,36 @@ class SingleVariableAccessInfo():
         :param node: Node in PSyIR in which the access happens.
         :type node: :py:class:`psyclone.psyir.nodes.Node`
         :param component_indices: indices used for each component of the \
-            access.
+            access, or None for a scalar access.
         :type component_indices:  \
             :py:class:`psyclone.core.component_indices.ComponentIndices`
         '''
-        self._accesses.append(AccessInfo(access_type, location, node,
-                                         component_indices))
+        if component_indices == []:
+            component_indices = None
+        elif (component_indices is not None and
+              not isinstance(component_indices, ComponentIndices)):
+            component_indices = ComponentIndices(component_indices)
+        self._locations.append(location)
+        self._access_types.append(_ACCESS_TYPE_CODES[access_type])
+        self._nodes.append(node)
+        self._indices.append(component_indices)
+
+    def _extend(self, other, location_offset):
+        '''Appends all accesses of another instance to this instance,
+        shifting their locations by the specified offset.
+
+        :param other: the other accesses to append.
+        :type other: :py:class:`psyclone.core.SingleVariableAccessInfo`
+        :param int location_offset: the offset to add to the locations \
+            of the other accesses.
+
+        '''
+        # pylint: disable=protected-access
+        self._locations.extend(location + location_offset
+                               for location in other._locations)
+        self._access_types.extend(other._access_types)
+        self._nodes.extend(other._nodes)
+        self._indices.extend(other._indices)
 
     def change_read_to_write(self):
         '''This function is only used when analysing an assignment statement.
@@ -304,17 +488,17 @@ class SingleVariableAccessInfo():
         SingleVariableAccessInfo class, it is guaranteed that there is only
         one entry for the variable.
         '''
-        if len(self._accesses) != 1:
+        if len(self._nodes) != 1:
             raise InternalError(f"Variable '{self._signature}' had "
-                                f"{len(self._accesses)} accesses listed, "
+                                f"{len(self._nodes)} accesses listed, "
                                 "not one in change_read_to_write.")
 
-        if self._accesses[0].access_type != AccessType.READ:
+        if self._access_types[0] != _ACCESS_TYPE_CODES[AccessType.READ]:
             raise InternalError(f"Trying to change variable "
                                 f"'{self._signature}' to 'WRITE' "
                                 "which does not have 'READ' access.")
 
-        self._accesses[0].change_read_to_write()
+        self._access_types[0] = _ACCESS_TYPE_CODES[AccessType.WRITE]
 
     def is_array(self, index_variable=None):
         '''Checks if the variable is used as an array, i.e. if it has
@@ -331,8 +515,9 @@ class SingleVariableAccessInfo():
         :rtype: bool
 
         '''
-        is_array = any(access_info.is_array() for
-                       access_info in self._accesses)
+        is_array = any(component_indices is not None and
+                       component_indices.is_array()
+                       for component_indices in self._indices)
 
         # If there is no access information using an index, or there is no
         # index variable specified, return the current result:
@@ -343,9 +528,9 @@ class SingleVariableAccessInfo():
         # pylint: disable=import-outside-toplevel
         from psyclone.psyir.nodes import Reference
 
-        for access_info in self._accesses:
+        for node in self._nodes:
             if any(ref.symbol.name == index_variable
-                   for ref in access_info.node.walk(Reference)):
+                   for ref in node.walk(Reference)):
                 return True
 
         # The index variable is not used in any index in any access:
@@ -368,10 +553,11 @@ class SingleVariableAccessInfo():
         '''
         result = False
 
-        for access in self._accesses:
-            if access.node is reference:
+        code = _ACCESS_TYPE_CODES[AccessType.WRITE]
+        for node, access_code in zip(self._nodes, self._access_types):
+            if node is reference:
                 return result
-            if access.access_type == AccessType.WRITE:
+            if access_code == code:
                 result = True
         raise ValueError(f"Reference not found in 'is_written_before' for "
                          f"variable '{self.var_name}'.")
@@ -393,10 +579,11 @@ class SingleVariableAccessInfo():
         '''
         result = False
 
-        for access in self._accesses:
-            if access.node is reference:
+        code = _ACCESS_TYPE_CODES[AccessType.READ]
+        for node, access_code in zip(self._nodes, self._access_types):
+            if node is reference:
                 return result
-            if access.access_type == AccessType.READ:
+            if access_code == code:
                 result = True
         raise ValueError(f"Reference not found in 'is_read_before' for "
                          f"variable '{self.var_name}'.")
@@ -421,8 +608,8 @@ class SingleVariableAccessInfo():
 
         result = False
 
-        for access in self._accesses:
-            if access.node is reference:
+        for node in self._nodes:
+            if node is reference:
                 return result
             result = True
         raise ValueError(f"Reference not found in 'is_accessed_before' for "
@@ -443,6 +630,8 @@ class VariablesAccessInfo(dict):
                  List[:py:class:`psyclone.psyir.nodes.Node`]
 
     '''
+    __slots__ = ("_location", "_cacheable")
+
     def __init__(self, nodes=None):
         # This dictionary stores the mapping of signatures to the
         # corresponding SingleVariableAccessInfo instance.
@@ -450,6 +639,10 @@ class VariablesAccessInfo(dict):
 
         # Stores the current location information
         self._location = 0
+        # False if any of the accesses were added by a node whose accesses
+        # do not only depend on the PSyIR tree (see
+        # Node._add_cached_accesses), in which case they must not be cached.
+        self._cacheable = True
         if nodes:
             # Import here to avoid circular dependency
             # pylint: disable=import-outside-toplevel
@@ -462,9 +655,11 @@ class VariablesAccessInfo(dict):
                                             f"not a Node, but of type "
                                             f"{type(node)}")
 
-                    node.reference_accesses(self)
+                    # pylint: disable=protected-access
+                    node._add_cached_accesses(self)
             elif isinstance(nodes, Node):
-                nodes.reference_accesses(self)
+                # pylint: disable=protected-access
+                nodes._add_cached_accesses(self)
             else:
                 arg_type = str(type(nodes))
                 raise InternalError(f"Error in VariablesAccessInfo. "
@@ -572,7 +767,10 @@ class VariablesAccessInfo(dict):
                     component_indices = [[]] * (len(signature)-1) \
                                       + [component_indices]
 
-            component_indices = ComponentIndices(component_indices)
+            # No ComponentIndices instance is created for a scalar access
+            # until its indices are requested.
+            if any(component_indices):
+                component_indices = ComponentIndices(component_indices)
 
         if len(signature) != len(component_indices):
             raise InternalError(f"Cannot add '{component_indices}' with "
@@ -580,15 +778,14 @@ class VariablesAccessInfo(dict):
                                 f"indices for '{signature}' which "
                                 f"requires {len(signature)} elements.")
 
-        if signature in self:
-            self[signature].add_access_with_location(access_type,
-                                                     self._location, node,
-                                                     component_indices)
-        else:
+        if not isinstance(component_indices, ComponentIndices):
+            component_indices = None
+        var_info = self.get(signature)
+        if var_info is None:
             var_info = SingleVariableAccessInfo(signature)
-            var_info.add_access_with_location(access_type, self._location,
-                                              node, component_indices)
             self[signature] = var_info
+        var_info.add_access_with_location(access_type, self._location, node,
+                                          component_indices)
 
     @property
     def all_signatures(self):
@@ -612,30 +809,48 @@ class VariablesAccessInfo(dict):
         # For each variable add all accesses. After merging the new data,
         # we need to increase the location so that all further added data
         # will have a location number that is larger.
+        # pylint: disable=protected-access
         max_new_location = 0
         for signature in other_access_info.all_signatures:
-            var_info = other_access_info[signature]
-            for access_info in var_info.all_accesses:
-                # Keep track of how much we need to update the next location
-                # in this object:
-                if access_info.location > max_new_location:
-                    max_new_location = access_info.location
-                new_location = access_info.location + self._location
-                if signature in self:
-                    var_info = self[signature]
-                else:
-                    var_info = SingleVariableAccessInfo(signature)
-                    self[signature] = var_info
-
-                var_info.add_access_with_location(access_info.access_type,
-                                                  new_location,
-                                                  access_info.node,
-                                                  access_info.
-                                                  component_indices)
+            other_var_info = other_access_info[signature]
+            # Keep track of how much we need to update the next location
+            # in this object:
+            if other_var_info._locations:
+                max_new_location = max(max_new_location,
+                                       max(other_var_info._locations))
+            var_info = self.get(signature)
+            if var_info is None:
+                var_info = SingleVariableAccessInfo(signature)
+                self[signature] = var_info
+            var_info._extend(other_var_info, self._location)
         # Increase the current location of this instance by the amount of
         # locations just merged in
         self._location = self._location + max_new_location
 
+    def _append(self, other_access_info):
+        '''Appends the accesses of another VariablesAccessInfo instance,
+        whose locations start at 0, to this instance as if they had been
+        added to this instance directly. The locations of the other accesses
+        are shifted by the current location of this instance, which is then
+        advanced by the current location of the other instance. This is used
+        to compose the accesses of a node from the cached accesses of its
+        children (see `Node._add_cached_accesses`).
+
+        :param other_access_info: the other VariablesAccessInfo instance.
+        :type other_access_info: \
+            :py:class:`psyclone.core.access_info.VariablesAccessInfo`
+        '''
+        # pylint: disable=protected-access
+        for signature, other_var_info in other_access_info.items():
+            var_info = self.get(signature)
+            if var_info is None:
+                var_info = SingleVariableAccessInfo(signature)
+                self[signature] = var_info
+            var_info._extend(other_var_info, self._location)
+        self._location = self._location + other_access_info._location
+        if not other_access_info._cacheable:
+            self._cacheable = False
+
     def is_written(self, signature):
         '''Checks if the specified variable signature is at least
         written once.
@@ -38,6 +38,8 @@
 ''' This module provides access to sympy-based symbolic maths
 functions.'''
 
+from collections import OrderedDict
+from functools import _CacheInfo, lru_cache
 
 from sympy import (Complexes, ConditionSet, core, EmptySet, expand, FiniteSet,
                    ImageSet, simplify, solvers, Union)
@@ -66,6 +68,19 @@ class SymbolicMaths:
     # available, or None otherwise.
     _instance = None
 
+    # The maximum number of results of each kind (the subtraction of two
+    # expressions and the solution of an equation) that are cached. The
+    # least recently used results are discarded first.
+    CACHE_SIZE = 4096
+
+    # The cached results of subtracting two PSyIR expressions, indexed by
+    # the structural keys of (copies of) the expressions and the names and
+    # kinds (array or not) of the references in them, and the number of
+    # hits and misses of this cache.
+    _subtract_cache = OrderedDict()
+    _subtract_hits = 0
+    _subtract_misses = 0
+
     # -------------------------------------------------------------------------
     @staticmethod
     def get():
@@ -159,15 +174,42 @@ class SymbolicMaths:
         '''
         # Avoid circular import
         # pylint: disable=import-outside-toplevel
-        from psyclone.psyir.backend.sympy_writer import SymPyWriter
-
-        # Use the SymPyWriter to convert the two expressions to
-        # SymPy expressions:
-        sympy_expressions = SymPyWriter.convert_to_sympy_expressions([exp1,
-                                                                      exp2])
+        from psyclone.psyir.backend.sympy_builder import SymPyBuilder
+        from psyclone.psyir.nodes import Reference
+        from psyclone.psyir.tools.structural_key import StructuralKey
+
+        # The result is looked up using the structural hashes of the
+        # expressions so that the SymPy expressions are only created if it
+        # is not already known. The names of the references are included
+        # as the structural keys compare symbols by identity, and a symbol
+        # may have been renamed.
+        type_key = tuple((ref.name, ref.is_array)
+                         for exp in (exp1, exp2)
+                         for ref in exp.walk(Reference))
+        key = (StructuralKey(exp1), StructuralKey(exp2), type_key)
+        cache = SymbolicMaths._subtract_cache
+        try:
+            result = cache[key]
+            cache.move_to_end(key)
+            SymbolicMaths._subtract_hits += 1
+            return result
+        except KeyError:
+            pass
+
+        sympy_expressions = SymPyBuilder.convert_to_sympy_expressions(
+            [exp1, exp2])
         # Simplify triggers a set of SymPy algorithms to simplify
         # the expression.
-        return simplify(sympy_expressions[0] - sympy_expressions[1])
+        result = simplify(sympy_expressions[0] - sympy_expressions[1])
+        SymbolicMaths._subtract_misses += 1
+        # The cache holds (detached) copies of the expressions so that it
+        # is not affected by any later changes to them (and does not keep
+        # the trees that contain them alive).
+        cache[(StructuralKey(exp1.copy()), StructuralKey(exp2.copy()),
+               type_key)] = result
+        if len(cache) > SymbolicMaths.CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
 
     # -------------------------------------------------------------------------
     @staticmethod
@@ -191,6 +233,31 @@ class SymbolicMaths:
         :returns: a set of solutions, or the string "independent".
         :rtype: Union[set, str]
 
+        '''
+        solution = SymbolicMaths._solve_equal_for(exp1, exp2, symbol)
+        if isinstance(solution, set):
+            # Return a copy so that the cached set cannot be modified.
+            return set(solution)
+        return solution
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    @lru_cache(maxsize=CACHE_SIZE)
+    def _solve_equal_for(exp1, exp2, symbol):
+        '''Implements (and caches the results of) solve_equal_for.
+
+        :param exp1: the first expression.
+        :type exp1: :py:class:`sympy.core.basic.Basic`
+        :param exp2: the second expression.
+        :type exp2: :py:class:`sympy.core.basic.Basic`
+        :param symbol: the symbol for which to solve.
+        :type symbol: :py:class:`sympy.core.symbol.Symbol`
+
+        :returns: a set of solutions, or the string "independent".
+        :rtype: Union[set, str]
+
+        :raises ValueError: if SymPy returns an unexpected type of solution.
+
         '''
         # We could restrict the domain to Integers, but in case of
         # general solutions (x=i+1 or so), we get an intersection as
@@ -247,6 +314,36 @@ class SymbolicMaths:
         # Convert the FiniteSet to a normal Python set:
         return set(solution)
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def cache_info():
+        '''Returns the statistics (the number of hits and misses, and the
+        maximum and current size) of the caches of the results of
+        subtracting two expressions (used by equal and never_equal) and of
+        solving an equation (solve_equal_for).
+
+        :returns: the statistics of each cache, indexed by its name \
+            ("subtract" or "solve_equal_for").
+        :rtype: Dict[str, :py:class:`functools._CacheInfo`]
+
+        '''
+        subtract_info = _CacheInfo(SymbolicMaths._subtract_hits,
+                                   SymbolicMaths._subtract_misses,
+                                   SymbolicMaths.CACHE_SIZE,
+                                   len(SymbolicMaths._subtract_cache))
+        return {"subtract": subtract_info,
+                "solve_equal_for":
+                    SymbolicMaths._solve_equal_for.cache_info()}
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def clear_cache():
+        '''Discards all cached results (and resets the statistics).'''
+        SymbolicMaths._subtract_cache.clear()
+        SymbolicMaths._subtract_hits = 0
+        SymbolicMaths._subtract_misses = 0
+        SymbolicMaths._solve_equal_for.cache_clear()
+
     # -------------------------------------------------------------------------
     @staticmethod
     def expand(expr):
@@ -264,7 +361,7 @@ class SymbolicMaths:
         '''
         # Avoid circular import
         # pylint: disable=import-outside-toplevel
-        from psyclone.psyir.backend.sympy_writer import SymPyWriter
+        from psyclone.psyir.backend.sympy_builder import SymPyBuilder
         from psyclone.psyir.frontend.fortran import FortranReader
         from psyclone.psyir.nodes import Reference, Literal, Routine
 
@@ -272,7 +369,7 @@ class SymbolicMaths:
         if isinstance(expr, (Reference, Literal)):
             return
         # Convert the PSyIR expression to a sympy expression
-        sympy_expression = SymPyWriter.convert_to_sympy_expressions([expr])
+        sympy_expression = SymPyBuilder.convert_to_sympy_expressions([expr])
         # Expand the expression
         result = expand(sympy_expression[0])
         # If the expanded result is the same as the original then
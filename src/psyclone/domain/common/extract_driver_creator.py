@@ -617,9 +617,7 @@ class ExtractDriverCreator:
                                                   input_list, output_list,
                                                   postfix)
         # Copy over all of the executable part of the extracted region
-        all_children = schedule_copy.pop_all_children()
-        for child in all_children:
-            program.addchild(child)
+        program.children.extend(schedule_copy.pop_all_children())
 
         self.add_result_tests(program, output_symbols)
 
@@ -341,11 +341,11 @@ class GOOpenCLTrans(Transformation):
         for tag, symbol in node.symbol_table.tags_dict.items():
             if tag.startswith(("xstart_", "xstop_", "ystart_", "ystop_")):
                 boundary_vars.append(symbol)
-        cursor = 0
-        for assignment in node.walk(Assignment):
-            if assignment.lhs.symbol in boundary_vars:
-                node.children.insert(cursor, assignment.detach())
-                cursor += 1
+        boundary_assignments = [
+            assignment.detach() for assignment in node.walk(Assignment)
+            if assignment.lhs.symbol in boundary_vars]
+        node.children.splice(0, boundary_assignments)
+        cursor = len(boundary_assignments)
 
         # Create block of code to execute only the first time:
         setup_block = IfBlock.create(Reference(first), [])
@@ -532,8 +532,8 @@ class GOOpenCLTrans(Transformation):
                                       kern.name, flag, cl_finish,
                                       cmd_queue.copy())
             callblock = self._generate_set_args_call(kern, node.scope)
-            for child in callblock.pop_all_children():
-                node.children.insert(outerloop.position, child)
+            node.children.splice(outerloop.position,
+                                 callblock.pop_all_children())
 
             # Then we call the clEnqueueNDRangeKernel
             assig = Assignment.create(
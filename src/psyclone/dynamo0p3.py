@@ -47,6 +47,7 @@
 from __future__ import print_function, absolute_import
 import abc
 import os
+from contextlib import contextmanager
 from enum import Enum
 from collections import OrderedDict, namedtuple, Counter
 import six
@@ -5580,8 +5581,7 @@ class DynInvoke(Invoke):
         if Config.get().distributed_memory:
             # halo exchange calls
             const = LFRicConstants()
-            for loop in self.schedule.loops():
-                loop.create_halo_exchanges()
+            self.schedule.place_halo_exchanges(self.schedule.loops())
             # global sum calls
             for loop in self.schedule.loops():
                 for scalar in loop.args_filter(
@@ -5736,11 +5736,75 @@ class DynInvokeSchedule(InvokeSchedule):
 
     '''
 
+    # The halo analysis in use while halo exchanges are being placed.
+    _halo_analysis = None
+
     def __init__(self, name, arg, reserved_names=None, parent=None):
         InvokeSchedule.__init__(self, name, DynKernCallFactory,
                                 LFRicBuiltInCallFactory, arg, reserved_names,
                                 parent=parent)
 
+    @property
+    def halo_analysis(self):
+        '''
+        :returns: the halo analysis of this schedule while halo exchanges \
+            are being placed (see `place_halo_exchanges`), None otherwise.
+        :rtype: :py:class:`psyclone.dynamo0p3.LFRicHaloAnalysis` or NoneType
+
+        '''
+        return self._halo_analysis
+
+    @contextmanager
+    def halo_analysis_session(self):
+        '''Keeps one halo analysis of this schedule in use for all the halo
+        exchanges that are placed within the `with` block, e.g. by a
+        sequence of redundant computation transformations, rather than
+        analysing the whole schedule again for each loop. Within the block
+        the schedule must only be changed by transformations that change
+        the bounds of loops and place halo exchanges with the methods of
+        `DynLoop`, as any other change is not seen by the analysis. Nested
+        sessions use the analysis of the outermost one.
+
+        :returns: the halo analysis in use.
+        :rtype: :py:class:`psyclone.dynamo0p3.LFRicHaloAnalysis`
+
+        '''
+        if self._halo_analysis is not None:
+            # We are already in a session for this schedule.
+            yield self._halo_analysis
+            return
+        self._halo_analysis = LFRicHaloAnalysis(self)
+        try:
+            yield self._halo_analysis
+        finally:
+            self._halo_analysis = None
+
+    def place_halo_exchanges(self, loops, update=False):
+        '''Adds the halo exchanges required by each of the supplied loops of
+        this schedule, in order, and also removes the ones that are no
+        longer required if `update` is True (see
+        `DynLoop.create_halo_exchanges` and
+        `DynLoop.update_halo_exchanges`). The accesses to the fields of
+        the schedule are analysed once for all loops (see
+        `halo_analysis_session`) and the analysis is then kept in step
+        with the halo exchanges that are added and removed, rather than
+        examining the whole schedule again whenever the schedule changes.
+        This method can be called again, e.g. after redundant computation
+        transformations have been applied.
+
+        :param loops: the loops for which to place halo exchanges.
+        :type loops: list of :py:class:`psyclone.dynamo0p3.DynLoop`
+        :param bool update: whether to also remove the halo exchanges \
+            that are no longer required. Defaults to False.
+
+        '''
+        with self.halo_analysis_session():
+            for loop in loops:
+                if update:
+                    loop.update_halo_exchanges()
+                else:
+                    loop.create_halo_exchanges()
+
     def node_str(self, colour=True):
         ''' Creates a text summary of this node.
 
@@ -5755,6 +5819,176 @@ class DynInvokeSchedule(InvokeSchedule):
                 "', dm=" + str(Config.get().distributed_memory)+"]")
 
 
+class LFRicHaloAnalysis():
+    '''
+    Records the arguments of the kernels, halo exchanges and global sums of
+    an LFRic InvokeSchedule (with the nodes that contain them), grouped by
+    the name of the argument and in schedule order, so that the
+    dependencies used to place halo exchanges can be found without
+    examining the schedule. The arguments are collected with one pass over
+    the schedule (see `InvokeSchedule._argument_index`) and the halo
+    exchanges that are added to or removed from the schedule must then be
+    reported with `add_halo_exchange` and `remove_halo_exchange`. Any
+    other change to the schedule is not seen by the analysis, which is
+    therefore only used within `DynInvokeSchedule.halo_analysis_session`.
+
+    :param schedule: the schedule to analyse.
+    :type schedule: :py:class:`psyclone.dynamo0p3.DynInvokeSchedule`
+
+    '''
+    def __init__(self, schedule):
+        # pylint: disable=protected-access
+        self._accesses = {
+            name: list(node_arguments) for name, (_, node_arguments)
+            in schedule._argument_index().items()}
+        # The indices of the first and last access of each node, by the
+        # id of the node, for each name. They are found when first
+        # needed and found again after the accesses with the name change.
+        self._positions = {}
+
+    def _node_positions(self, name):
+        '''
+        :param str name: the name of an argument.
+
+        :returns: the indices of the first and last access of each node \
+            in the accesses with the supplied name, by the id of the node.
+        :rtype: Dict[int, Tuple[int, int]]
+
+        '''
+        positions = self._positions.get(name)
+        if positions is None:
+            positions = {}
+            for idx, (node, _) in enumerate(self._accesses.get(name, [])):
+                first, _ = positions.get(id(node), (idx, idx))
+                positions[id(node)] = (first, idx)
+            self._positions[name] = positions
+        return positions
+
+    def _find(self, argument):
+        '''
+        :param argument: an argument of a node in the schedule.
+        :type argument: :py:class:`psyclone.psyGen.Argument`
+
+        :returns: the accesses with the name of the argument and the \
+            indices of the first and last access of the node that \
+            contains the argument, or None if the node is not known to \
+            this analysis.
+        :rtype: Tuple[List[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+            :py:class:`psyclone.psyGen.Argument`]], int, int] or NoneType
+
+        '''
+        position = self._node_positions(argument.name).get(
+            id(argument.call))
+        if position is None:
+            return None
+        first, last = position
+        return self._accesses[argument.name], first, last
+
+    def following(self, argument):
+        '''Returns the accesses with the same name as the supplied argument
+        after the node that contains it, in schedule order (see
+        `Argument._following_arguments`).
+
+        :param argument: an argument of a node in the schedule.
+        :type argument: :py:class:`psyclone.psyGen.Argument`
+
+        :returns: pairs of a node and one of its arguments, or None if \
+            the node that contains the argument is not known to this \
+            analysis.
+        :rtype: List[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+            :py:class:`psyclone.psyGen.Argument`]] or NoneType
+
+        '''
+        found = self._find(argument)
+        if not found:
+            return None
+        accesses, _, last = found
+        return accesses[last+1:]
+
+    def preceding(self, argument):
+        '''Returns the accesses with the same name as the supplied argument
+        before the node that contains it, starting with the closest node
+        (see `Argument._preceding_arguments`).
+
+        :param argument: an argument of a node in the schedule.
+        :type argument: :py:class:`psyclone.psyGen.Argument`
+
+        :returns: pairs of a node and one of its arguments, or None if \
+            the node that contains the argument is not known to this \
+            analysis.
+        :rtype: List[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+            :py:class:`psyclone.psyGen.Argument`]] or NoneType
+
+        '''
+        found = self._find(argument)
+        if not found:
+            return None
+        accesses, first, _ = found
+        # The nodes are visited in reverse order, but the arguments of
+        # each node are still visited in their original order.
+        groups = []
+        for node, node_argument in accesses[:first]:
+            if not groups or groups[-1][0][0] is not node:
+                groups.append([])
+            groups[-1].append((node, node_argument))
+        return [pair for group in reversed(groups) for pair in group]
+
+    def add_halo_exchange(self, exchange, loop):
+        '''Records a halo exchange that has been inserted immediately before
+        the supplied loop.
+
+        :param exchange: the new halo exchange.
+        :type exchange: :py:class:`psyclone.dynamo0p3.DynHaloExchange`
+        :param loop: the loop that follows the halo exchange.
+        :type loop: :py:class:`psyclone.dynamo0p3.DynLoop`
+
+        :raises InternalError: if the field of the halo exchange is not \
+            accessed within the loop.
+
+        '''
+        name = exchange.field.name
+        positions = self._node_positions(name)
+        firsts = [positions[id(kernel)][0] for kernel in loop.kernels()
+                  if id(kernel) in positions]
+        if not firsts:
+            raise InternalError(
+                f"The field '{name}' of a new halo exchange is not accessed "
+                f"within the loop that follows it.")
+        self._accesses[name].insert(min(firsts), (exchange, exchange.field))
+        del self._positions[name]
+
+    def remove_halo_exchange(self, exchange):
+        '''Forgets a halo exchange that has been removed from the schedule.
+
+        :param exchange: the removed halo exchange.
+        :type exchange: :py:class:`psyclone.dynamo0p3.DynHaloExchange`
+
+        '''
+        name = exchange.field.name
+        position = self._node_positions(name).get(id(exchange))
+        if position is None:
+            return
+        first, last = position
+        del self._accesses[name][first:last+1]
+        del self._positions[name]
+
+
+def _halo_analysis(node):
+    '''
+    :param node: a node in a PSyIR tree.
+    :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+    :returns: the halo analysis in use for the schedule that contains the \
+        node, if halo exchanges are being placed in the schedule.
+    :rtype: :py:class:`psyclone.dynamo0p3.LFRicHaloAnalysis` or NoneType
+
+    '''
+    schedule = node.ancestor(DynInvokeSchedule)
+    if schedule is None:
+        return None
+    return schedule.halo_analysis
+
+
 class DynGlobalSum(GlobalSum):
     '''
     Dynamo specific global sum class which can be added to and
@@ -6439,7 +6673,7 @@ class DynHaloExchangeStart(DynHaloExchange):
         '''
         # Look at all nodes following this one in schedule order
         # (which is PSyIRe node order)
-        for node in self.following():
+        for node in self.iter_following():
             if self.sameParent(node) and isinstance(node, DynHaloExchange):
                 # Found a following `haloexchange`,
                 # `haloexchangestart` or `haloexchangeend` PSyIRe node
@@ -7467,6 +7701,9 @@ class DynLoop(Loop):
                                    vector_index=idx)
         self.parent.children.insert(self.position,
                                     exchange)
+        analysis = _halo_analysis(self)
+        if analysis:
+            analysis.add_halo_exchange(exchange, self)
 
         # Is this halo exchange required? The halo exchange being
         # added may replace an existing halo exchange, which would
@@ -7478,6 +7715,8 @@ class DynLoop(Loop):
         required, _ = exchange.required(ignore_hex_dep=True)
         if not required:
             exchange.detach()
+            if analysis:
+                analysis.remove_halo_exchange(exchange)
         else:
             # The halo exchange we have added may be replacing an
             # existing one. If so, the one being replaced will be the
@@ -7500,6 +7739,8 @@ class DynLoop(Loop):
                             "exchange was found. This should never happen."
                             "".format(exchange.field.name))
                     first_dep_call.detach()
+                    if analysis:
+                        analysis.remove_halo_exchange(first_dep_call)
 
     def _add_halo_exchange(self, halo_field):
         '''Internal helper method to add (a) halo exchange call(s) immediately
@@ -7523,6 +7764,12 @@ class DynLoop(Loop):
     def update_halo_exchanges(self):
         '''add and/or remove halo exchanges due to changes in the loops
         bounds'''
+        schedule = self.ancestor(DynInvokeSchedule)
+        if schedule and not schedule.halo_analysis:
+            # Use an analysis of the whole schedule for the placement.
+            schedule.place_halo_exchanges([self], update=True)
+            return
+        analysis = _halo_analysis(self)
         # this call adds any new halo exchanges that are
         # required. This is done by adding halo exchanges before this
         # loop for any fields in the loop that require a halo exchange
@@ -7545,6 +7792,9 @@ class DynLoop(Loop):
                             required, _ = halo_exchange.required()
                             if not required:
                                 halo_exchange.detach()
+                                if analysis:
+                                    analysis.remove_halo_exchange(
+                                        halo_exchange)
 
     def create_halo_exchanges(self):
         '''Add halo exchanges before this loop as required by fields within
@@ -7560,6 +7810,11 @@ class DynLoop(Loop):
         routine also removes the old one.
 
         '''
+        schedule = self.ancestor(DynInvokeSchedule)
+        if schedule and not schedule.halo_analysis:
+            # Use an analysis of the whole schedule for the placement.
+            schedule.place_halo_exchanges([self])
+            return
         for halo_field in self.unique_fields_with_halo_reads():
             # for each unique field in this loop that has its halo
             # read (including annexed dofs), find the previous update
@@ -9788,6 +10043,42 @@ class DynKernelArgument(KernelArgument):
         '''
         self._stencil = value
 
+    def _following_arguments(self):
+        '''Returns the arguments (with the nodes that contain them) after
+        the call of this argument, in schedule order. While halo exchanges
+        are being placed in the schedule, the halo analysis of the schedule
+        provides them.
+
+        :returns: pairs of a node and one of its arguments.
+        :rtype: Iterable[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+                               :py:class:`psyclone.psyGen.Argument`]]
+
+        '''
+        analysis = _halo_analysis(self._call)
+        if analysis:
+            node_arguments = analysis.following(self)
+            if node_arguments is not None:
+                return node_arguments
+        return super()._following_arguments()
+
+    def _preceding_arguments(self):
+        '''Returns the arguments (with the nodes that contain them) before
+        the call of this argument, starting with the closest node. While
+        halo exchanges are being placed in the schedule, the halo analysis
+        of the schedule provides them.
+
+        :returns: pairs of a node and one of its arguments.
+        :rtype: Iterable[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+                               :py:class:`psyclone.psyGen.Argument`]]
+
+        '''
+        analysis = _halo_analysis(self._call)
+        if analysis:
+            node_arguments = analysis.preceding(self)
+            if node_arguments is not None:
+                return node_arguments
+        return super()._preceding_arguments()
+
     def infer_datatype(self, proxy=False):
         '''
         Infer the datatype of this kernel argument in the PSy layer using
@@ -9968,6 +10259,7 @@ __all__ = [
     'DynBoundaryConditions',
     'DynInvoke',
     'DynInvokeSchedule',
+    'LFRicHaloAnalysis',
     'DynGlobalSum',
     'DynHaloExchange',
     'DynHaloExchangeStart',
@@ -48,7 +48,9 @@ from __future__ import absolute_import, print_function
 
 import argparse
 import io
+import itertools
 import os
+import re
 import sys
 import traceback
 
@@ -56,13 +58,16 @@ import six
 
 from psyclone import configuration
 from psyclone.alg_gen import Alg, NoInvokesError
+from psyclone.build_manifest import BuildManifest
 from psyclone.configuration import Config, ConfigurationError
 from psyclone.domain.common.algorithm import AlgorithmInvokeCall
 from psyclone.domain.common.transformations import (AlgTrans,
                                                     AlgInvoke2PSyCallTrans)
 from psyclone.errors import GenerationError
+from psyclone.kernel_cache import KernelCache
 from psyclone.line_length import FortLineLength
 from psyclone.parse.algorithm import parse
+from psyclone.parse.kernel import KernelFileIndex
 from psyclone.parse.utils import ParseError
 from psyclone.profiler import Profiler
 from psyclone.psyGen import PSyFactory
@@ -161,7 +166,8 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
              line_length=False,
              distributed_memory=None,
              kern_out_path="",
-             kern_naming="multiple"):
+             kern_naming="multiple",
+             kernel_files=None):
     # pylint: disable=too-many-arguments
     '''Takes a PSyclone algorithm specification as input and outputs the
     associated generated algorithm and psy codes suitable for
@@ -192,6 +198,9 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
         kernel code. Defaults to empty string.
     :param bool kern_naming: the scheme to use when re-naming transformed \
         kernels. Defaults to "multiple".
+    :param kernel_files: if supplied, the paths of the files containing \
+        the kernels called from the algorithm are appended to this list.
+    :type kernel_files: Optional[list of str]
     :return: 2-tuple containing the fparser1 AST for the algorithm code and \
         the fparser1 AST or a string (for NEMO) of the psy code.
     :rtype: (:py:class:`fparser.one.block_statements.BeginSource`, \
@@ -211,6 +220,34 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
     >>> alg, psy = generate("algspec.f90", line_length=True)
     >>> alg, psy = generate("algspec.f90", distributed_memory=False)
 
+    '''
+    alg_gen, psy = _generate(filename, api=api, kernel_paths=kernel_paths,
+                             script_name=script_name,
+                             line_length=line_length,
+                             distributed_memory=distributed_memory,
+                             kern_out_path=kern_out_path,
+                             kern_naming=kern_naming,
+                             kernel_files=kernel_files)
+    return alg_gen, psy.gen
+
+
+def _generate(filename, api="", kernel_paths=None, script_name=None,
+              line_length=False,
+              distributed_memory=None,
+              kern_out_path="",
+              kern_naming="multiple",
+              kernel_files=None):
+    # pylint: disable=too-many-arguments
+    '''Does the same as `generate` but returns the PSy object rather than
+    the PSy code, so that the code can be generated as it is written out
+    (see `PSy.iter_gen`). The arguments and exceptions are those of
+    `generate`.
+
+    :returns: 2-tuple containing the fparser1 AST (or, for GOcean, the \
+        code) of the algorithm layer and the PSy object.
+    :rtype: (:py:class:`fparser.one.block_statements.BeginSource` or str, \
+             :py:class:`psyclone.psyGen.PSy`)
+
     '''
     if kernel_paths is None:
         kernel_paths = []
@@ -245,6 +282,8 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
     ast, invoke_info = parse(filename, api=api, invoke_name="invoke",
                              kernel_paths=kernel_paths,
                              line_length=line_length)
+    if kernel_files is not None and api not in API_WITHOUT_ALGORITHM:
+        kernel_files.extend(invoke_info.kernel_files)
     if api != "gocean1.0":
         psy = PSyFactory(api, distributed_memory=distributed_memory)\
             .create(invoke_info)
@@ -292,7 +331,7 @@ def generate(filename, api="", kernel_paths=None, script_name=None,
     for invoke in psy.invokes.invoke_list:
         Profiler.add_profile_nodes(invoke.schedule, Loop)
 
-    return alg_gen, psy.gen
+    return alg_gen, psy
 
 
 def main(args):
@@ -335,6 +374,28 @@ def main(args):
     parser.add_argument(
         '-I', '--include', default=[], action="append",
         help='path to Fortran INCLUDE or module files')
+    parser.add_argument(
+        '--kernel-index-dir', help='directory in which to store the indices '
+        'of the kernel source directories (-d) so that they are reused by '
+        'subsequent invocations of PSyclone.')
+    parser.add_argument(
+        '--kernel-cache', help='directory in which to cache the metadata '
+        'and PSyIR created from kernel source so that they are reused by '
+        'subsequent invocations of PSyclone. The cache must only be '
+        'writeable by trusted users.')
+    parser.add_argument(
+        '--clear-kernel-cache', action='store_true', help='remove all '
+        'entries from the kernel cache (--kernel-cache) before processing.')
+    parser.add_argument(
+        '--incremental', metavar='MANIFEST', help='only generate code if '
+        'the inputs (the algorithm, kernel, script and configuration '
+        'files) or options have changed since the invocation of PSyclone '
+        'that recorded the specified manifest file (which is then '
+        'updated). Requires -opsy (and -oalg for APIs with an algorithm '
+        'layer).')
+    parser.add_argument(
+        '--explain', action='store_true', help='report why code is (or is '
+        'not) generated in incremental mode (--incremental).')
     parser.add_argument(
         '-l', '--limit', dest='limit', default='off',
         choices=['off', 'all', 'output'],
@@ -417,18 +478,62 @@ def main(args):
             # Default is to instruct fparser2 to look in the directory
             # containing the file being parsed
             Config.get().include_paths = ["./"]
+        Config.get().kernel_index_dir = args.kernel_index_dir
+        Config.get().kernel_cache_dir = args.kernel_cache
     except ConfigurationError as err:
         print(str(err), file=sys.stderr)
         sys.exit(1)
+    # The kernel search paths are indexed afresh for each run.
+    KernelFileIndex.clear()
+    if args.clear_kernel_cache:
+        if not args.kernel_cache:
+            print("The --clear-kernel-cache option requires the cache "
+                  "directory to be specified with --kernel-cache.",
+                  file=sys.stderr)
+            sys.exit(1)
+        KernelCache.clear(args.kernel_cache)
 
+    if args.explain and not args.incremental:
+        print("The --explain option requires the incremental mode to be "
+              "enabled with --incremental.", file=sys.stderr)
+        sys.exit(1)
+    if args.incremental:
+        if not args.opsy or (not args.oalg and
+                             api not in API_WITHOUT_ALGORITHM):
+            print("The --incremental option requires the generated code to "
+                  "be written to file (with -opsy and, for APIs with an "
+                  "algorithm layer, -oalg).", file=sys.stderr)
+            sys.exit(1)
+        manifest = BuildManifest(args.incremental)
+        build_options = _build_options(args, api, kern_out_path)
+        reasons = manifest.reasons_to_rebuild(build_options)
+        if not reasons:
+            if args.explain:
+                print(f"Not generating code for '{args.filename}' as it is "
+                      f"up to date with respect to '{args.incremental}'.")
+            return
+        if args.explain:
+            print(f"Generating code for '{args.filename}' because:")
+            for reason in reasons:
+                print(f"  {reason}")
+        kern_out_state = BuildManifest.directory_state(kern_out_path)
+
+    kernel_files = []
     try:
-        alg, psy = generate(args.filename, api=api,
-                            kernel_paths=args.directory,
-                            script_name=args.script,
-                            line_length=(args.limit == 'all'),
-                            distributed_memory=args.dist_mem,
-                            kern_out_path=kern_out_path,
-                            kern_naming=args.kernel_renaming)
+        alg, psy = _generate(args.filename, api=api,
+                             kernel_paths=args.directory,
+                             script_name=args.script,
+                             line_length=(args.limit == 'all'),
+                             distributed_memory=args.dist_mem,
+                             kern_out_path=kern_out_path,
+                             kern_naming=args.kernel_renaming,
+                             kernel_files=kernel_files)
+        # The PSy-layer code is generated as it is written out, but its
+        # first piece is generated here so that an error is reported
+        # before any code is written. (For the APIs that generate the
+        # code in one piece this is all of the code.)
+        psy_pieces = psy.iter_gen()
+        first_piece = next(psy_pieces, "")
     except NoInvokesError:
         _, exc_value, _ = sys.exc_info()
         print("Warning: {0}".format(exc_value))
@@ -438,48 +543,171 @@ def main(args):
         # be empty
         alg_file = open(args.filename)
         alg = alg_file.read()
-        psy = ""
-    except (OSError, IOError, ParseError, GenerationError,
-            RuntimeError):
-        _, exc_value, _ = sys.exc_info()
-        print(exc_value, file=sys.stderr)
-        sys.exit(1)
+        psy_pieces = iter(())
+        first_piece = ""
     except Exception:  # pylint: disable=broad-except
-        print("Error, unexpected exception, please report to the authors:",
-              file=sys.stderr)
-        traceback.print_exception(*sys.exc_info(), file=sys.stderr)
-        sys.exit(1)
+        _exit_with_error()
     if args.limit != 'off':
         # Limit the line length of the output Fortran to ensure it conforms
-        # to the 132 characters mandated by the standard.
+        # to the 132 characters mandated by the standard. The lines are
+        # wrapped as the code is written out.
         fll = FortLineLength()
-        psy_str = fll.process(str(psy))
-        alg_str = fll.process(str(alg))
     else:
-        psy_str = str(psy)
-        alg_str = str(alg)
+        fll = None
+    psy_code = itertools.chain([first_piece], psy_pieces)
+    alg_str = str(alg)
     if args.oalg is not None:
-        write_unicode_file(alg_str, args.oalg)
+        write_unicode_file(alg_str, args.oalg, fll)
     else:
-        print("Transformed algorithm code:\n%s" % alg_str)
+        sys.stdout.write("Transformed algorithm code:\n")
+        _write_code(alg_str, sys.stdout, fll)
+        sys.stdout.write("\n")
 
-    if not psy_str:
-        # empty file so do not output anything
-        pass
-    elif args.opsy is not None:
-        write_unicode_file(psy_str, args.opsy)
+    try:
+        if not first_piece:
+            # empty file so do not output anything
+            pass
+        elif args.opsy is not None:
+            write_unicode_file(psy_code, args.opsy, fll)
+        else:
+            sys.stdout.write("Generated psy layer code:\n ")
+            _write_code(psy_code, sys.stdout, fll)
+            sys.stdout.write("\n")
+    except Exception:  # pylint: disable=broad-except
+        _exit_with_error()
+
+    if args.incremental:
+        inputs = [args.filename] + kernel_files
+        if Config.get().filename:
+            inputs.append(Config.get().filename)
+        if args.script and os.path.isfile(args.script):
+            inputs.append(args.script)
+        outputs = [name for name in [args.oalg, args.opsy]
+                   if name and os.path.isfile(name)]
+        outputs.extend(_written_kernels(kern_out_path, kern_out_state,
+                                        kernel_files))
+        manifest.record(build_options, inputs, outputs)
+
+
+def _written_kernels(kern_out_path, initial_state, kernel_files):
+    '''
+    Finds the transformed kernels that have been written to the kernel
+    output directory. These are files, created or modified since the
+    initial state of the directory was captured, whose names are those
+    given to transformed versions of the supplied kernels (see
+    :py:meth:`psyclone.psyGen.CodedKern.rename_and_write`).
+
+    :param str kern_out_path: the kernel output directory.
+    :param initial_state: the initial state of the kernel output directory.
+    :type initial_state: dict of str: (int, int)
+    :param kernel_files: the paths of the files containing the kernels.
+    :type kernel_files: list of str
+
+    :returns: the paths of the transformed kernels.
+    :rtype: list of str
+
+    '''
+    # By convention the name of the file containing a kernel module is the
+    # name of the module.
+    base_names = set()
+    for path in kernel_files:
+        name = os.path.splitext(os.path.basename(path))[0].lower()
+        base_names.add(name[:-4] if name.endswith("_mod") else name)
+    kernels = []
+    for path, state in BuildManifest.directory_state(kern_out_path).items():
+        match = re.match(r"(.+)_\d+_mod\.f90$",
+                         os.path.basename(path).lower())
+        if (match and match.group(1) in base_names and
+                initial_state.get(path) != state):
+            kernels.append(path)
+    return kernels
+
+
+def _build_options(args, api, kern_out_path):
+    '''
+    Collects the options that affect the code generated by PSyclone for
+    the incremental mode (see :py:class:`psyclone.build_manifest.\
+    BuildManifest`).
+
+    :param args: the parsed command-line arguments.
+    :type args: :py:class:`argparse.Namespace`
+    :param str api: the PSyclone API in use.
+    :param str kern_out_path: the directory to which transformed kernels \
+        are written.
+
+    :returns: the options, indexed by name.
+    :rtype: dict of str: object
+
+    '''
+    # These options do not affect the generated code.
+    ignored = ["incremental", "explain", "version", "kernel_index_dir",
+               "kernel_cache", "clear_kernel_cache"]
+    options = {key: value for key, value in vars(args).items()
+               if key not in ignored}
+    options.update(filename=os.path.abspath(args.filename), api=api,
+                   okern=os.path.abspath(kern_out_path),
+                   config=Config.get().filename)
+    return options
+
+
+def _exit_with_error():
+    '''Reports the exception that is being handled and exits with an
+    error status. An exception that PSyclone raises to report a problem
+    with its input is reported by its message alone.
+
+    '''
+    _, exc_value, _ = sys.exc_info()
+    if isinstance(exc_value, (OSError, IOError, ParseError, GenerationError,
+                              RuntimeError)):
+        print(exc_value, file=sys.stderr)
+    else:
+        print("Error, unexpected exception, please report to the authors:",
+              file=sys.stderr)
+        traceback.print_exception(*sys.exc_info(), file=sys.stderr)
+    sys.exit(1)
+
+
+def _write_code(code, stream, fll=None):
+    '''Writes the supplied code to a text stream as it is generated,
+    line-wrapping it as it is written if a FortLineLength object is
+    supplied.
+
+    :param code: the code to write or the pieces of the code.
+    :type code: str or Iterable[str]
+    :param stream: the text stream to write to.
+    :type stream: :py:class:`io.TextIOBase`
+    :param fll: optional object with which to wrap long lines.
+    :type fll: Optional[:py:class:`psyclone.line_length.FortLineLength`]
+
+    '''
+    if isinstance(code, str):
+        code = [code]
+    if fll:
+        fll.write(code, stream)
     else:
-        print("Generated psy layer code:\n", psy_str)
+        for piece in code:
+            stream.write(piece)
 
 
-def write_unicode_file(contents, filename):
+def write_unicode_file(contents, filename, fll=None):
     '''Wrapper routine that ensures that a string is encoded as unicode before
-    writing to file.
+    writing to file. The contents may be supplied in pieces, which are
+    written out as they are generated. If the generation fails then the
+    partially-written file is removed.
 
-    :param str contents: string to write to file.
+    :param contents: string, or pieces of the string, to write to file.
+    :type contents: str or Iterable[str]
     :param str filename: the name of the file to create.
+    :param fll: optional object with which to wrap long lines as the \
+        string is written (see `FortLineLength.write`).
+    :type fll: Optional[:py:class:`psyclone.line_length.FortLineLength`]
 
     '''
     encoding = {'encoding': 'utf-8'}
     with io.open(filename, mode='w', **encoding) as file_object:
-        file_object.write(contents)
+        try:
+            _write_code(contents, file_object, fll)
+        except Exception:
+            file_object.close()
+            os.remove(filename)
+            raise
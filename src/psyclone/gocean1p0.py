@@ -1187,8 +1187,8 @@ class GOKern(CodedKern):
         :rtype: :py:class:`psyclone.gocean1p0.GOKernelSchedule`
         '''
         if self._kern_schedule is None:
-            astp = GOFparser2Reader()
-            self._kern_schedule = astp.generate_schedule(self.name, self.ast)
+            self._kern_schedule = self._create_kernel_schedule(
+                GOFparser2Reader())
             # TODO: Validate kernel with metadata (issue #288).
         return self._kern_schedule
 
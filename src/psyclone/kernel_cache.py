@@ -0,0 +1,319 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''
+    This module provides an optional, persistent cache of the information
+    that PSyclone creates from kernel source code: the processed kernel
+    metadata (e.g. DynKernMetadata) and the PSyIR of the kernel code.
+    The same kernels are typically used by many algorithm files and so,
+    when the cache is enabled (by setting Config.kernel_cache_dir, e.g.
+    with the --kernel-cache command-line option), they only need to be
+    parsed and processed once.
+
+    Entries are keyed by a hash of the kernel source, the PSyclone and
+    fparser versions, the content of the configuration file and any other
+    quantities supplied by the caller, so that a stale entry is never used.
+    Entries are stored with pickle and therefore the cache directory must
+    only be writeable by trusted users.
+
+'''
+
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+from importlib import metadata
+
+from fparser.common.base_classes import AttributeHolder
+from fparser.common.readfortran import FortranFileReader
+from fparser.two.utils import Base
+
+from psyclone.configuration import Config
+from psyclone.version import __VERSION__
+
+# The version of fparser is part of every key so only look it up once.
+_FPARSER_VERSION = metadata.version("fparser")
+
+
+def _new_object(cls):
+    '''
+    Creates an instance of the supplied class without calling its
+    constructor (or __new__ method).
+
+    :param type cls: the class of the object to create.
+
+    :returns: the new object.
+    :rtype: object
+
+    '''
+    return object.__new__(cls)
+
+
+def _set_object_state(obj, state):
+    '''
+    Restores the attributes of an object without looking up its
+    __setstate__ method.
+
+    :param object obj: the object to update.
+    :param dict state: the attributes of the object.
+
+    '''
+    obj.__dict__.update(state)
+
+
+class _KernelPickler(pickle.Pickler):
+    '''
+    Pickler for kernel metadata and PSyIR. The fparser1 parse tree of a
+    kernel holds a reference to the reader of the (open) source file. The
+    file is replaced by a placeholder and the reader is recreated such
+    that it does not close it. Objects of fparser classes that cannot be
+    unpickled in the default way (since they require arguments to __new__
+    or have a __getattr__ method that relies on their attributes) are
+    recreated directly from their attributes.
+
+    '''
+    def persistent_id(self, obj):
+        '''
+        :param object obj: the object being pickled.
+
+        :returns: a placeholder for a file object, None otherwise.
+        :rtype: Optional[str]
+
+        '''
+        if isinstance(obj, io.IOBase):
+            return "file"
+        return None
+
+    def reducer_override(self, obj):
+        '''
+        :param object obj: the object being pickled.
+
+        :returns: how to recreate the object if it is an instance of one \
+            of the affected fparser classes, NotImplemented otherwise.
+        :rtype: tuple or NotImplemented
+
+        '''
+        if isinstance(obj, (AttributeHolder, Base)):
+            return (_new_object, (type(obj),), obj.__dict__, None, None,
+                    _set_object_state)
+        if isinstance(obj, FortranFileReader):
+            # The recreated reader does not own a file and so must not
+            # attempt to close (or remove) it when it is destroyed.
+            state = dict(obj.__dict__, _close_on_destruction=False)
+            return (_new_object, (type(obj),), state, None, None,
+                    _set_object_state)
+        return NotImplemented
+
+
+class _KernelUnpickler(pickle.Unpickler):
+    '''
+    Unpickler for kernel metadata and PSyIR. Any file object that was
+    replaced by a placeholder is recreated as an empty (in-memory) file.
+
+    '''
+    def persistent_load(self, pid):
+        '''
+        :param str pid: the placeholder for the persistent object.
+
+        :returns: an empty, in-memory file.
+        :rtype: :py:class:`io.StringIO`
+
+        '''
+        return io.StringIO()
+
+
+class KernelCache():
+    '''
+    Provides access to the cache of processed kernels stored in the
+    directory given by Config.kernel_cache_dir. All methods are static.
+
+    '''
+    # The suffix of the files holding the cache entries.
+    SUFFIX = ".pkl"
+
+    # The kinds of entry stored in the cache.
+    KINDS = ["metadata", "psyir"]
+
+    # The hash of the content of each configuration file that has been
+    # read (there is usually only one).
+    _config_hashes = {}
+
+    @staticmethod
+    def enabled():
+        '''
+        :returns: whether or not the cache is in use.
+        :rtype: bool
+
+        '''
+        return Config.get().kernel_cache_dir is not None
+
+    @staticmethod
+    def _config_hash():
+        '''
+        :returns: a hash of the content of the configuration file in use.
+        :rtype: str
+
+        '''
+        filename = Config.get().filename
+        if filename not in KernelCache._config_hashes:
+            try:
+                with open(filename, "rb") as cfile:
+                    digest = hashlib.sha256(cfile.read()).hexdigest()
+            except (OSError, TypeError):
+                digest = ""
+            KernelCache._config_hashes[filename] = digest
+        return KernelCache._config_hashes[filename]
+
+    @staticmethod
+    def source_hash(source):
+        '''
+        :param bytes source: the content of a kernel source file.
+
+        :returns: a hash of the supplied source that may be used (in place \
+            of the source itself) as part of the key of a cache entry.
+        :rtype: str
+
+        '''
+        return hashlib.sha256(source).hexdigest()
+
+    @staticmethod
+    def key(*parts):
+        '''
+        Creates the key of a cache entry.
+
+        :param parts: the quantities (typically the kernel source and its \
+            name) that identify the entry.
+        :type parts: str or bytes
+
+        :returns: the key of the cache entry.
+        :rtype: str
+
+        '''
+        hasher = hashlib.sha256()
+        for part in [__VERSION__, _FPARSER_VERSION,
+                     KernelCache._config_hash(), Config.get().api] + \
+                list(parts):
+            if isinstance(part, str):
+                part = part.encode("utf-8")
+            # Include the length so that the boundaries between the parts
+            # are unambiguous.
+            hasher.update(str(len(part)).encode("utf-8") + b":" + part)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _entry_path(kind, key):
+        '''
+        :param str kind: the kind of entry (one of KernelCache.KINDS).
+        :param str key: the key of the entry.
+
+        :returns: the path of the file holding the specified entry.
+        :rtype: str
+
+        '''
+        return os.path.join(Config.get().kernel_cache_dir,
+                            f"{kind}_{key}{KernelCache.SUFFIX}")
+
+    @staticmethod
+    def load(kind, key):
+        '''
+        Retrieves an entry from the cache.
+
+        :param str kind: the kind of entry (one of KernelCache.KINDS).
+        :param str key: the key of the entry.
+
+        :returns: the cached object or None if the cache is not in use or \
+            there is no such (readable) entry.
+        :rtype: Optional[object]
+
+        '''
+        if not KernelCache.enabled():
+            return None
+        try:
+            with open(KernelCache._entry_path(kind, key), "rb") as cfile:
+                return _KernelUnpickler(cfile).load()
+        except Exception:  # pylint: disable=broad-except
+            # A missing or unreadable entry is simply treated as a miss.
+            return None
+
+    @staticmethod
+    def store(kind, key, obj):
+        '''
+        Stores an entry in the cache (if it is in use). The entry is written
+        to a temporary file which then atomically replaces any existing
+        entry so that concurrent PSyclone processes never see a partially
+        written entry. Failure to store an entry is not an error.
+
+        :param str kind: the kind of entry (one of KernelCache.KINDS).
+        :param str key: the key of the entry.
+        :param object obj: the object to store.
+
+        '''
+        if not KernelCache.enabled():
+            return
+        tmp_name = None
+        try:
+            fdesc, tmp_name = tempfile.mkstemp(
+                dir=Config.get().kernel_cache_dir, prefix=".",
+                suffix=".tmp")
+            with os.fdopen(fdesc, "wb") as cfile:
+                _KernelPickler(cfile,
+                               protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+            os.replace(tmp_name, KernelCache._entry_path(kind, key))
+            tmp_name = None
+        except Exception:  # pylint: disable=broad-except
+            pass
+        finally:
+            if tmp_name:
+                os.remove(tmp_name)
+
+    @staticmethod
+    def clear(cache_dir):
+        '''
+        Removes all of the entries from the specified cache directory.
+
+        :param str cache_dir: the cache directory.
+
+        :returns: the number of entries removed.
+        :rtype: int
+
+        '''
+        count = 0
+        for filename in os.listdir(cache_dir):
+            kind = filename.split("_")[0]
+            if kind in KernelCache.KINDS and \
+                    filename.endswith(KernelCache.SUFFIX):
+                os.remove(os.path.join(cache_dir, filename))
+                count += 1
+        return count
@@ -10,20 +10,33 @@
 to allow the code to conform to the maximum line length limits (132
 for f90 free format is the default)'''
 
+import multiprocessing
+import re
 
-def find_break_point(line, max_index, key_list):
-    ''' find the most appropriate break point for a fortran line '''
+
+def find_break_point(line, max_index, key_list, start=0):
+    ''' find the most appropriate break point for a fortran line. The
+    break point is searched for in line[start:max_index] so that a long
+    line can be split without creating a copy of what remains of it. '''
 
     for key in key_list:
-        idx = line.rfind(key, 0, max_index)
-        if idx > 0:
+        idx = line.rfind(key, start, max_index)
+        if idx > start:
             return idx+len(key)
     raise Exception(
         "Error in find_break_point. No suitable break point found"
-        " for line '" + line[:max_index] + "' and keys '" +
+        " for line '" + line[start:max_index] + "' and keys '" +
         str(key_list) + "'")
 
 
+def _process_chunk(args):
+    ''' wraps a chunk of lines in a worker process of
+    FortLineLength.process '''
+    fll, lines = args
+    # pylint: disable=protected-access
+    return fll._process_lines(lines)
+
+
 class FortLineLength(object):
 
     ''' This class take a free format fortran code as a string and
@@ -48,12 +61,13 @@ class FortLineLength(object):
                            "openacc_directive": [" ", ",", ")", "="],
                            "comment": [" ", ".", ","],
                            "unknown": [" ", ",", "=", "+", ")"]}
-        import re
-        self._stat = re.compile(r'^\s*(INTEGER|REAL|TYPE|CALL|SUBROUTINE|USE)',
-                                flags=re.I)
-        self._omp = re.compile(r'^\s*!\$OMP', flags=re.I)
-        self._acc = re.compile(r'^\s*!\$ACC', flags=re.I)
-        self._comment = re.compile(r'^\s*!')
+        # The type of a line is given by the name of the group that
+        # matches it. The alternatives are tried in order so that
+        # directives are not classed as comments.
+        self._line_type = re.compile(
+            r"^\s*(?:(?P<statement>INTEGER|REAL|TYPE|CALL|SUBROUTINE|USE)"
+            r"|(?P<openmp_directive>!\$OMP)|(?P<openacc_directive>!\$ACC)"
+            r"|(?P<comment>!))", flags=re.I)
 
     def long_lines(self, fortran_in):
         '''returns true if at least one of the lines in the input code is
@@ -68,36 +82,84 @@ class FortLineLength(object):
         ''' returns the maximum allowed line length'''
         return self._line_length
 
-    def process(self, fortran_in):
+    def process(self, fortran_in, processes=1):
         ''' takes fortran code as a string as input and output fortran
-        code as a string with any long lines wrapped appropriately '''
-
-        fortran_out = ""
-        for line in fortran_in.split('\n'):
-            if len(line) > self._line_length:
-                line_type = self._get_line_type(line)
-
-                c_start = self._cont_start[line_type]
-                c_end = self._cont_end[line_type]
-                key_list = self._key_lists[line_type]
-
-                break_point = find_break_point(
-                    line, self._line_length-len(c_end), key_list)
-                fortran_out += line[:break_point] + c_end + "\n"
-                line = line[break_point:]
-                while len(line) + len(c_start) > self._line_length:
-                    break_point = find_break_point(
-                        line, self._line_length-len(c_end)-len(c_start),
-                        key_list)
-                    fortran_out += c_start + line[:break_point] + c_end + "\n"
-                    line = line[break_point:]
-                if line:
-                    fortran_out += c_start + line + "\n"
-            else:
-                fortran_out += line + "\n"
-
-        # We add an extra newline so remove it when we return
-        return fortran_out[:-1]
+        code as a string with any long lines wrapped appropriately. As
+        each line is wrapped independently of the others, the lines may
+        be split into chunks that are wrapped by a pool of processes.
+        This only pays off for very large amounts of code as the chunks
+        and the results have to be sent between processes.
+
+        :param str fortran_in: the fortran code.
+        :param int processes: the number of processes to use.
+
+        :returns: the fortran code with any long lines wrapped.
+        :rtype: str
+
+        '''
+        lines = fortran_in.split('\n')
+        if processes > 1 and len(lines) > processes:
+            size = -(-len(lines) // processes)
+            chunks = [(self, lines[idx:idx+size])
+                      for idx in range(0, len(lines), size)]
+            with multiprocessing.Pool(processes) as pool:
+                return "\n".join(pool.map(_process_chunk, chunks))
+        return self._process_lines(lines)
+
+    def _process_lines(self, lines):
+        ''' returns the supplied lines of fortran code (without their end
+        of line characters) wrapped and joined into a single string '''
+        length = self._line_length
+        return "\n".join([line if len(line) <= length else
+                          self._wrap_line(line) for line in lines])
+
+    def write(self, fortran_in, stream):
+        ''' Writes fortran code to a stream with any long lines wrapped
+        as by process(). The code is supplied in pieces (e.g. as generated
+        by PSyIRVisitor.iter_code) and each line is wrapped and written as
+        soon as it is complete, so that neither the input nor the output
+        code is ever held as a whole.
+
+        :param fortran_in: the pieces of the fortran code.
+        :type fortran_in: iterable of str
+        :param stream: the text stream (e.g. file object) to write to.
+        :type stream: :py:class:`io.TextIOBase`
+
+        '''
+        pending = ""
+        for piece in fortran_in:
+            lines = (pending + piece).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                stream.write(self._wrap_line(line) + "\n")
+        stream.write(self._wrap_line(pending))
+
+    def _wrap_line(self, line):
+        ''' returns the supplied line of fortran code (without its end
+        of line character) wrapped into as many lines as required '''
+
+        if len(line) <= self._line_length:
+            return line
+        line_type = self._get_line_type(line)
+
+        c_start = self._cont_start[line_type]
+        c_end = self._cont_end[line_type]
+        key_list = self._key_lists[line_type]
+
+        # Rather than copying what remains of the line after each break,
+        # keep track of where it starts.
+        break_point = find_break_point(
+            line, self._line_length-len(c_end), key_list)
+        lines = [line[:break_point] + c_end]
+        max_cont = self._line_length-len(c_end)-len(c_start)
+        while len(line) - break_point + len(c_start) > self._line_length:
+            start = break_point
+            break_point = find_break_point(
+                line, start+max_cont, key_list, start)
+            lines.append(c_start + line[start:break_point] + c_end)
+        if break_point < len(line):
+            lines.append(c_start + line[break_point:])
+        return "\n".join(lines)
 
     def _get_line_type(self, line):
         ''' Classes lines into diffrent types. This is required as
@@ -105,12 +167,7 @@ class FortLineLength(object):
         statements. It also enables us to know a little about the
         structure of the line which could be useful at some point.'''
 
-        if self._stat.match(line):
-            return "statement"
-        if self._omp.match(line):
-            return "openmp_directive"
-        if self._acc.match(line):
-            return "openacc_directive"
-        if self._comment.match(line):
-            return "comment"
+        match = self._line_type.match(line)
+        if match:
+            return match.lastgroup
         return "unknown"
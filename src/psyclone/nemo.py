@@ -152,6 +152,19 @@ class NemoPSy(PSy):
         fwriter = FortranWriter()
         return fwriter(self._container)
 
+    def iter_gen(self):
+        '''
+        Generates the Fortran for the NEMO code represented by this
+        NemoPSy object in pieces, as the Fortran backend produces it (see
+        `PSyIRVisitor.iter_code`).
+
+        :returns: the pieces of the Fortran code.
+        :rtype: Iterator[str]
+
+        '''
+        fwriter = FortranWriter()
+        yield from fwriter.iter_code(self._container)
+
 
 class NemoInvokeSchedule(InvokeSchedule):
     '''
@@ -58,7 +58,9 @@ from fparser.two.Fortran2003 import Main_Program, Module, \
 
 from psyclone.configuration import Config
 from psyclone.errors import InternalError
-from psyclone.parse.kernel import BuiltInKernelTypeFactory, get_kernel_ast, \
+from psyclone.kernel_cache import KernelCache
+from psyclone.parse.kernel import BuiltInKernelTypeFactory, \
+    get_kernel_filepath, get_kernel_parse_tree, KernelFileIndex, \
     KernelTypeFactory
 from psyclone.parse.utils import check_api, check_line_length, ParseError, \
     parse_fp2
@@ -172,6 +174,9 @@ class Parser(object):
 
         self._alg_filename = None
 
+        # The paths of the kernel source files used by the algorithm file.
+        self._kernel_files = []
+
     def parse(self, alg_filename):
         '''Takes a PSyclone conformant algorithm file as input and outputs a
         parse tree of the code contained therein and an object
@@ -194,6 +199,11 @@ class Parser(object):
 
         '''
         self._alg_filename = alg_filename
+        self._kernel_files = []
+        # The indices of the kernel search paths are reused for all of the
+        # algorithm files in a run but are checked to be up to date when
+        # they are first used for each file.
+        KernelFileIndex.revalidate()
         if self._line_length:
             # Make sure the code conforms to the line length limit.
             check_line_length(alg_filename)
@@ -321,7 +331,7 @@ class Parser(object):
                     invoke_call = self.create_invoke_call(statement)
                     invoke_calls.append(invoke_call)
 
-        return FileInfo(container_name, invoke_calls)
+        return FileInfo(container_name, invoke_calls, self._kernel_files)
 
     def create_invoke_call(self, statement):
         '''Takes the part of a parse tree containing an invoke call and
@@ -465,11 +475,32 @@ class Parser(object):
                     list(self._builtin_name_map.keys())))
             six.raise_from(ParseError(message), info)
 
-        modast = get_kernel_ast(module_name, self._alg_filename,
-                                self._kernel_paths, self._line_length)
-        return KernelCall(module_name,
-                          KernelTypeFactory(api=self._api).create(
-                              modast, name=kernel_name), args)
+        filepath = get_kernel_filepath(module_name, self._kernel_paths,
+                                       self._alg_filename)
+        if self._line_length:
+            check_line_length(filepath)
+        if filepath not in self._kernel_files:
+            self._kernel_files.append(filepath)
+
+        if not KernelCache.enabled():
+            return KernelCall(module_name,
+                              KernelTypeFactory(api=self._api).create(
+                                  get_kernel_parse_tree(filepath),
+                                  name=kernel_name), args)
+
+        # The processed metadata are cached, keyed on the content of the
+        # kernel source (so that a modified kernel is processed afresh).
+        with open(filepath, "rb") as kernel_file:
+            source_hash = KernelCache.source_hash(kernel_file.read())
+        key = KernelCache.key(source_hash, self._api, kernel_name)
+        ktype = KernelCache.load("metadata", key)
+        if ktype is None:
+            ktype = KernelTypeFactory(api=self._api).create(
+                get_kernel_parse_tree(filepath), name=kernel_name)
+            KernelCache.store("metadata", key, ktype)
+        # The hash is also used to key any cached PSyIR of the kernel.
+        ktype.source_hash = source_hash
+        return KernelCall(module_name, ktype, args)
 
     def update_arg_to_module_map(self, statement):
         '''Takes a use statement and adds its contents to the internal
@@ -869,12 +900,16 @@ class FileInfo(object):
     module, subroutine or function)
     :param calls: information about the invoke calls in the algorithm code.
     :type calls: list of :py:class:`psyclone.parse.algorithm.InvokeCall`
+    :param kernel_files: the paths of the files containing the kernels \
+        called from the algorithm code.
+    :type kernel_files: Optional[list of str]
 
     '''
 
-    def __init__(self, name, calls):
+    def __init__(self, name, calls, kernel_files=None):
         self._name = name
         self._calls = calls
+        self._kernel_files = kernel_files if kernel_files else []
 
     @property
     def name(self):
@@ -894,6 +929,16 @@ class FileInfo(object):
         '''
         return self._calls
 
+    @property
+    def kernel_files(self):
+        '''
+        :returns: the paths of the files containing the kernels called \
+            from the algorithm code.
+        :rtype: list of str
+
+        '''
+        return self._kernel_files
+
 
 class InvokeCall(object):
     '''Keeps information about an individual invoke call.
@@ -42,8 +42,11 @@ PSyclone-conformant kernel code.
 
 '''
 
+import hashlib
+import json
 import os
 import sys
+import tempfile
 
 import six
 from pyparsing import ParseException
@@ -63,6 +66,193 @@ from psyclone.configuration import Config
 from psyclone.parse.utils import check_api, check_line_length, ParseError
 
 
+class KernelFileIndex():
+    '''
+    An index of the Fortran source files (those with a .f90 or .F90
+    suffix) found in a kernel search path and all of its subdirectories,
+    keyed by the lower-cased name of each file without its suffix (which,
+    by convention, is the name of the module that it contains).
+
+    Building an index requires a single walk of the directory tree after
+    which any number of kernel modules can be looked up. The indices are
+    kept for the duration of a PSyclone run (see
+    :py:meth:`KernelFileIndex.clear`) and an index is only created afresh
+    if its directory tree is found to have changed when it is next checked
+    (see :py:meth:`KernelFileIndex.revalidate`). If Config.kernel_index_dir
+    is set
+    then they are also stored in that directory, together with the
+    modification time of every directory in the tree, so that a
+    subsequent run can reuse an index unless the tree has changed.
+
+    :param str root: the (absolute) path of the kernel search path.
+
+    '''
+    # Class variable holding the index of each kernel search path that
+    # has been used in this run.
+    _indices = {}
+    # The kernel search paths whose index has been checked to be up to
+    # date since the last call to revalidate().
+    _checked = set()
+
+    def __init__(self, root):
+        self._root = root
+        # Lower-cased module name -> list of files
+        self._files = {}
+        # Directory -> modification time (in ns) when it was indexed
+        self._dir_mtimes = {}
+        for dirpath, _, filenames in os.walk(root):
+            self._dir_mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+            for filename in filenames:
+                name, suffix = os.path.splitext(filename)
+                if suffix.lower() == ".f90":
+                    self._files.setdefault(name.lower(), []).append(
+                        os.path.join(dirpath, filename))
+
+    @staticmethod
+    def get(root):
+        '''
+        Returns the index of the supplied kernel search path, creating it
+        (or reading it from the kernel-index directory) if necessary.
+
+        :param str root: the (absolute) path of the kernel search path.
+
+        :returns: the index of the kernel search path.
+        :rtype: :py:class:`psyclone.parse.kernel.KernelFileIndex`
+
+        '''
+        index = KernelFileIndex._indices.get(root)
+        if index:
+            if root in KernelFileIndex._checked:
+                return index
+            if index.is_up_to_date():
+                KernelFileIndex._checked.add(root)
+                return index
+        index_dir = Config.get().kernel_index_dir
+        if index_dir:
+            index_file = os.path.join(index_dir,
+                                      KernelFileIndex._index_filename(root))
+            index = KernelFileIndex._load(root, index_file)
+            if not index:
+                index = KernelFileIndex(root)
+                index._store(index_file)
+        else:
+            index = KernelFileIndex(root)
+        KernelFileIndex._indices[root] = index
+        KernelFileIndex._checked.add(root)
+        return index
+
+    @staticmethod
+    def clear():
+        '''
+        Forgets all of the indices held in memory so that they are created
+        afresh (or re-validated against the stored copies) when next used.
+        This is done once at the start of a PSyclone run.
+
+        '''
+        KernelFileIndex._indices = {}
+        KernelFileIndex._checked = set()
+
+    @staticmethod
+    def revalidate():
+        '''
+        Causes each index held in memory to be checked (see
+        :py:meth:`KernelFileIndex.is_up_to_date`) when it is next used,
+        and only to be created afresh if its directory tree has changed.
+        This is done at the start of the processing of each algorithm file.
+
+        '''
+        KernelFileIndex._checked = set()
+
+    def lookup(self, module_name):
+        '''
+        :param str module_name: the name of the module (case insensitive).
+
+        :returns: the files in this index that (by naming convention) \
+            contain the named module.
+        :rtype: List[str]
+
+        '''
+        return self._files.get(module_name.lower(), [])
+
+    def is_up_to_date(self):
+        '''
+        :returns: whether none of the directories in the indexed tree have \
+            changed (i.e. had files or subdirectories added, removed or \
+            renamed) since this index was created.
+        :rtype: bool
+
+        '''
+        for dirpath, mtime in self._dir_mtimes.items():
+            try:
+                if os.stat(dirpath).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    @staticmethod
+    def _index_filename(root):
+        '''
+        :param str root: the (absolute) path of a kernel search path.
+
+        :returns: the name of the file in which the index of the \
+            supplied kernel search path is stored.
+        :rtype: str
+
+        '''
+        digest = hashlib.sha1(root.encode("utf-8")).hexdigest()
+        return f"kernel_index_{digest}.json"
+
+    @staticmethod
+    def _load(root, index_file):
+        '''
+        Reads a stored index of the supplied kernel search path.
+
+        :param str root: the (absolute) path of the kernel search path.
+        :param str index_file: the file in which the index is stored.
+
+        :returns: the stored index or None if there is no (valid) stored \
+            index or the directory tree has changed since it was stored.
+        :rtype: Optional[:py:class:`psyclone.parse.kernel.KernelFileIndex`]
+
+        '''
+        try:
+            with open(index_file, "r", encoding="utf-8") as ifile:
+                data = json.load(ifile)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("root") != root:
+            return None
+        index = KernelFileIndex.__new__(KernelFileIndex)
+        index._root = root
+        index._files = data.get("files", {})
+        index._dir_mtimes = data.get("dirs", {})
+        if not index._dir_mtimes or not index.is_up_to_date():
+            return None
+        return index
+
+    def _store(self, index_file):
+        '''
+        Stores this index in the supplied file. The file is replaced
+        atomically so that concurrent PSyclone processes never see a
+        partially-written index. Failure to store the index is not an
+        error since it will simply be created again when next required.
+
+        :param str index_file: the file in which to store the index.
+
+        '''
+        data = {"root": self._root, "files": self._files,
+                "dirs": self._dir_mtimes}
+        try:
+            fdesc, tmp_name = tempfile.mkstemp(
+                dir=os.path.dirname(index_file), prefix=".", suffix=".tmp")
+            with os.fdopen(fdesc, "w", encoding="utf-8") as ifile:
+                json.dump(data, ifile)
+            os.replace(tmp_name, index_file)
+        except OSError:
+            pass
+
+
 def get_kernel_filepath(module_name, kernel_paths, alg_filename):
     '''Search for a kernel module file containing a module with
     'module_name'. The assumed convention is that the name of the
@@ -70,7 +260,10 @@ def get_kernel_filepath(module_name, kernel_paths, alg_filename):
 
     Look in the directories and all subdirectories associated with the
     supplied kernel paths or in the same directory as the algorithm
-    file if not found within the kernel paths.
+    file if not found within the kernel paths. The contents of each
+    kernel path are found using a :py:class:`KernelFileIndex` so that the
+    directory tree is only searched once, however many kernels are looked
+    up.
 
     Return the filepath if the file is found.
 
@@ -114,13 +307,7 @@ def get_kernel_filepath(module_name, kernel_paths, alg_filename):
                 "kernel.py:get_kernel_filepath: Supplied kernel search path "
                 "does not exist or cannot be read: {0}".format(cdir))
 
-        # Recursively search down through the directory tree starting
-        # at the specified path.
-        for root, _, filenames in os.walk(cdir):
-            for filename in filenames:
-                # perform a case insensitive match
-                if filename.lower() == search_string.lower():
-                    matches.append(os.path.join(root, filename))
+        matches.extend(KernelFileIndex.get(cdir).lookup(module_name))
     if not kernel_paths:
         # Look *only* in the directory that contained the algorithm
         # file.
@@ -817,6 +1004,9 @@ class KernelType(object):
 
         self._name = name
         self._ast = ast
+        # The hash of the content of the kernel source file, if known (see
+        # KernelCache.source_hash).
+        self.source_hash = None
         self._ktype = get_kernel_metadata(name, ast)
         # TODO #1204 since the valid form of the metadata beyond this point
         # depends on the API, the code beyond this point should be refactored
@@ -42,6 +42,8 @@
     particular API and implementation. '''
 
 from __future__ import print_function, absolute_import
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
 from collections import OrderedDict
 import abc
 import six
@@ -49,6 +51,7 @@ from psyclone.configuration import Config
 from psyclone.core import AccessType
 from psyclone.errors import GenerationError, InternalError, FieldNotFoundError
 from psyclone.f2pygen import CommentGen, CallGen, PSyIRGen, UseGen
+from psyclone.kernel_cache import KernelCache
 from psyclone.parse.algorithm import BuiltInCall
 from psyclone.psyir.backend.fortran import FortranWriter
 from psyclone.psyir.backend.visitor import PSyIRVisitor
@@ -292,6 +295,17 @@ class PSy(object):
         :rtype: :py:class:`psyclone.psyir.nodes.Node`
         '''
 
+    def iter_gen(self):
+        '''Generates the same code as `gen` but yields it in pieces so that
+        the caller can write each piece out as soon as it has been
+        generated. By default the code is generated as a single piece.
+
+        :returns: the pieces of the generated Fortran code.
+        :rtype: Iterator[str]
+
+        '''
+        yield str(self.gen)
+
 
 class Invokes(object):
     '''Manage the invoke calls.
@@ -690,6 +704,11 @@ class InvokeSchedule(Routine):
     '''
     # Textual description of the node.
     _text_name = "InvokeSchedule"
+    # The arguments of all kernels, halo exchanges and global sums in this
+    # schedule, grouped by name (see _argument_index), together with the
+    # pre-order numbering of the tree that they were computed from and
+    # the arguments and their names when they were grouped.
+    _argument_index_cache = None
 
     def __init__(self, name, KernFactory, BuiltInFactory, alg_calls=None,
                  reserved_names=None, **kwargs):
@@ -729,6 +748,63 @@ class InvokeSchedule(Routine):
     def invoke(self, my_invoke):
         self._invoke = my_invoke
 
+    def __getstate__(self):
+        '''
+        Excludes the cached argument index from the state of this schedule
+        when it is copied or pickled, since it refers to the original nodes.
+
+        :returns: the attributes of this schedule.
+        :rtype: dict
+
+        '''
+        state = super().__getstate__()
+        state.pop("_argument_index_cache", None)
+        return state
+
+    def _argument_index(self):
+        '''
+        Provides the arguments of all kernels, halo exchanges and global sums
+        in this schedule, grouped by the name of the argument, so that the
+        dependencies of an argument can be found without examining all the
+        nodes before or after it (see `Argument.forward_dependence` and
+        friends). The index is built with one pass over the schedule and
+        is reused until the tree is modified, since it is tied to the cached
+        pre-order numbering of the tree (see `Node._position_index`), which
+        any modification discards. Renaming an argument does not modify the
+        tree, so the names of the arguments are also checked against those
+        that they had when the index was built.
+
+        :returns: a map from the name of each argument to the pre-order \
+            positions of the nodes containing the arguments with this name \
+            and to the pairs of these nodes and arguments, both in schedule \
+            order.
+        :rtype: Dict[str, Tuple[List[int], \
+            List[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+                       :py:class:`psyclone.psyGen.Argument`]]]]
+
+        '''
+        position_index = self._position_index()
+        cache = self._argument_index_cache
+        if (cache is None or cache[0] is not position_index or
+                list(map(attrgetter("name"), cache[2])) != cache[3]):
+            nodes, index, last = position_index
+            start = index[id(self)]
+            argument_index = {}
+            arguments = []
+            for position in range(start + 1, last[start] + 1):
+                node = nodes[position]
+                if isinstance(node, (Kern, HaloExchange, GlobalSum)):
+                    for argument in node.args:
+                        positions, node_arguments = argument_index.setdefault(
+                            argument.name, ([], []))
+                        positions.append(position)
+                        node_arguments.append((node, argument))
+                        arguments.append(argument)
+            self._argument_index_cache = (
+                position_index, argument_index, arguments,
+                [argument.name for argument in arguments])
+        return self._argument_index_cache[1]
+
     def node_str(self, colour=True):
         '''
         Returns the name of this node with appropriate control codes
@@ -1049,6 +1125,9 @@ class Kern(Statement):
     '''
     # Textual representation of the valid children for this node.
     _children_valid_format = "<LeafNode>"
+    # The variable accesses of a kernel are based on its metadata and
+    # arguments, so they cannot be cached.
+    _accesses_depend_on_tree_only = False
 
     def __init__(self, parent, call, name, ArgumentsClass, check=True):
         super(Kern, self).__init__(self, parent=parent)
@@ -1356,6 +1435,9 @@ class CodedKern(Kern):
                                         call.ktype.procedure.name,
                                         KernelArguments, check)
         self._module_code = call.ktype._ast
+        # The hash of the kernel source (if known) with which to key the
+        # cached PSyIR of the kernel.
+        self._source_hash = call.ktype.source_hash
         self._kernel_code = call.ktype.procedure
         self._fp2_ast = None  # The fparser2 AST for the kernel
         self._kern_schedule = None  # PSyIR schedule for the kernel
@@ -1378,11 +1460,39 @@ class CodedKern(Kern):
         '''
         from psyclone.psyir.frontend.fparser2 import Fparser2Reader
         if self._kern_schedule is None:
-            astp = Fparser2Reader()
-            self._kern_schedule = astp.generate_schedule(self.name, self.ast)
+            self._kern_schedule = self._create_kernel_schedule(
+                Fparser2Reader())
             # TODO: Validate kernel with metadata (issue #288).
         return self._kern_schedule
 
+    def _create_kernel_schedule(self, reader):
+        '''
+        Creates the PSyIR Schedule of the kernel code with the supplied
+        frontend. If the kernel cache is in use then the Schedule is
+        retrieved from it, or added to it if it is not already present.
+
+        :param reader: the frontend with which to create the PSyIR.
+        :type reader: :py:class:`psyclone.psyir.frontend.fparser2.\
+            Fparser2Reader`
+
+        :returns: Schedule representing the kernel code.
+        :rtype: :py:class:`psyclone.psyir.nodes.KernelSchedule`
+        '''
+        if not KernelCache.enabled():
+            return reader.generate_schedule(self.name, self.ast)
+        # The cache entry is keyed on the kernel source from which the
+        # metadata were created, falling back to regenerating the source
+        # from the parse tree if that is not known.
+        source = self._source_hash
+        if source is None:
+            source = self._module_code.tofortran()
+        key = KernelCache.key(source, self.name, type(reader).__name__)
+        schedule = KernelCache.load("psyir", key)
+        if schedule is None:
+            schedule = reader.generate_schedule(self.name, self.ast)
+            KernelCache.store("psyir", key, schedule)
+        return schedule
+
     @property
     def opencl_options(self):
         '''
@@ -1440,7 +1550,7 @@ class CodedKern(Kern):
         :returns: the name to use in the DAG for this node.
         :rtype: str
         '''
-        _, position = self._find_position(self.ancestor(Routine))
+        position = self.abs_position - self.ancestor(Routine).abs_position
         return "kernel_{0}_{1}".format(self.name, str(position))
 
     @property
@@ -1685,6 +1795,11 @@ class CodedKern(Kern):
         present is identical to the one that we would otherwise write
         to file. If this is not the case then we raise a GenerationError.)
 
+        Both schemes are safe when several PSyclone processes write to the
+        same kernel output directory: with "multiple" each new name is
+        claimed atomically and with "single" the kernel file only appears
+        once its content is complete.
+
         :raises GenerationError: if config.kernel_naming == "single" and a \
                                  different, transformed version of this \
                                  kernel is already in the output directory.
@@ -1706,6 +1821,13 @@ class CodedKern(Kern):
         else:
             old_base_name = orig_mod_name[:]
 
+        # With the "single" scheme the kernel file is written atomically
+        # once its content is known (see _write_single_kernel) so that
+        # another process never sees a partially-written kernel. A kernel
+        # that is being module in-lined is not written at all.
+        single = (Config.get().kernel_naming == "single" and
+                  not self.module_inline)
+
         # We could create a hash of a string built from the name of the
         # Algorithm (module), the name/position of the Invoke and the
         # index of this kernel within that Invoke. However, that creates
@@ -1720,6 +1842,8 @@ class CodedKern(Kern):
             new_suffix += "_{0}".format(name_idx)
             new_name = old_base_name + new_suffix + "_mod.f90"
 
+            if single:
+                break
             try:
                 # Atomically attempt to open the new kernel file (in case
                 # this is part of a parallel build)
@@ -1748,7 +1872,8 @@ class CodedKern(Kern):
             # TODO #1013: However, the file is already created (opened) and
             # currently this file is needed for the name versioning, so this
             # will create an unnecessary file.
-            os.close(fdesc)
+            if fdesc:
+                os.close(fdesc)
             return
 
         # If we reach this point the kernel needs to be written out into a
@@ -1758,36 +1883,97 @@ class CodedKern(Kern):
         fortran_writer = FortranWriter()
         # Start from the root of the schedule as we want to output
         # any module information surrounding the kernel subroutine
-        # as well as the subroutine itself.
-        new_kern_code = fortran_writer(self.get_kernel_schedule().root)
+        # as well as the subroutine itself. The code is line-wrapped
+        # and written out as it is generated.
+        new_kern_code = fortran_writer.iter_code(
+            self.get_kernel_schedule().root)
         fll = FortLineLength()
-        new_kern_code = fll.process(new_kern_code)
-
-        if not fdesc:
-            # If we've not got a file descriptor at this point then that's
-            # because the file already exists and the kernel-naming scheme
-            # ("single") means we're not creating a new one.
-            # Check that what we've got is the same as what's in the file
-            with open(os.path.join(Config.get().kernel_output_dir,
-                                   new_name), "r") as ffile:
-                kern_code = ffile.read()
-                if kern_code != new_kern_code:
-                    raise GenerationError(
-                        "A transformed version of this Kernel '{0}' already "
-                        "exists in the kernel-output directory ({1}) but is "
-                        "not the same as the current, transformed kernel and "
-                        "the kernel-renaming scheme is set to '{2}'. (If you "
-                        "wish to generate a new, unique kernel for every "
-                        "kernel that is transformed then use "
-                        "'--kernel-renaming multiple'.)".
-                        format(self._module_name+".f90",
-                               Config.get().kernel_output_dir,
-                               Config.get().kernel_naming))
+
+        if single:
+            self._write_single_kernel(new_name, new_kern_code, fll)
         else:
-            # Write the modified AST out to file
-            os.write(fdesc, new_kern_code.encode())
-            # Close the new kernel file
-            os.close(fdesc)
+            # Write the modified AST out to file (and close the file)
+            with os.fdopen(fdesc, "w", encoding="utf-8",
+                           newline="") as kern_file:
+                fll.write(new_kern_code, kern_file)
+
+    def _write_single_kernel(self, new_name, new_kern_code, fll):
+        '''
+        Writes the supplied kernel code to the named file in the kernel
+        output directory unless that file already exists, in which case
+        its content is checked against the supplied code. The code is
+        first written, as it is generated, to a temporary file which is
+        then hard-linked to the final name. Since creating the link is
+        atomic and fails if the file already exists, another process (e.g.
+        in a parallel build) either sees no kernel file or the complete
+        one. If the file system does not support hard links then the
+        kernel file is created exclusively and the temporary file is
+        copied into it instead.
+
+        :param str new_name: the name of the kernel file.
+        :param new_kern_code: the pieces of the (transformed) kernel code.
+        :type new_kern_code: Iterable[str]
+        :param fll: the object with which to wrap long lines as the code \
+            is written.
+        :type fll: :py:class:`psyclone.line_length.FortLineLength`
+
+        :raises GenerationError: if a different, transformed version of \
+            this kernel is already in the kernel output directory.
+
+        '''
+        import filecmp
+        import os
+        import shutil
+        import tempfile
+
+        out_dir = Config.get().kernel_output_dir
+        kern_file = os.path.join(out_dir, new_name)
+        # The temporary file is only readable by its owner so give it the
+        # permissions that a file created with os.open would have.
+        umask = os.umask(0)
+        os.umask(umask)
+        fdesc, tmp_name = tempfile.mkstemp(dir=out_dir, prefix=".",
+                                           suffix=".tmp")
+        try:
+            with os.fdopen(fdesc, "w", encoding="utf-8",
+                           newline="") as tmp_file:
+                os.fchmod(tmp_file.fileno(), 0o777 & ~umask)
+                fll.write(new_kern_code, tmp_file)
+            try:
+                os.link(tmp_name, kern_file)
+                return
+            except FileExistsError:
+                pass
+            except OSError:
+                # Hard links are not supported so create the kernel file
+                # exclusively instead.
+                try:
+                    fdesc = os.open(kern_file,
+                                    os.O_CREAT | os.O_WRONLY | os.O_EXCL)
+                except FileExistsError:
+                    pass
+                else:
+                    with os.fdopen(fdesc, "wb") as new_file, \
+                            open(tmp_name, "rb") as tmp_file:
+                        shutil.copyfileobj(tmp_file, new_file)
+                    return
+
+            # The kernel file already exists and the kernel-naming scheme
+            # ("single") means we're not creating a new one. Check that
+            # what we've got is the same as what's in the file.
+            if not filecmp.cmp(tmp_name, kern_file, shallow=False):
+                raise GenerationError(
+                    "A transformed version of this Kernel '{0}' already "
+                    "exists in the kernel-output directory ({1}) but is "
+                    "not the same as the current, transformed kernel and "
+                    "the kernel-renaming scheme is set to '{2}'. (If you "
+                    "wish to generate a new, unique kernel for every "
+                    "kernel that is transformed then use "
+                    "'--kernel-renaming multiple'.)".
+                    format(self._module_name+".f90", out_dir,
+                           Config.get().kernel_naming))
+        finally:
+            os.remove(tmp_name)
 
     def _rename_psyir(self, suffix):
         '''Rename the PSyIR module and kernel names by adding the supplied
@@ -1925,7 +2111,7 @@ class BuiltIn(Kern):
         :returns: the name to use in the DAG for this node.
         :rtype: str
         '''
-        _, position = self._find_position(self.ancestor(Routine))
+        position = self.abs_position - self.ancestor(Routine).abs_position
         return "builtin_{0}_{1}".format(self.name, str(position))
 
     def load(self, call, arguments, parent=None):
@@ -2415,8 +2601,7 @@ class Argument(object):
         :rtype: :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.preceding(reverse=True)
-        return self._find_argument(nodes)
+        return self._first_dependence(self._preceding_arguments())
 
     def forward_write_dependencies(self, ignore_halos=False):
         '''Returns a list of following write arguments that this argument has
@@ -2433,9 +2618,8 @@ class Argument(object):
         :rtype: list of :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.following()
-        results = self._find_write_arguments(nodes, ignore_halos=ignore_halos)
-        return results
+        return self._write_dependences(self._following_arguments(),
+                                       ignore_halos=ignore_halos)
 
     def backward_write_dependencies(self, ignore_halos=False):
         '''Returns a list of previous write arguments that this argument has
@@ -2453,9 +2637,8 @@ class Argument(object):
         :rtype: list of :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.preceding(reverse=True)
-        results = self._find_write_arguments(nodes, ignore_halos=ignore_halos)
-        return results
+        return self._write_dependences(self._preceding_arguments(),
+                                       ignore_halos=ignore_halos)
 
     def forward_dependence(self):
         '''Returns the following argument that this argument has a direct
@@ -2467,8 +2650,7 @@ class Argument(object):
         :rtype: :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.following()
-        return self._find_argument(nodes)
+        return self._first_dependence(self._following_arguments())
 
     def forward_read_dependencies(self):
         '''Returns a list of following read arguments that this argument has
@@ -2482,8 +2664,73 @@ class Argument(object):
         :rtype: list of :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes = self._call.following()
-        return self._find_read_arguments(nodes)
+        return self._read_dependences(self._following_arguments())
+
+    def _following_arguments(self):
+        '''Returns the arguments (with the nodes that contain them) after
+        the call of this argument, in schedule order. If the call is in an
+        InvokeSchedule, only the arguments with the same name are returned
+        (no other argument can be dependent on this argument), using the
+        argument index of the schedule.
+
+        :returns: pairs of a node and one of its arguments.
+        :rtype: Iterable[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+                               :py:class:`psyclone.psyGen.Argument`]]
+
+        '''
+        schedule = self._call.ancestor(Routine)
+        if not isinstance(schedule, InvokeSchedule):
+            return self._node_arguments(self._call.iter_following())
+        # pylint: disable=protected-access
+        positions, node_arguments = schedule._argument_index().get(
+            self._name, ([], []))
+        _, index, _ = self._call._position_index()
+        return node_arguments[bisect_right(positions, index[id(self._call)]):]
+
+    def _preceding_arguments(self):
+        '''Returns the arguments (with the nodes that contain them) before
+        the call of this argument, starting with the closest node. If the
+        call is in an InvokeSchedule, only the arguments with the same name
+        are returned (no other argument can be dependent on this argument),
+        using the argument index of the schedule.
+
+        :returns: pairs of a node and one of its arguments.
+        :rtype: Iterable[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+                               :py:class:`psyclone.psyGen.Argument`]]
+
+        '''
+        schedule = self._call.ancestor(Routine)
+        if not isinstance(schedule, InvokeSchedule):
+            return self._node_arguments(
+                self._call.iter_preceding(reverse=True))
+        # pylint: disable=protected-access
+        positions, node_arguments = schedule._argument_index().get(
+            self._name, ([], []))
+        _, index, _ = self._call._position_index()
+        end = bisect_left(positions, index[id(self._call)])
+        # The nodes are visited in reverse order, but the arguments of each
+        # node are still visited in their original order (the sort is
+        # stable).
+        order = sorted(range(end), key=lambda idx: -positions[idx])
+        return [node_arguments[idx] for idx in order]
+
+    @staticmethod
+    def _node_arguments(nodes):
+        '''Returns the arguments of all nodes in the list that have
+        arguments (calls, haloexchanges and globalsums).
+
+        :param nodes: the list of nodes to examine.
+        :type nodes: list of :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: pairs of a node and one of its arguments, in order.
+        :rtype: Iterator[Tuple[:py:class:`psyclone.psyir.nodes.Node`, \
+                               :py:class:`psyclone.psyGen.Argument`]]
+
+        '''
+        for node in nodes:
+            if isinstance(node, (Kern, HaloExchange, GlobalSum)):
+                for argument in node.args:
+                    yield node, argument
 
     def _find_argument(self, nodes):
         '''Return the first argument in the list of nodes that has a
@@ -2496,12 +2743,24 @@ class Argument(object):
         :rtype: :py:class:`psyclone.psyGen.Argument`
 
         '''
-        nodes_with_args = [x for x in nodes if
-                           isinstance(x, (Kern, HaloExchange, GlobalSum))]
-        for node in nodes_with_args:
-            for argument in node.args:
-                if self._depends_on(argument):
-                    return argument
+        return self._first_dependence(self._node_arguments(nodes))
+
+    def _first_dependence(self, node_arguments):
+        '''Return the first of the supplied arguments that has a dependency
+        with self. If one is not found return None.
+
+        :param node_arguments: pairs of a node and one of its arguments.
+        :type node_arguments: Iterable[Tuple[ \
+            :py:class:`psyclone.psyir.nodes.Node`, \
+            :py:class:`psyclone.psyGen.Argument`]]
+
+        :returns: An argument object or None.
+        :rtype: :py:class:`psyclone.psyGen.Argument`
+
+        '''
+        for _, argument in node_arguments:
+            if self._depends_on(argument):
+                return argument
         return None
 
     def _find_read_arguments(self, nodes):
@@ -2516,28 +2775,41 @@ class Argument(object):
             this argument.
         :rtype: list of :py:class:`psyclone.psyGen.Argument`
 
+        '''
+        return self._read_dependences(self._node_arguments(nodes))
+
+    def _read_dependences(self, node_arguments):
+        '''Return a list of the supplied arguments that have a read
+        dependency with self. If none are found then return an empty
+        list. If self is not a writer then return an empty list.
+
+        :param node_arguments: pairs of a node and one of its arguments.
+        :type node_arguments: Iterable[Tuple[ \
+            :py:class:`psyclone.psyir.nodes.Node`, \
+            :py:class:`psyclone.psyGen.Argument`]]
+
+        :returns: a list of arguments that have a read dependence on \
+            this argument.
+        :rtype: list of :py:class:`psyclone.psyGen.Argument`
+
         '''
         if self.access not in AccessType.all_write_accesses():
             # I am not a writer so there will be no read dependencies
             return []
 
-        # We only need consider nodes that have arguments
-        nodes_with_args = [x for x in nodes if
-                           isinstance(x, (Kern, HaloExchange, GlobalSum))]
         access = DataAccess(self)
         arguments = []
-        for node in nodes_with_args:
-            for argument in node.args:
-                # look at all arguments in our nodes
-                if argument.access in AccessType.all_read_accesses() and \
-                   access.overlaps(argument):
-                    arguments.append(argument)
-                if argument.access in AccessType.all_write_accesses():
-                    access.update_coverage(argument)
-                    if access.covered:
-                        # We have now found all arguments upon which
-                        # this argument depends so return the list.
-                        return arguments
+        for _, argument in node_arguments:
+            # look at all arguments in our nodes
+            if argument.access in AccessType.all_read_accesses() and \
+               access.overlaps(argument):
+                arguments.append(argument)
+            if argument.access in AccessType.all_write_accesses():
+                access.update_coverage(argument)
+                if access.covered:
+                    # We have now found all arguments upon which
+                    # this argument depends so return the list.
+                    return arguments
 
         # we did not find a terminating write dependence in the list
         # of nodes so we return any read dependencies that were found
@@ -2557,38 +2829,60 @@ class Argument(object):
             this argument.
         :rtype: list of :py:class:`psyclone.psyGen.Argument`
 
+        '''
+        return self._write_dependences(self._node_arguments(nodes),
+                                       ignore_halos=ignore_halos)
+
+    def _write_dependences(self, node_arguments, ignore_halos=False):
+        '''Return a list of the supplied arguments that have a write
+        dependency with self. If none are found then return an empty
+        list. If self is not a reader then return an empty list.
+
+        :param node_arguments: pairs of a node and one of its arguments.
+        :type node_arguments: Iterable[Tuple[ \
+            :py:class:`psyclone.psyir.nodes.Node`, \
+            :py:class:`psyclone.psyGen.Argument`]]
+        :param bool ignore_halos: if `True` then any write dependencies \
+            involving a halo exchange are ignored. Defaults to `False`.
+
+        :returns: a list of arguments that have a write dependence with \
+            this argument.
+        :rtype: list of :py:class:`psyclone.psyGen.Argument`
+
+        :raises InternalError: if more than one dependence is found and \
+            the last one is not in a halo exchange.
+        :raises InternalError: if there are dependencies but no write \
+            covers all accesses of this argument.
+
         '''
         if self.access not in AccessType.all_read_accesses():
             # I am not a reader so there will be no write dependencies
             return []
 
-        # We only need consider nodes that have arguments
-        nodes_with_args = [x for x in nodes if
-                           isinstance(x, (Kern, GlobalSum)) or
-                           (isinstance(x, HaloExchange) and not ignore_halos)]
         access = DataAccess(self)
         arguments = []
-        for node in nodes_with_args:
-            for argument in node.args:
-                # look at all arguments in our nodes
-                if argument.access not in AccessType.all_write_accesses():
-                    # no dependence if not a writer
-                    continue
-                if not access.overlaps(argument):
-                    # Accesses are independent of each other
-                    continue
-                arguments.append(argument)
-                access.update_coverage(argument)
-                if access.covered:
-                    # sanity check
-                    if not isinstance(node, HaloExchange) and \
-                       len(arguments) > 1:
-                        raise InternalError(
-                            "Found a writer dependence but there are already "
-                            "dependencies. This should not happen.")
-                    # We have now found all arguments upon which this
-                    # argument depends so return the list.
-                    return arguments
+        for node, argument in node_arguments:
+            if ignore_halos and isinstance(node, HaloExchange):
+                continue
+            # look at all arguments in our nodes
+            if argument.access not in AccessType.all_write_accesses():
+                # no dependence if not a writer
+                continue
+            if not access.overlaps(argument):
+                # Accesses are independent of each other
+                continue
+            arguments.append(argument)
+            access.update_coverage(argument)
+            if access.covered:
+                # sanity check
+                if not isinstance(node, HaloExchange) and \
+                   len(arguments) > 1:
+                    raise InternalError(
+                        "Found a writer dependence but there are already "
+                        "dependencies. This should not happen.")
+                # We have now found all arguments upon which this
+                # argument depends so return the list.
+                return arguments
         if arguments:
             raise InternalError(
                 "Argument()._field_write_arguments() There are no more nodes "
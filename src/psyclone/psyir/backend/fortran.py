@@ -349,6 +349,9 @@ class FortranWriter(LanguageWriter):
 
     '''
     _COMMENT_PREFIX = "! "
+    # The symbol tables of a Routine are merged (and the symbols renamed if
+    # necessary) when it is visited.
+    _MODIFIED_NODE_TYPES = (Routine, )
 
     def __init__(self, skip_nodes=False, indent_string="  ",
                  initial_indent_depth=0, check_global_constraints=True):
@@ -974,6 +977,40 @@ class FortranWriter(LanguageWriter):
 
         return declarations
 
+    def _iter_visit(self, node):
+        '''Yields the Fortran code of the PSyIR node sub-tree in pieces.
+        The code of a FileContainer is yielded as the pieces of the code of
+        each of its children and the code of a Container is yielded as its
+        specification part, the code of each of its routines and its end
+        statement. The code of any other node (or of a Container with an
+        inline comment) is yielded as a single piece.
+
+        :param node: A PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the pieces of the Fortran code of the node.
+        :rtype: Iterator[str]
+
+        '''
+        method_name = self._method_name(type(node))
+        if (method_name not in ("filecontainer_node", "container_node") or
+                getattr(type(self), method_name) is not
+                getattr(FortranWriter, method_name) or
+                node.inline_comment):
+            yield self._visit(node)
+            return
+
+        # The same as _visit but yielding the pieces of the code.
+        if self._validate_nodes:
+            node.validate_global_constraints()
+        if node.preceding_comment and self._COMMENT_PREFIX:
+            yield (self._nindent + self._COMMENT_PREFIX +
+                   node.preceding_comment + "\n")
+        if method_name == "filecontainer_node":
+            yield from self._iter_filecontainer_node(node)
+        else:
+            yield from self._iter_container_node(node)
+
     def filecontainer_node(self, node):
         '''This method is called when a FileContainer instance is found in
         the PSyIR tree.
@@ -987,6 +1024,19 @@ class FortranWriter(LanguageWriter):
         :returns: the Fortran code as a string.
         :rtype: str
 
+        '''
+        return "".join(self._iter_filecontainer_node(node))
+
+    def _iter_filecontainer_node(self, node):
+        '''Yields the Fortran code of a FileContainer in pieces (see
+        `filecontainer_node`).
+
+        :param node: a Container PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.FileContainer`
+
+        :returns: the pieces of the Fortran code.
+        :rtype: Iterator[str]
+
         :raises VisitorError: if the attached symbol table contains \
             any data symbols.
         :raises VisitorError: if more than one child is a Routine Node \
@@ -1007,10 +1057,8 @@ class FortranWriter(LanguageWriter):
                 f"most one routine node that is a program, but found "
                 f"{program_nodes}.")
 
-        result = ""
         for child in node.children:
-            result += self._visit(child)
-        return result
+            yield from self._iter_visit(child)
 
     def container_node(self, node):
         '''This method is called when a Container instance is found in
@@ -1024,6 +1072,20 @@ class FortranWriter(LanguageWriter):
         :returns: the Fortran code as a string.
         :rtype: str
 
+        '''
+        return "".join(self._iter_container_node(node))
+
+    def _iter_container_node(self, node):
+        '''Yields the Fortran code of a Container in pieces (see
+        `container_node`): the specification part of the module, the code
+        of each of its routines and the end of the module.
+
+        :param node: a Container PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Container`
+
+        :returns: the pieces of the Fortran code.
+        :rtype: Iterator[str]
+
         :raises VisitorError: if the name attribute of the supplied \
             node is empty or None.
         :raises VisitorError: if any of the children of the supplied \
@@ -1060,21 +1122,19 @@ class FortranWriter(LanguageWriter):
         # Accessibility statements for routine symbols
         declarations += self.gen_routine_access_stmts(node.symbol_table)
 
-        # Get the subroutine statements.
-        subroutines = ""
-        for child in node.children:
-            subroutines += self._visit(child)
-
-        result += (
+        yield (
+            f"{result}"
             f"{imports}"
             f"{self._nindent}implicit none\n"
             f"{declarations}\n"
-            f"{self._nindent}contains\n"
-            f"{subroutines}\n")
+            f"{self._nindent}contains\n")
+
+        # Get the subroutine statements.
+        for child in node.children:
+            yield self._visit(child)
 
         self._depth -= 1
-        result += f"{self._nindent}end module {node.name}\n"
-        return result
+        yield f"\n{self._nindent}end module {node.name}\n"
 
     def routine_node(self, node):
         '''This method is called when a Routine node is found in
@@ -70,6 +70,9 @@ class LanguageWriter(PSyIRVisitor):
     :raises TypeError: if any of the supplied parameters are of the wrong type.
 
     '''
+    # Language writers only create text and do not modify the tree.
+    _VISITS_IN_PLACE = True
+
     # pylint: disable=too-many-arguments
     def __init__(self, array_parenthesis, structure_character,
                  skip_nodes=False, indent_string="  ",
@@ -119,6 +119,9 @@ class SIRWriter(PSyIRVisitor):
     start with. This is an optional argument that defaults to 0.
 
     '''
+    # The SIR writer only creates text and does not modify the tree.
+    _VISITS_IN_PLACE = True
+
     def __init__(self, skip_nodes=False, indent_string="  ",
                  initial_indent_depth=0):
         super(SIRWriter, self).__init__(skip_nodes, indent_string,
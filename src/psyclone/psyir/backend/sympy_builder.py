@@ -0,0 +1,408 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''PSyIR backend that creates SymPy expressions directly from PSyIR
+expressions, i.e. without writing them as strings that are then parsed
+by SymPy.
+'''
+
+from sympy import (And, Eq, Float, Function, Ge, Gt, Integer, Le, Lt, Max,
+                   Min, Mod, Ne, Not, Or, exp)
+from sympy.parsing.sympy_parser import parse_expr
+
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.backend.sympy_writer import SymPyWriter
+from psyclone.psyir.backend.visitor import PSyIRVisitor, VisitorError
+from psyclone.psyir.nodes import (BinaryOperation, NaryOperation,
+                                  UnaryOperation)
+from psyclone.psyir.symbols import ScalarType, SymbolTable
+
+
+class SymPyBuilder(PSyIRVisitor):
+    '''Implements a PSyIR-to-SymPy backend that constructs the SymPy
+    objects (Symbols, Functions, Add, Mul, ...) representing a PSyIR
+    expression directly. It creates the same SymPy expressions as parsing
+    the output of the :py:class:`psyclone.psyir.backend.sympy_writer.\
+    SymPyWriter`, including the renaming of structure members, but it
+    avoids the expensive parsing of strings by SymPy. The one difference
+    is that the structure of the PSyIR is always preserved, e.g.
+    `2*a%b` becomes `2*Mod(a, a_b)` (while parsing the string `2*a%a_b`
+    results in `Mod(2*a, a_b)`), and relational and logical operations
+    are supported. A full description of the handling of structure
+    accesses can be found in the manual:
+    https://psyclone-dev.readthedocs.io/en/latest/sympy.html#sympy
+
+    :param type_map: Optional initial mapping that contains the SymPy data \
+        type of each reference in the expressions. This is the result of the \
+        static function \
+        :py:meth:`psyclone.psyir.backend.sympy_writer.SymPyWriter.\
+        create_type_map`.
+    :type type_map: dict of str:Sympy-data-type values
+
+    '''
+    # The expressions are not modified, so no copy of the tree is required.
+    _VISITS_IN_PLACE = True
+
+    # The SymPy functions or classes to use for the operators that SymPy
+    # supports. All other operators (e.g. SQRT or LBOUND) are handled as
+    # unknown SymPy functions with the name of the Fortran intrinsic.
+    _SYMPY_OPERATORS = {
+        UnaryOperation.Operator.MINUS: lambda arg: -arg,
+        UnaryOperation.Operator.PLUS: lambda arg: arg,
+        UnaryOperation.Operator.NOT: Not,
+        # exp is needed for a test case only, in general the maths
+        # functions can just be handled as unknown sympy functions.
+        UnaryOperation.Operator.EXP: exp,
+        BinaryOperation.Operator.ADD: lambda lhs, rhs: lhs + rhs,
+        BinaryOperation.Operator.SUB: lambda lhs, rhs: lhs - rhs,
+        BinaryOperation.Operator.MUL: lambda lhs, rhs: lhs * rhs,
+        BinaryOperation.Operator.DIV: lambda lhs, rhs: lhs / rhs,
+        BinaryOperation.Operator.POW: lambda lhs, rhs: lhs ** rhs,
+        BinaryOperation.Operator.REM: Mod,
+        BinaryOperation.Operator.MAX: Max,
+        BinaryOperation.Operator.MIN: Min,
+        BinaryOperation.Operator.EQ: Eq,
+        BinaryOperation.Operator.NE: Ne,
+        BinaryOperation.Operator.GT: Gt,
+        BinaryOperation.Operator.LT: Lt,
+        BinaryOperation.Operator.GE: Ge,
+        BinaryOperation.Operator.LE: Le,
+        BinaryOperation.Operator.AND: And,
+        BinaryOperation.Operator.OR: Or,
+        NaryOperation.Operator.MAX: Max,
+        NaryOperation.Operator.MIN: Min,
+    }
+
+    # The Fortran names of all other operators, indexed by operator. This
+    # is initialised when the first SymPyBuilder is created.
+    _fortran_names = {}
+
+    def __init__(self, type_map=None):
+        super().__init__()
+
+        # The symbol table is used to create unique names for structure
+        # members that are being accessed, in the same way as the
+        # SymPyWriter does.
+        self._symbol_table = SymbolTable()
+
+        if type_map is None:
+            self._sympy_type_map = {}
+        else:
+            self._sympy_type_map = type_map
+
+        for symbol_name in self._sympy_type_map:
+            self._symbol_table.find_or_create_tag(tag=symbol_name,
+                                                  root_name=symbol_name)
+
+        if not SymPyBuilder._fortran_names:
+            fortran_writer = FortranWriter()
+            for operation in [UnaryOperation, BinaryOperation,
+                              NaryOperation]:
+                for operator in operation.Operator:
+                    SymPyBuilder._fortran_names[operator] = \
+                        fortran_writer.get_operator(operator)
+
+    @staticmethod
+    def get_sympy_expressions_and_symbol_map(list_of_expressions):
+        '''
+        This function takes a list of PSyIR expressions, and converts
+        them all into SymPy expressions. It takes care of all Fortran
+        specific conversion required (e.g. constants with kind
+        specification, ...), including the renaming of member accesses,
+        as described in
+        https://psyclone-dev.readthedocs.io/en/latest/sympy.html#sympy
+        It also returns the symbol map, i.e. the mapping of Fortran symbol
+        names to SymPy Symbols.
+
+        :param list_of_expressions: the list of expressions which are to be \
+            converted into SymPy expressions.
+        :type list_of_expressions: list of \
+            :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: a 2-tuple consisting of the the converted PSyIR \
+            expressions, followed by a dictionary mapping the symbol names \
+            to SymPy Symbols.
+        :rtype: Tuple[List[:py:class:`sympy.core.basic.Basic`], \
+            Dict[str, :py:class:`sympy.core.symbol.Symbol`]]
+
+        :raises VisitorError: if an expression cannot be represented \
+            in SymPy.
+
+        '''
+        type_map = SymPyWriter.create_type_map(list_of_expressions)
+        builder = SymPyBuilder(type_map)
+        # Like the SymPyWriter, this can add entries for the members
+        # of structures to type_map. We use `_visit()` since the
+        # expressions are not modified.
+        # pylint: disable=protected-access
+        return ([builder._visit(expr) for expr in list_of_expressions],
+                type_map)
+
+    @staticmethod
+    def convert_to_sympy_expressions(list_of_expressions):
+        '''
+        This function takes a list of PSyIR expressions, and converts
+        them all into SymPy expressions, see
+        :py:meth:`get_sympy_expressions_and_symbol_map`.
+
+        :param list_of_expressions: the list of expressions which are to be \
+            converted into SymPy expressions.
+        :type list_of_expressions: list of \
+            :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the converted PSyIR expressions.
+        :rtype: List[:py:class:`sympy.core.basic.Basic`]
+
+        '''
+        sympy_expressions, _ = SymPyBuilder.\
+            get_sympy_expressions_and_symbol_map(list_of_expressions)
+        return sympy_expressions
+
+    def node_node(self, node):
+        '''This method is called for any node that cannot be represented
+        in SymPy (e.g. a CodeBlock or a Range).
+
+        :param node: a PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :raises VisitorError: as the node is not supported.
+
+        '''
+        raise VisitorError(
+            f"Unsupported node '{type(node).__name__}' found: SymPy "
+            f"expressions can only be created for Fortran expressions "
+            f"without array ranges.")
+
+    def codeblock_node(self, node):
+        '''This method is called when a CodeBlock instance is found in the
+        PSyIR tree. Since there is no PSyIR for its content, the Fortran
+        code (as written by the SymPyWriter) is parsed by SymPy.
+
+        :param node: a CodeBlock PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.CodeBlock`
+
+        :returns: the SymPy representation of the code block.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        :raises VisitorError: if the code is not a valid SymPy expression.
+
+        '''
+        # pylint: disable=protected-access
+        code = SymPyWriter(self._sympy_type_map)._visit(node)
+        try:
+            return parse_expr(code, self._sympy_type_map)
+        except SyntaxError as err:
+            raise VisitorError("Invalid SymPy expression") from err
+
+    def reference_node(self, node):
+        '''This method is called when a Reference instance is found in the
+        PSyIR tree.
+
+        :param node: a Reference PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Reference`
+
+        :returns: the SymPy Symbol (or Function) for this reference.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        '''
+        return self._sympy_type_map[node.name]
+
+    def arrayreference_node(self, node):
+        '''This method is called when an ArrayReference instance is found
+        in the PSyIR tree.
+
+        :param node: an ArrayReference PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.ArrayReference`
+
+        :returns: the SymPy function call representing this array access.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        '''
+        return self._sympy_type_map[node.name](
+            *[self._visit(index) for index in node.indices])
+
+    def structurereference_node(self, node):
+        '''This method is called when a StructureReference instance is found
+        in the PSyIR tree. An access to a member 'b' of a structure 'a'
+        is represented as `Mod(a, a_b)`, as described in
+        :py:meth:`member_node`.
+
+        :param node: a StructureReference PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.StructureReference`
+
+        :returns: the SymPy representation of this structure access.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        '''
+        return self._member_access(self._sympy_type_map[node.name],
+                                   node.member)
+
+    def arrayofstructuresreference_node(self, node):
+        '''This method is called when an ArrayOfStructuresReference instance
+        is found in the PSyIR tree.
+
+        :param node: an ArrayOfStructuresReference PSyIR node.
+        :type node: \
+            :py:class:`psyclone.psyir.nodes.ArrayOfStructuresReference`
+
+        :returns: the SymPy representation of this structure access.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        '''
+        array = self._sympy_type_map[node.name](
+            *[self._visit(index) for index in node.indices])
+        return self._member_access(array, node.member)
+
+    def _member_access(self, structure, member):
+        '''Creates the SymPy representation of the access to a member of
+        a structure. Since `a%b%c` is parsed by SymPy as `(a%b)%c`, the
+        access to the member `member` of `structure` is `Mod(structure, m)`
+        where `m` is the representation of `member` itself, and if `member`
+        is a structure itself, the access to its member is added in turn.
+
+        :param structure: the SymPy representation of the structure.
+        :type structure: :py:class:`sympy.core.basic.Basic`
+        :param member: the member of the structure that is accessed.
+        :type member: :py:class:`psyclone.psyir.nodes.Member`
+
+        :returns: the SymPy representation of the member access.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        '''
+        result = Mod(structure, self._visit(member))
+        if hasattr(member, "member"):
+            # This is an access to a member of a structure member.
+            result = self._member_access(result, member.member)
+        return result
+
+    def member_node(self, node):
+        '''This method is called when a Member instance is found in the
+        PSyIR tree. As in the SymPyWriter, the member gets a new name that
+        is unique in the expressions, e.g. `a%b` becomes `Mod(a, a_b)`. See
+        :py:meth:`psyclone.psyir.backend.sympy_writer.SymPyWriter.\
+        member_node` for details. Any access to a member of this member
+        is added by the caller.
+
+        :param node: a Member PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Member`
+
+        :returns: the SymPy representation of this member (without any \
+            members that are accessed).
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        '''
+        new_name = SymPyWriter.create_member_name(node, self._symbol_table,
+                                                  self._sympy_type_map)
+        if node.is_array:
+            return self._sympy_type_map[new_name](
+                *[self._visit(index) for index in node.indices])
+        return self._sympy_type_map[new_name]
+
+    def literal_node(self, node):
+        '''This method is called when a Literal instance is found in the
+        PSyIR tree. Any precision information is ignored. Character
+        constants are not supported and will raise an exception.
+
+        :param node: a Literal PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Literal`
+
+        :returns: the SymPy representation for the literal.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        :raises TypeError: if a character constant is found, which \
+            is not supported with SymPy.
+
+        '''
+        intrinsic = node.datatype.intrinsic
+        if intrinsic == ScalarType.Intrinsic.BOOLEAN:
+            # Like parsing `True` with SymPy, this returns a Python bool
+            # (so that e.g. subtracting two booleans works).
+            return node.value == "true"
+        if intrinsic == ScalarType.Intrinsic.CHARACTER:
+            raise TypeError(f"SymPy cannot handle strings "
+                            f"like '{node.value}'.")
+        if intrinsic == ScalarType.Intrinsic.REAL:
+            return Float(node.value)
+        return Integer(node.value)
+
+    def operation_node(self, node):
+        '''This method is called when a UnaryOperation, BinaryOperation or
+        NaryOperation instance is found in the PSyIR tree. Operators that
+        have no equivalent in SymPy are represented as unknown SymPy
+        functions, using the name of the Fortran intrinsic (e.g. `SQRT`).
+
+        :param node: an Operation PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Operation`
+
+        :returns: the SymPy representation of the operation.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        :raises VisitorError: if the operation has named arguments.
+
+        '''
+        if any(node.argument_names):
+            raise VisitorError(
+                f"Named arguments are not supported by SymPy, but found "
+                f"'{node.argument_names}' in operation '{node.operator}'.")
+        args = [self._visit(child) for child in node.children]
+        try:
+            return self._SYMPY_OPERATORS[node.operator](*args)
+        except KeyError:
+            return Function(self._fortran_names[node.operator])(*args)
+
+    def call_node(self, node):
+        '''This method is called when a Call instance is found in the
+        PSyIR tree. A function call is represented as an unknown SymPy
+        function.
+
+        :param node: a Call PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Call`
+
+        :returns: the SymPy representation of the function call.
+        :rtype: :py:class:`sympy.core.basic.Basic`
+
+        :raises VisitorError: if the call has named arguments.
+
+        '''
+        if any(node.argument_names):
+            raise VisitorError(
+                f"Named arguments are not supported by SymPy, but found "
+                f"'{node.argument_names}' in the call to "
+                f"'{node.routine.name}'.")
+        return Function(node.routine.name)(
+            *[self._visit(child) for child in node.children])
+
+
+# For AutoAPI documentation generation
+__all__ = ['SymPyBuilder']
@@ -139,29 +139,30 @@ class SymPyWriter(FortranWriter):
         return sympy_type_map
 
     @staticmethod
-    def get_sympy_expressions_and_symbol_map(list_of_expressions):
+    def get_sympy_strings_and_type_map(list_of_expressions):
         '''
         This function takes a list of PSyIR expressions, and converts
-        them all into Sympy expressions using the SymPy parser.
-        It takes care of all Fortran specific conversion required (e.g.
-        constants with kind specification, ...), including the renaming of
-        member accesses, as described in
+        them all into strings that can be parsed by SymPy. It takes care of
+        all Fortran specific conversion required (e.g. constants with kind
+        specification, ...), including the renaming of member accesses, as
+        described in
         https://psyclone-dev.readthedocs.io/en/latest/sympy.html#sympy
-        It also returns the symbol map, i.e. the mapping of Fortran symbol
-        names to SymPy Symbols.
+        It also returns the type map, i.e. the mapping of the names used in
+        these strings to SymPy Symbols or Functions. Together, these
+        determine the SymPy expressions that are created from the PSyIR
+        expressions.
 
         :param list_of_expressions: the list of expressions which are to be \
             converted into SymPy-parsable strings.
         :type list_of_expressions: list of \
             :py:class:`psyclone.psyir.nodes.Node`
 
-        :returns: a 2-tuple consisting of the the converted PSyIR \
-            expressions, followed by a dictionary mapping the symbol names \
-            to SymPy Symbols.
-        :rtype: Tuple[List[:py:class:`sympy.core.basic.Basic`], \
-            Dict[str, :py:class:`sympy.core.symbol.Symbol`]]
-
-        :raises VisitorError: if an invalid SymPy expression is found.
+        :returns: a 2-tuple consisting of the strings representing the \
+            PSyIR expressions, followed by a dictionary mapping the names \
+            used in them to SymPy Symbols or Functions.
+        :rtype: Tuple[List[str], \
+            Dict[str, Union[:py:class:`sympy.core.symbol.Symbol`, \
+                            :py:class:`sympy.core.function.Function`]]]
 
         '''
         # Create the type_map that will include all symbols used in both
@@ -183,6 +184,37 @@ class SymPyWriter(FortranWriter):
             # pylint: disable=protected-access
             expression_str_list.append(writer._visit(expr))
 
+        return expression_str_list, type_map
+
+    @staticmethod
+    def get_sympy_expressions_and_symbol_map(list_of_expressions):
+        '''
+        This function takes a list of PSyIR expressions, and converts
+        them all into Sympy expressions using the SymPy parser.
+        It takes care of all Fortran specific conversion required (e.g.
+        constants with kind specification, ...), including the renaming of
+        member accesses, as described in
+        https://psyclone-dev.readthedocs.io/en/latest/sympy.html#sympy
+        It also returns the symbol map, i.e. the mapping of Fortran symbol
+        names to SymPy Symbols.
+
+        :param list_of_expressions: the list of expressions which are to be \
+            converted into SymPy-parsable strings.
+        :type list_of_expressions: list of \
+            :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: a 2-tuple consisting of the the converted PSyIR \
+            expressions, followed by a dictionary mapping the symbol names \
+            to SymPy Symbols.
+        :rtype: Tuple[List[:py:class:`sympy.core.basic.Basic`], \
+            Dict[str, :py:class:`sympy.core.symbol.Symbol`]]
+
+        :raises VisitorError: if an invalid SymPy expression is found.
+
+        '''
+        expression_str_list, type_map = \
+            SymPyWriter.get_sympy_strings_and_type_map(list_of_expressions)
+
         try:
             return ([parse_expr(expr, type_map)
                      for expr in expression_str_list],
@@ -215,27 +247,21 @@ class SymPyWriter(FortranWriter):
             get_sympy_expressions_and_symbol_map(list_of_expressions)
         return sympy_expressions
 
-    def member_node(self, node):
-        '''In SymPy an access to a member 'b' of a structure 'a'
-        (i.e. a%b in Fortran) is handled as the 'MOD' function
-        `MOD(a, b)`. We must therefore make sure that a member
-        access is unique (e.g. `b` could already be a scalar variable).
-        This is done by creating a new name, which replaces the `%`
-        with an `_`. So `a%b` becomes `MOD(a, a_b)`. This makes it easier
-        to see where the function names come from.
-        Additionally, we still need to avoid a name clash, e.g. there
-        could already be a variable `a_b`. This is done by using a symbol
-        table, which was prefilled with all references (`a` in the example
-        above) in the constructor. We use the string containing the '%' as
-        a unique tag and get a new, unique symbol from the symbol table
-        based on the new name using `_`. For example, the access to member
-        `b` in `a(i)%b` would result in a new symbol with tag `a%b` and a
-        name like `a_b`, `a_b_1`, ...
+    @staticmethod
+    def create_member_name(node, symbol_table, type_map):
+        '''Creates the unique name that is used in SymPy for an access
+        to a member 'b' of a structure 'a' (`a%b` in Fortran), and adds
+        it to the type map if required, see :py:meth:`member_node`.
 
         :param node: a Member PSyIR node.
         :type node: :py:class:`psyclone.psyir.nodes.Member`
+        :param symbol_table: the symbol table used to create unique \
+            names, which must contain all references in the expressions.
+        :type symbol_table: :py:class:`psyclone.psyir.symbols.SymbolTable`
+        :param type_map: the mapping of names to SymPy data types.
+        :type type_map: dict of str:Sympy-data-type values
 
-        :returns: the SymPy representation of this member access.
+        :returns: the unique name for this member.
         :rtype: str
 
         '''
@@ -254,14 +280,42 @@ class SymPyWriter(FortranWriter):
         # variable otherwise).
         root_name = "_".join(name_list)
         sig_name = "%".join(name_list)
-        new_sym = self._symbol_table.find_or_create_tag(tag=sig_name,
-                                                        root_name=root_name)
+        new_sym = symbol_table.find_or_create_tag(tag=sig_name,
+                                                  root_name=root_name)
         new_name = new_sym.name
-        if new_name not in self._sympy_type_map:
+        if new_name not in type_map:
             if node.is_array:
-                self._sympy_type_map[new_name] = Function(new_name)
+                type_map[new_name] = Function(new_name)
             else:
-                self._sympy_type_map[new_name] = Symbol(new_name)
+                type_map[new_name] = Symbol(new_name)
+        return new_name
+
+    def member_node(self, node):
+        '''In SymPy an access to a member 'b' of a structure 'a'
+        (i.e. a%b in Fortran) is handled as the 'MOD' function
+        `MOD(a, b)`. We must therefore make sure that a member
+        access is unique (e.g. `b` could already be a scalar variable).
+        This is done by creating a new name, which replaces the `%`
+        with an `_`. So `a%b` becomes `MOD(a, a_b)`. This makes it easier
+        to see where the function names come from.
+        Additionally, we still need to avoid a name clash, e.g. there
+        could already be a variable `a_b`. This is done by using a symbol
+        table, which was prefilled with all references (`a` in the example
+        above) in the constructor. We use the string containing the '%' as
+        a unique tag and get a new, unique symbol from the symbol table
+        based on the new name using `_`. For example, the access to member
+        `b` in `a(i)%b` would result in a new symbol with tag `a%b` and a
+        name like `a_b`, `a_b_1`, ...
+
+        :param node: a Member PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Member`
+
+        :returns: the SymPy representation of this member access.
+        :rtype: str
+
+        '''
+        new_name = self.create_member_name(node, self._symbol_table,
+                                           self._sympy_type_map)
 
         # Now get the original string that this node produces:
         original_name = super().member_node(node)
@@ -60,6 +60,30 @@ class VisitorError(PSycloneError):
         self.value = "Visitor Error: "+str(value)
 
 
+# Whether or not instances of each Node class (may) need to be lowered to
+# language level before being visited, indexed by class.
+_LOWERING_CLASSES = {}
+
+
+def _needs_lowering(node_class):
+    '''
+    :param type node_class: a subclass of PSyIR Node.
+
+    :returns: whether instances of the supplied class provide their own \
+        implementation of lower_to_language_level (rather than just \
+        lowering their children).
+    :rtype: bool
+
+    '''
+    try:
+        return _LOWERING_CLASSES[node_class]
+    except KeyError:
+        result = (node_class.lower_to_language_level is not
+                  Node.lower_to_language_level)
+        _LOWERING_CLASSES[node_class] = result
+        return result
+
+
 class PSyIRVisitor(object):
     '''A generic PSyIR visitor. This is designed to be specialised by
     a particular back end. By default, global constraints are enforced by
@@ -80,6 +104,19 @@ class PSyIRVisitor(object):
 
     '''
     _COMMENT_PREFIX = None
+    # Whether this visitor leaves the tree that it visits unchanged and
+    # returns a result that does not refer to it (e.g. a text back end). If
+    # so, nodes that do not need to be lowered are visited without first
+    # copying the tree.
+    _VISITS_IN_PLACE = False
+    # The types of node that this visitor modifies when visiting them
+    # (even though _VISITS_IN_PLACE is True). These are visited in a copy.
+    _MODIFIED_NODE_TYPES = ()
+    # The candidate method names for each class of node and the index of
+    # the first of them that is a method of the visitor class, indexed by
+    # the visitor class and then by the node class. Populated as the nodes
+    # are visited (apart from classes of node that have no method).
+    _dispatch_tables = {}
 
     def __init__(self, skip_nodes=False, indent_string="  ",
                  initial_indent_depth=0, check_global_constraints=True):
@@ -142,11 +179,19 @@ class PSyIRVisitor(object):
 
     def __call__(self, node):
         '''This method is called when an instance of the class is called
-        directly (like a function). It creates a copy of the whole tree of
-        the provided node (in order to return without any side-effects to
-        the original tree), then lower the DSL concepts into language level
-        nodes, and finally recurse down the node using the visitors defined
-        in this Visitor class.
+        directly (like a function). The visitor must not alter the provided
+        node and so, unless this visitor is known to leave the tree
+        unchanged (see `_VISITS_IN_PLACE`), it creates a copy of the whole
+        tree of the provided node, then lowers the DSL concepts into
+        language level nodes, and finally recurses down the node using the
+        visitors defined in this Visitor class.
+
+        If the visitor does leave the tree unchanged, the copy is only made
+        when it is required: a sub-tree that contains no DSL concepts is
+        visited directly and a sub-tree that contains nodes which the
+        visitor modifies (see `_MODIFIED_NODE_TYPES`) is copied on its own,
+        keeping the connection to its (unchanged) ancestors so that the
+        symbols of the outer scopes remain available.
 
         :param node: A PSyIR node.
         :type node: :py:class:`psyclone.psyir.nodes.Node`
@@ -154,6 +199,35 @@ class PSyIRVisitor(object):
         :returns: text representation of the PSyIR tree.
         :rtype: str
 
+        '''
+        return self._visit(self._prepare(node))
+
+    def iter_code(self, node):
+        '''Generates the same text as calling this visitor with the
+        provided node (see `__call__`), but yields it in pieces rather than
+        returning it as a single string, so that the caller can write each
+        piece out as soon as it has been generated (see `_iter_visit`).
+
+        :param node: A PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the pieces of the text representation of the PSyIR tree.
+        :rtype: Iterator[str]
+
+        '''
+        yield from self._iter_visit(self._prepare(node))
+
+    def _prepare(self, node):
+        '''Provides the node to visit in place of the provided node,
+        i.e. the node itself or its equivalent in a (lowered) copy of the
+        tree, as described in `__call__`.
+
+        :param node: A PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the node to visit.
+        :rtype: :py:class:`psyclone.psyir.nodes.Node`
+
         :raises TypeError: if the provided argument is not a PSyIR Node.
 
         '''
@@ -162,6 +236,24 @@ class PSyIRVisitor(object):
                 f"The PSyIR visitor functor method only accepts a PSyIR Node "
                 f"as argument, but found '{type(node).__name__}'.")
 
+        if self._VISITS_IN_PLACE:
+            modified = False
+            for descendant in node.iter_walk(Node):
+                if _needs_lowering(type(descendant)):
+                    break
+                if isinstance(descendant, self._MODIFIED_NODE_TYPES):
+                    modified = True
+            else:
+                if not modified:
+                    return node
+                # Copy just this sub-tree and give the copy the same parent
+                # (without adding it to the children of that parent).
+                node_copy = node.copy()
+                # pylint: disable=protected-access
+                node_copy._parent = node.parent
+                node_copy._has_constructor_parent = node.parent is not None
+                return node_copy
+
         # The visitor must not alter the provided node but if there are any
         # DSL concepts then these will need to be lowered in-place and this
         # operation often modifies the tree. Therefore, we first create a
@@ -185,9 +277,7 @@ class PSyIRVisitor(object):
 
         # Find again the equivalent node in the lowered tree in case that it
         # has been replaced
-        lowered_node = tree_copy.walk(Node)[node.abs_position]
-
-        return self._visit(lowered_node)
+        return tree_copy.walk(Node)[node.abs_position]
 
     def _visit(self, node):
         '''Implements the PSyIR callbacks. Callbacks are implemented by using
@@ -197,7 +287,10 @@ class PSyIRVisitor(object):
         until there are no more parent classes. Names are not
         modified, other than making them lower case, apart from the
         `Return` class which is changed to `return_node` because
-        `return` is a Python keyword.
+        `return` is a Python keyword. The method to use is only looked up
+        (in the visitor class) the first time that a class of node is
+        visited by a class of visitor, after which it is cached (see
+        `_method_name`).
 
         :param node: A PSyIR node.
         :type node: :py:class:`psyclone.psyir.nodes.Node`
@@ -207,8 +300,6 @@ class PSyIRVisitor(object):
 
         :raises VisitorError: if a node is found that does not have \
             associated call back methods (and skip_nodes is not set).
-        :raises AttributeError: if a call back method is found but it \
-            raises an AttributeError.
 
         '''
         # pylint: disable=too-many-branches
@@ -221,59 +312,39 @@ class PSyIRVisitor(object):
         if self._validate_nodes:
             node.validate_global_constraints()
 
-        # Make a list of the node's ancestor classes (including
-        # itself) in method resolution order (mro), apart from the
-        # base "object" class.
-        possible_method_names = [curr_class.__name__.lower()+"_node"
-                                 for curr_class in inspect.getmro(type(node))]
-        possible_method_names.remove("object_node")
-
-        # Try to call methods using the class names in the order of
-        # the class hierarchy (starting from the current class name).
-        for method_name in possible_method_names:
-            try:
-                # pylint: disable=eval-used
-                node_result = eval(f"self.{method_name}(node)")
-
-                # We can only proceed to add comments if the Visitor
-                # returned a string, otherwise we just return
-                if not isinstance(node_result, str):
-                    return node_result
-
-                result = ""
-
-                # Add preceding comment if available
-                if isinstance(node, CommentableMixin):
-                    if node.preceding_comment and self._COMMENT_PREFIX:
-                        result += (self._nindent + self._COMMENT_PREFIX +
-                                   node.preceding_comment + "\n")
-
-                result += node_result
-
-                # Add inline comment if available
-                if isinstance(node, CommentableMixin):
-                    if node.inline_comment and self._COMMENT_PREFIX:
-                        if result[-1] != "\n":
-                            raise VisitorError(
-                                f"An inline_comment can only be added to a "
-                                f"construct that finishes with a '\\n', "
-                                f"indicating that the line has ended, but"
-                                f" node '{node}' results in '{result}'.")
-                        # Add the comment before the last line break
-                        result = (result[:-1] + "  " + self._COMMENT_PREFIX +
-                                  node.inline_comment + "\n")
-
-                return result
-
-            except AttributeError as excinfo:
-                if f"attribute '{method_name}'" in str(excinfo):
-                    # This attribute error is because the method that
-                    # was tried does not exist.
-                    pass
-                else:
-                    # The method does exist but it has raised an
-                    # attribute error so re-raise it here.
-                    raise AttributeError(excinfo) from excinfo
+        method_name = self._method_name(type(node))
+        if method_name:
+            node_result = getattr(self, method_name)(node)
+
+            # We can only proceed to add comments if the Visitor
+            # returned a string, otherwise we just return
+            if not isinstance(node_result, str):
+                return node_result
+
+            result = ""
+
+            # Add preceding comment if available
+            if isinstance(node, CommentableMixin):
+                if node.preceding_comment and self._COMMENT_PREFIX:
+                    result += (self._nindent + self._COMMENT_PREFIX +
+                               node.preceding_comment + "\n")
+
+            result += node_result
+
+            # Add inline comment if available
+            if isinstance(node, CommentableMixin):
+                if node.inline_comment and self._COMMENT_PREFIX:
+                    if result[-1] != "\n":
+                        raise VisitorError(
+                            f"An inline_comment can only be added to a "
+                            f"construct that finishes with a '\\n', "
+                            f"indicating that the line has ended, but"
+                            f" node '{node}' results in '{result}'.")
+                    # Add the comment before the last line break
+                    result = (result[:-1] + "  " + self._COMMENT_PREFIX +
+                              node.inline_comment + "\n")
+
+            return result
 
         if self._skip_nodes:
             # We haven't found a handler for this node but '_skip_nodes' is
@@ -285,7 +356,92 @@ class PSyIRVisitor(object):
 
         raise VisitorError(
             f"Unsupported node '{type(node).__name__}' found: method names "
-            f"attempted were {possible_method_names}.")
+            f"attempted were {self._method_names(type(node))}.")
+
+    def _iter_visit(self, node):
+        '''Yields the text representation of the PSyIR node sub-tree in
+        pieces that, joined together, are the same as the result of
+        `_visit`. This implementation yields the result of `_visit` as a
+        single piece and is overridden by visitors that can generate the
+        text of a node piece by piece.
+
+        :param node: A PSyIR node.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the pieces of the text representation of the node.
+        :rtype: Iterator[str]
+
+        '''
+        yield self._visit(node)
+
+    def _method_name(self, node_class):
+        '''
+        The first method of the visitor class that handles the supplied
+        class of node is only looked up once for each combination of
+        visitor class and node class and is then cached. A class of node
+        that has no handler is not cached so that a handler that is added
+        later is found. A handler that is set on this visitor instance
+        takes precedence, as it would if each name were looked up on the
+        instance.
+
+        :param type node_class: a subclass of PSyIR Node.
+
+        :returns: the name of the method of this visitor that handles the \
+            supplied class of node or None if there is none.
+        :rtype: Optional[str]
+
+        '''
+        table = PSyIRVisitor._dispatch_tables.setdefault(type(self), {})
+        try:
+            names, index = table[node_class]
+        except KeyError:
+            names = self._method_names(node_class)
+            index = self._find_method_index(names)
+            if index is None:
+                for name in names:
+                    if hasattr(self, name):
+                        return name
+                return None
+            table[node_class] = (names, index)
+        if index:
+            instance_attributes = self.__dict__
+            for name in names[:index]:
+                if name in instance_attributes:
+                    return name
+        return names[index]
+
+    @staticmethod
+    def _method_names(node_class):
+        '''
+        :param type node_class: a subclass of PSyIR Node.
+
+        :returns: the names of the methods that may handle the supplied \
+            class of node, i.e. the lower-case names of the class and its \
+            ancestor classes (apart from "object") in method resolution \
+            order with a "_node" suffix.
+        :rtype: List[str]
+
+        '''
+        return [curr_class.__name__.lower()+"_node"
+                for curr_class in inspect.getmro(node_class)
+                if curr_class is not object]
+
+    @classmethod
+    def _find_method_index(cls, method_names):
+        '''
+        :param method_names: the names of the methods that may handle a \
+            class of node, as returned by `_method_names`.
+        :type method_names: List[str]
+
+        :returns: the index of the first of the names that is a method of \
+            this visitor class or None if there is none.
+        :rtype: Optional[int]
+
+        '''
+        for index, method_name in enumerate(method_names):
+            if hasattr(cls, method_name):
+                return index
+        return None
 
 
 # For AutoAPI documentation generation
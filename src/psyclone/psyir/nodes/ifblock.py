@@ -66,6 +66,7 @@ class IfBlock(Statement):
     _children_valid_format = "DataNode, Schedule [, Schedule]"
     _text_name = "If"
     _colour = "red"
+    _cache_accesses = True
 
     def __init__(self, parent=None, annotations=None):
         super(IfBlock, self).__init__(parent=parent)
@@ -214,11 +215,12 @@ class IfBlock(Statement):
         '''
 
         # The first child is the if condition - all variables are read-only
+        # pylint: disable=protected-access
         self.condition.reference_accesses(var_accesses)
         var_accesses.next_location()
-        self.if_body.reference_accesses(var_accesses)
+        self.if_body._add_cached_accesses(var_accesses)
         var_accesses.next_location()
 
         if self.else_body:
-            self.else_body.reference_accesses(var_accesses)
+            self.else_body._add_cached_accesses(var_accesses)
             var_accesses.next_location()
@@ -132,6 +132,14 @@ class Literal(DataNode):
         is_eq = is_eq and self.value == other.value
         return is_eq
 
+    def _structural_hash_data(self):
+        '''
+        :returns: the value of this Literal.
+        :rtype: str
+
+        '''
+        return self._value
+
     @property
     def datatype(self):
         '''
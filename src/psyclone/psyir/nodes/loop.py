@@ -84,6 +84,7 @@ class Loop(Statement):
     _children_valid_format = "DataNode, DataNode, DataNode, Schedule"
     _text_name = "Loop"
     _colour = "red"
+    _cache_accesses = True
 
     def __init__(self, parent=None, variable=None, valid_loop_types=None,
                  annotations=None):
@@ -323,7 +324,7 @@ class Loop(Statement):
         :rtype: string
 
         '''
-        _, position = self._find_position(self.ancestor(Routine))
+        position = self.abs_position - self.ancestor(Routine).abs_position
 
         if self.loop_type:
             name = f"loop_[{self.loop_type}]_{position}"
@@ -443,6 +444,8 @@ class Loop(Statement):
         '''
         self._check_variable(var)
         self._variable = var
+        # The loop variable is part of the variable accesses of the loop.
+        self._invalidate_caches()
 
     def __str__(self):
         # Give Loop sub-classes a specialised name
@@ -485,7 +488,8 @@ class Loop(Statement):
         var_accesses.next_location()
 
         for child in self.loop_body.children:
-            child.reference_accesses(var_accesses)
+            # pylint: disable=protected-access
+            child._add_cached_accesses(var_accesses)
             var_accesses.next_location()
 
     def has_inc_arg(self):
@@ -98,6 +98,14 @@ class Member(Node):
         is_eq = is_eq and self.name == other.name
         return is_eq
 
+    def _structural_hash_data(self):
+        '''
+        :returns: the name of this member.
+        :rtype: str
+
+        '''
+        return self._component_name
+
     @property
     def name(self):
         '''
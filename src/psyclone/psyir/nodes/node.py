@@ -89,6 +89,30 @@ def _graphviz_digraph_class():
         return None
 
 
+def _restore_children_list(node, validation_function, validation_text,
+                           children):
+    '''
+    Recreates a pickled ChildrenList. The children are already valid and
+    connected to their parent so they are not validated again.
+
+    :param node: reference to the node where the list belongs.
+    :type node: :py:class:`psyclone.psyir.nodes.Node`
+    :param validation_function: callback function to the validation method.
+    :type validation_function: \
+            function(int, :py:class:`psyclone.psyir.nodes.Node`)
+    :param str validation_text: textual representation of the valid children.
+    :param children: the children nodes.
+    :type children: List[:py:class:`psyclone.psyir.nodes.Node`]
+
+    :returns: the recreated list of children.
+    :rtype: :py:class:`psyclone.psyir.nodes.node.ChildrenList`
+
+    '''
+    children_list = ChildrenList(node, validation_function, validation_text)
+    list.extend(children_list, children)
+    return children_list
+
+
 class ChildrenList(list):
     '''
     Customized list to keep track of the children nodes. It is initialised with
@@ -111,6 +135,20 @@ class ChildrenList(list):
         self._validation_function = validation_function
         self._validation_text = validation_text
 
+    def __reduce__(self):
+        '''
+        Supports the pickling of a PSyIR tree. The default mechanism for a
+        list subclass would re-insert the children (and so validate them)
+        before the attributes of this list had been restored.
+
+        :returns: the function to recreate this list and its arguments.
+        :rtype: Tuple[Callable, Tuple]
+
+        '''
+        return (_restore_children_list,
+                (self._node_reference, self._validation_function,
+                 self._validation_text, list(self)))
+
     def _validate_item(self, index, item):
         '''
         Validates the provided index and item before continuing inserting the
@@ -179,6 +217,8 @@ class ChildrenList(list):
         # pylint: disable=protected-access
         node._parent = self._node_reference
         node._has_constructor_parent = False
+        # The node is no longer the root of a tree.
+        node._position_cache = None
 
     @staticmethod
     def _del_parent_link(node):
@@ -194,6 +234,28 @@ class ChildrenList(list):
         # pylint: disable=protected-access
         node._parent = None
         node._has_constructor_parent = False
+        node._position_cache = None
+
+    def _invalidate_caches(self):
+        '''
+        Discards the cached pre-order numbering of the tree to which this
+        list belongs and the data cached for the tree below the node to which
+        it belongs and below each of its ancestors (their structural hashes
+        and variable accesses), as they are no longer valid once the list is
+        modified.
+
+        '''
+        # pylint: disable=protected-access
+        node = self._node_reference
+        node._structural_hash = None
+        node._cached_accesses = None
+        # The parent connection may not exist yet if the children are being
+        # added while the node is being constructed.
+        while getattr(node, "_parent", None) is not None:
+            node = node._parent
+            node._structural_hash = None
+            node._cached_accesses = None
+        node._position_cache = None
 
     def append(self, item):
         ''' Extends list append method with children node validation.
@@ -206,6 +268,7 @@ class ChildrenList(list):
         self._check_is_orphan(item)
         super(ChildrenList, self).append(item)
         self._set_parent_link(item)
+        self._invalidate_caches()
 
     def __setitem__(self, index, item):
         ''' Extends list __setitem__ method with children node validation.
@@ -220,6 +283,7 @@ class ChildrenList(list):
         self._del_parent_link(self[index])
         super(ChildrenList, self).__setitem__(index, item)
         self._set_parent_link(item)
+        self._invalidate_caches()
 
     def insert(self, index, item):
         ''' Extends list insert method with children node validation.
@@ -237,6 +301,7 @@ class ChildrenList(list):
             self._validate_item(position + 1, self[position])
         super(ChildrenList, self).insert(index, item)
         self._set_parent_link(item)
+        self._invalidate_caches()
 
     def extend(self, items):
         ''' Extends list extend method with children node validation.
@@ -251,6 +316,66 @@ class ChildrenList(list):
         super(ChildrenList, self).extend(items)
         for item in items:
             self._set_parent_link(item)
+        self._invalidate_caches()
+
+    def replace_range(self, start, stop, items):
+        ''' Replaces the items from position `start` up to (but not
+        including) position `stop` with the given items, like the slice
+        assignment `list[start:stop] = items`. All new and displaced items
+        are validated before the list is modified, and the list is only
+        modified once, so this is much faster than a sequence of single
+        item operations when many items are inserted or removed.
+
+        :param int start: position of the first item to replace.
+        :param int stop: position after the last item to replace.
+        :param items: items to be inserted in place of the replaced ones.
+        :type items: Iterable[:py:class:`psyclone.psyir.nodes.Node`]
+
+        :returns: the replaced items (now orphans).
+        :rtype: List[:py:class:`psyclone.psyir.nodes.Node`]
+
+        :raises GenerationError: if an item is added more than once.
+
+        '''
+        items = list(items)
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        added = set()
+        for offset, item in enumerate(items):
+            self._validate_item(start + offset, item)
+            self._check_is_orphan(item)
+            if id(item) in added:
+                raise GenerationError(
+                    f"Item '{item.coloured_name(False)}' can't be added more "
+                    f"than once as child of "
+                    f"'{self._node_reference.coloured_name(False)}'.")
+            added.add(id(item))
+        # Check that all displaced items will still be in valid positions
+        shift = len(items) - (stop - start)
+        if shift:
+            for position in range(stop, len(self)):
+                self._validate_item(position + shift, self[position])
+        removed = super(ChildrenList, self).__getitem__(slice(start, stop))
+        for item in removed:
+            self._del_parent_link(item)
+        super(ChildrenList, self).__setitem__(slice(start, stop), items)
+        for item in items:
+            self._set_parent_link(item)
+        if removed or items:
+            self._invalidate_caches()
+        return removed
+
+    def splice(self, index, items):
+        ''' Inserts all the given items at the given position, in the same
+        order, validating them and the displaced items only once (see
+        `replace_range`).
+
+        :param int index: position where to insert the items.
+        :param items: items to be inserted into the list.
+        :type items: Iterable[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        self.replace_range(index, index, items)
 
     # Methods below don't insert elements but have the potential to displace
     # or change the order of the items in-place.
@@ -265,6 +390,7 @@ class ChildrenList(list):
             self._validate_item(position - 1, self[position])
         self._del_parent_link(self[index])
         super(ChildrenList, self).__delitem__(index)
+        self._invalidate_caches()
 
     def remove(self, item):
         ''' Extends list remove method with children node validation.
@@ -277,6 +403,7 @@ class ChildrenList(list):
             self._validate_item(position - 1, self[position])
         self._del_parent_link(item)
         super(ChildrenList, self).remove(item)
+        self._invalidate_caches()
 
     def pop(self, index=-1):
         ''' Extends list pop method with children node validation.
@@ -293,13 +420,16 @@ class ChildrenList(list):
         for position in range(positiveindex + 1, len(self)):
             self._validate_item(position - 1, self[position])
         self._del_parent_link(self[index])
-        return super(ChildrenList, self).pop(index)
+        item = super(ChildrenList, self).pop(index)
+        self._invalidate_caches()
+        return item
 
     def reverse(self):
         ''' Extends list reverse method with children node validation. '''
         for index, item in enumerate(self):
             self._validate_item(len(self) - index - 1, item)
         super(ChildrenList, self).reverse()
+        self._invalidate_caches()
 
 
 class Node(object):
@@ -338,6 +468,25 @@ class Node(object):
     _children_valid_format = None
     _text_name = None
     _colour = None
+    # The pre-order numbering of the tree below this node, only ever held
+    # by the root of a tree (see _position_index). It is discarded whenever
+    # the tree is modified.
+    _position_cache = None
+    # The structural hash of this node (see structural_hash). It is
+    # discarded whenever the tree below this node is modified.
+    _structural_hash = None
+    # Whether this node caches the variable accesses of the tree below it
+    # (see _add_cached_accesses). This is only done for nodes that contain
+    # statements, as caching the accesses of every expression would use
+    # more memory than it saves time.
+    _cache_accesses = False
+    # Whether the variable accesses of this node only depend on the tree
+    # below it. If not (e.g. for a kernel, whose accesses are based on its
+    # metadata), neither this node nor its ancestors cache their accesses.
+    _accesses_depend_on_tree_only = True
+    # The cached variable accesses of the tree below this node. They are
+    # discarded whenever the tree below this node is modified.
+    _cached_accesses = None
 
     def __init__(self, ast=None, children=None, parent=None, annotations=None):
         self._children = ChildrenList(self, self._validate_child,
@@ -383,6 +532,12 @@ class Node(object):
         :rtype: bool
         '''
         super().__eq__(other)
+        # Nodes with different structural hashes cannot be equal, so
+        # compare them first if they are known.
+        other_hash = getattr(other, "_structural_hash", None)
+        if (other_hash is not None and self._structural_hash is not None
+                and other_hash != self._structural_hash):
+            return False
         is_eq = type(self) is type(other)
         is_eq = is_eq and (len(self.children) == len(other.children))
         for index, child in enumerate(self.children):
@@ -390,6 +545,79 @@ class Node(object):
 
         return is_eq
 
+    def __getstate__(self):
+        '''
+        Excludes the cached pre-order numbering of the tree and the cached
+        structural hash from the state of this node when it is copied or
+        pickled, since they depend on the identity of nodes and symbols.
+
+        :returns: the attributes of this node.
+        :rtype: dict
+
+        '''
+        state = self.__dict__.copy()
+        state.pop("_position_cache", None)
+        state.pop("_structural_hash", None)
+        state.pop("_cached_accesses", None)
+        return state
+
+    def structural_hash(self):
+        '''
+        Returns a hash of the tree below (and including) this node that is
+        consistent with the equality of nodes, i.e. nodes that are equal
+        (see `__eq__`) have the same structural hash. It combines the type
+        of each node, the properties that are compared by its `__eq__`
+        method (see `_structural_hash_data`) and the structural hashes of
+        its children.
+
+        Nodes do not implement `__hash__` (as their equality can change
+        when the tree is modified), so this has to be requested explicitly,
+        e.g. by :py:class:`psyclone.psyir.tools.StructuralKey`. The hash
+        is computed once and cached. The cached value is discarded when
+        the children of this node or of any of its descendants are modified
+        (via their ChildrenList), or when a Reference below it is changed
+        to refer to a different symbol (see `_invalidate_caches`).
+
+        :returns: the structural hash of this node.
+        :rtype: int
+
+        '''
+        if self._structural_hash is None:
+            self._structural_hash = hash(
+                (type(self), self._structural_hash_data()) +
+                tuple(child.structural_hash() for child in self._children))
+        return self._structural_hash
+
+    def _structural_hash_data(self):
+        '''
+        Subclasses that compare properties other than their type and their
+        children in `__eq__` should return (a hashable subset of) them
+        here, so that they are included in the structural hash. Using a
+        subset is still consistent with the equality, but results in more
+        nodes with the same hash.
+
+        :returns: the properties of this node that are used in its \
+            structural hash in addition to its type and its children.
+        :rtype: Hashable
+
+        '''
+        # pylint: disable=no-self-use
+        return None
+
+    def _invalidate_caches(self):
+        '''
+        Discards the data cached for the tree below this node and below each
+        of its ancestors, i.e. their structural hashes and variable accesses.
+        This must be called if a property that is used in the structural
+        hash, or that affects the variable accesses, is modified.
+
+        '''
+        node = self
+        while isinstance(node, Node):
+            node._structural_hash = None
+            node._cached_accesses = None
+            node = node._parent
+
     @staticmethod
     def _validate_child(position, child):
         '''
@@ -628,8 +856,9 @@ class Node(object):
         # Import here to avoid circular dependencies
         # pylint: disable=import-outside-toplevel
         from psyclone.psyir.nodes import Routine
-        if self.ancestor(Routine):
-            _, position = self._find_position(self.ancestor(Routine))
+        routine = self.ancestor(Routine)
+        if routine:
+            position = self.abs_position - routine.abs_position
         else:
             position = self.abs_position
         return self.coloured_name(False) + "_" + str(position)
@@ -658,6 +887,7 @@ class Node(object):
         i.e. the loop body inherits the dependencies of the routines
         within it.'''
         dependence = None
+        depth = self.depth
         # look through all the backward dependencies of my arguments
         for arg in self.args:
             dependent_arg = arg.backward_dependence()
@@ -667,7 +897,7 @@ class Node(object):
                 # if the remote node is deeper in the tree than me
                 # then find the ancestor that is at the same level of
                 # the tree as me.
-                while node.depth > self.depth:
+                for _ in range(node.depth - depth):
                     node = node.parent
                 if self.sameParent(node) and node is not self:
                     # The remote node (or one of its ancestors) shares
@@ -695,6 +925,7 @@ class Node(object):
         i.e. the loop body inherits the dependencies of the routines
         within it.'''
         dependence = None
+        depth = self.depth
         # look through all the forward dependencies of my arguments
         for arg in self.args:
             dependent_arg = arg.forward_dependence()
@@ -704,7 +935,7 @@ class Node(object):
                 # if the remote node is deeper in the tree than me
                 # then find the ancestor that is at the same level of
                 # the tree as me.
-                while node.depth > self.depth:
+                for _ in range(node.depth - depth):
                     node = node.parent
                 if self.sameParent(node) and node is not self:
                     # The remote node (or one of its ancestors) shares
@@ -955,12 +1186,50 @@ class Node(object):
         '''
         if self.root is self:
             return self.START_POSITION
-        found, position = self._find_position(self.root.children,
-                                              self.START_POSITION)
-        if not found:
+        position = self._position_index()[1].get(id(self))
+        if position is None:
             raise InternalError("Error in search for Node position "
                                 "in the tree")
-        return position
+        return self.START_POSITION + position
+
+    def _position_index(self):
+        '''
+        Provides the pre-order (depth-first) numbering of the tree to which
+        this node belongs. This is computed with a single traversal of the
+        tree and then cached by the root node until the tree is modified
+        (any change to a ChildrenList discards it), so that the absolute
+        positions of nodes and the nodes that precede or follow them can
+        be obtained cheaply.
+
+        :returns: the nodes of the tree in pre-order, a map from the id of \
+            each node to its index in that list and the index of the last \
+            descendant of each node.
+        :rtype: Tuple[List[:py:class:`psyclone.psyir.nodes.Node`], \
+            Dict[int, int], List[int]]
+
+        '''
+        root = self.root
+        # pylint: disable=protected-access
+        if root._position_cache is None:
+            nodes = [root]
+            index = {id(root): 0}
+            last = [0]
+            stack = [(0, iter(root._children))]
+            while stack:
+                position, children = stack[-1]
+                for child in children:
+                    child_position = len(nodes)
+                    index[id(child)] = child_position
+                    nodes.append(child)
+                    last.append(child_position)
+                    if child._children:
+                        stack.append((child_position, iter(child._children)))
+                        break
+                else:
+                    stack.pop()
+                    last[position] = len(nodes) - 1
+            root._position_cache = (nodes, index, last)
+        return root._position_cache
 
     def _find_position(self, children, position=None):
         '''
@@ -1042,17 +1311,63 @@ class Node(object):
         :rtype: List[:py:class:`psyclone.psyir.nodes.Node`]
 
         '''
-        local_list = []
-        if isinstance(self, my_type):
-            local_list.append(self)
+        return list(self.iter_walk(my_type, stop_type))
+
+    def iter_walk(self, my_type, stop_type=None):
+        ''' Generator version of :py:meth:`walk`: yields the same nodes, in
+        the same (depth-first) order, but one at a time and without creating
+        any intermediate lists. This is useful when a caller can stop as
+        soon as it finds what it is looking for. The tree must not be
+        modified while the iteration is in progress (use :py:meth:`walk`
+        for that).
 
+        :param my_type: the class(es) of the nodes to yield.
+        :type my_type: type | Tuple[type, ...]
+        :param stop_type: class(es) at which recursion is halted (optional).
+        :type stop_type: Optional[type | Tuple[type, ...]]
+
+        :returns: the nodes that are instances of my_type starting at and \
+                  including this node.
+        :rtype: Iterator[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        if isinstance(self, my_type):
+            yield self
         # Stop recursion further into the tree if an instance of a class
         # listed in stop_type is found.
         if stop_type and isinstance(self, stop_type):
-            return local_list
-        for child in self.children:
-            local_list += child.walk(my_type, stop_type)
-        return local_list
+            return
+        # A stack of iterators over the children of the nodes on the path
+        # from this node to the node currently being visited.
+        stack = [iter(self._children)]
+        while stack:
+            for node in stack[-1]:
+                if isinstance(node, my_type):
+                    yield node
+                if node._children and not (stop_type and
+                                           isinstance(node, stop_type)):
+                    # Descend into the children of this node before
+                    # continuing with its siblings.
+                    stack.append(iter(node._children))
+                    break
+            else:
+                stack.pop()
+
+    def first_of(self, my_type, stop_type=None):
+        ''' Returns the first node (in the order of :py:meth:`walk`) that is
+        an instance of 'my_type' without visiting the remainder of the tree.
+
+        :param my_type: the class(es) of the node to find.
+        :type my_type: type | Tuple[type, ...]
+        :param stop_type: class(es) at which recursion is halted (optional).
+        :type stop_type: Optional[type | Tuple[type, ...]]
+
+        :returns: the first node that is an instance of my_type starting at \
+                  and including this node or None if there is no such node.
+        :rtype: Optional[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        return next(self.iter_walk(my_type, stop_type), None)
 
     def ancestor(self, my_type, excluding=None, include_self=False,
                  limit=None):
@@ -1136,24 +1451,9 @@ class Node(object):
         :rtype: :func:`list` of :py:class:`psyclone.psyir.nodes.Node`
 
         '''
-        root = self.root
-        if routine:
-            # Import here to avoid circular dependencies
-            # pylint: disable=import-outside-toplevel
-            from psyclone.psyir.nodes import Routine
-            # If there is an ancestor Routine node then only return nodes
-            # that are within it.
-            routine_node = self.ancestor(Routine)
-            if routine_node:
-                root = routine_node
-        all_nodes = root.walk(Node)
-        position = None
-        for index, node in enumerate(all_nodes):
-            if node is self:
-                position = index
-                break
-
-        return all_nodes[position+1:]
+        root = self._scope_root(routine)
+        all_nodes, index, last = self._position_index()
+        return all_nodes[index[id(self)]+1:last[index[id(root)]]+1]
 
     def preceding(self, reverse=False, routine=True):
         '''Return all :py:class:`psyclone.psyir.nodes.Node` nodes before this
@@ -1175,26 +1475,109 @@ class Node(object):
         :rtype: :func:`list` of :py:class:`psyclone.psyir.nodes.Node`
 
         '''
-        root = self.root
+        root = self._scope_root(routine)
+        all_nodes, index, _ = self._position_index()
+        nodes = all_nodes[index[id(root)]:index[id(self)]]
+        if reverse:
+            nodes.reverse()
+        return nodes
+
+    def _scope_root(self, routine):
+        '''
+        :param bool routine: whether the scope is limited to the closest \
+            ancestor Routine of this node (if one exists).
+
+        :returns: the root of the tree that `following` and `preceding` \
+            (and their iterator versions) return nodes from.
+        :rtype: :py:class:`psyclone.psyir.nodes.Node`
+
+        '''
         if routine:
             # Import here to avoid circular dependencies
             # pylint: disable=import-outside-toplevel
             from psyclone.psyir.nodes import Routine
-            # If there is an ancestor Routine node then only return nodes
-            # that are within it.
             routine_node = self.ancestor(Routine)
             if routine_node:
-                root = routine_node
-        all_nodes = root.walk(Node)
-        position = None
-        for index, node in enumerate(all_nodes):
-            if node is self:
-                position = index
-                break
-        nodes = all_nodes[:position]
-        if reverse:
-            nodes.reverse()
-        return nodes
+                return routine_node
+        return self.root
+
+    def iter_following(self, routine=True):
+        '''Generator version of :py:meth:`following`: yields the same
+        nodes, in the same (depth first) order, by walking the tree forward
+        from this node. No list of all nodes is created, so a caller that
+        stops at the first match only visits the nodes up to that match.
+        The tree must not be modified while the iteration is in progress.
+
+        :param bool routine: an optional (default `True`) argument \
+            that only returns nodes that are within this node's \
+            closest ancestor Routine node if one exists.
+
+        :returns: the nodes after this node.
+        :rtype: Iterator[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        scope_root = self._scope_root(routine)
+        # First the descendants of this node, then the following siblings
+        # (and their descendants) of this node and of each of its ancestors
+        # up to the root of the scope.
+        for child in self._children:
+            yield from child.iter_walk(Node)
+        node = self
+        while node is not scope_root:
+            parent = node.parent
+            following_sibling = False
+            for sibling in parent.children:
+                if following_sibling:
+                    yield from sibling.iter_walk(Node)
+                elif sibling is node:
+                    following_sibling = True
+            node = parent
+
+    def iter_preceding(self, reverse=False, routine=True):
+        '''Generator version of :py:meth:`preceding`: yields the same nodes,
+        in the same order, without creating a list of all nodes. If
+        `reverse` is `True`, the tree is walked backward from this node,
+        so a caller that stops at the first match only visits the nodes
+        between this node and that match. The tree must not be modified
+        while the iteration is in progress.
+
+        :param bool reverse: an optional (default `False`) argument \
+            that reverses the order of any returned nodes (i.e. makes \
+            them 'closest first' if set to true.
+        :param bool routine: an optional (default `True`) argument \
+            that only returns nodes that are within this node's \
+            closest ancestor Routine node if one exists.
+
+        :returns: the nodes before this node.
+        :rtype: Iterator[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        scope_root = self._scope_root(routine)
+        if not reverse:
+            for node in scope_root.iter_walk(Node):
+                if node is self:
+                    return
+                yield node
+        node = self
+        while node is not scope_root:
+            parent = node.parent
+            preceding_sibling = False
+            for sibling in reversed(parent.children):
+                if preceding_sibling:
+                    # The descendants of the sibling in reverse pre-order,
+                    # i.e. the (reversed) children are visited before
+                    # their parent.
+                    stack = [(sibling, reversed(sibling.children))]
+                    while stack:
+                        for child in stack[-1][1]:
+                            stack.append((child, reversed(child.children)))
+                            break
+                        else:
+                            yield stack.pop()[0]
+                elif sibling is node:
+                    preceding_sibling = True
+            yield parent
+            node = parent
 
     def coded_kernels(self):
         '''
@@ -1288,7 +1671,40 @@ class Node(object):
             :py:class:`psyclone.core.access_info.VariablesAccessInfo`
         '''
         for child in self._children:
-            child.reference_accesses(var_accesses)
+            # pylint: disable=protected-access
+            child._add_cached_accesses(var_accesses)
+
+    def _add_cached_accesses(self, var_accesses):
+        '''Adds the variable accesses of this node to `var_accesses`, in the
+        same way as `reference_accesses`. A node that caches its accesses
+        (see `_cache_accesses`) collects them in a separate
+        VariablesAccessInfo the first time this is called and then appends
+        this copy to `var_accesses`. Since nodes pass their children to
+        this method as well, the accesses of a node are composed from the
+        cached accesses of its children. The cached accesses are discarded
+        whenever the tree below the node is modified (see
+        `_invalidate_caches`).
+
+        :param var_accesses: Stores the output results.
+        :type var_accesses: \
+            :py:class:`psyclone.core.access_info.VariablesAccessInfo`
+        '''
+        # pylint: disable=protected-access
+        if not self._accesses_depend_on_tree_only:
+            var_accesses._cacheable = False
+        if not self._cache_accesses:
+            self.reference_accesses(var_accesses)
+            return
+        accesses = self._cached_accesses
+        if accesses is None:
+            # Avoid circular import
+            # pylint: disable=import-outside-toplevel
+            from psyclone.core import VariablesAccessInfo
+            accesses = VariablesAccessInfo()
+            self.reference_accesses(accesses)
+            if accesses._cacheable:
+                self._cached_accesses = accesses
+        var_accesses._append(accesses)
 
     @property
     def scope(self):
@@ -1350,10 +1766,7 @@ class Node(object):
         :rtype: list of :py:class:`psyclone.psyir.node.Node`
 
         '''
-        free_children = []
-        while self.children:
-            free_children.insert(0, self.children.pop())
-        return free_children
+        return self.children.replace_range(0, len(self.children), [])
 
     def detach(self):
         ''' Detach this node from the tree it belongs to. This is necessary
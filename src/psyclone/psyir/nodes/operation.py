@@ -207,6 +207,16 @@ class Operation(DataNode):
 
         return is_eq
 
+    def _structural_hash_data(self):
+        '''
+        :returns: the operator and the names of the arguments of this \
+            operation.
+        :rtype: Tuple[:py:class:`psyclone.psyir.nodes.Operation.Operator`, \
+            Tuple[Optional[str], ...]]
+
+        '''
+        return (self._operator, tuple(self.argument_names))
+
     @property
     def operator(self):
         '''
@@ -325,7 +335,7 @@ class UnaryOperation(Operation):
         'ABS', 'CEIL',
         # Casting Operators
         'REAL', 'INT', 'NINT'
-        ])
+        ], qualname="UnaryOperation.Operator")
 
     _non_elemental_ops = [Operator.SUM]
 
@@ -409,7 +419,7 @@ class BinaryOperation(Operation):
         'SIZE', 'LBOUND', 'UBOUND',
         # Matrix and Vector Operators
         'MATMUL', 'DOT_PRODUCT'
-        ])
+        ], qualname="BinaryOperation.Operator")
     _non_elemental_ops = [Operator.SUM, Operator.MATMUL, Operator.SIZE,
                           Operator.LBOUND, Operator.UBOUND,
                           Operator.DOT_PRODUCT]
@@ -574,7 +584,7 @@ class NaryOperation(Operation):
     Operator = Enum('Operator', [
         # Arithmetic Operators
         'MAX', 'MIN', 'SUM'
-        ])
+        ], qualname="NaryOperation.Operator")
     _non_elemental_ops = [Operator.SUM]
 
     @staticmethod
@@ -743,8 +743,8 @@ class PSyDataNode(Statement):
 
         # Insert the body of the profiled region between the start and
         # end calls
-        for child in self.psy_data_body.pop_all_children():
-            self.parent.children.insert(self.position, child)
+        self.parent.children.splice(self.position,
+                                    self.psy_data_body.pop_all_children())
 
         if has_var:
             # Only add PostStart() if there is at least one variable.
@@ -80,6 +80,15 @@ class Reference(DataNode):
         is_eq = is_eq and (self.symbol == other.symbol)
         return is_eq
 
+    def _structural_hash_data(self):
+        '''
+        :returns: the symbol referenced by this node (which is compared \
+            by identity).
+        :rtype: :py:class:`psyclone.psyir.symbols.Symbol`
+
+        '''
+        return self._symbol
+
     @property
     def is_array(self):
         ''':returns: if this reference is an array.
@@ -113,6 +122,7 @@ class Reference(DataNode):
                 f"The Reference symbol setter expects a PSyIR Symbol object "
                 f"but found '{type(symbol).__name__}'.")
         self._symbol = symbol
+        self._invalidate_caches()
 
     @property
     def name(self):
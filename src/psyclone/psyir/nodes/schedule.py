@@ -51,6 +51,7 @@ class Schedule(ScopingNode):
     _children_valid_format = "[Statement]*"
     _text_name = "Schedule"
     _colour = "white"
+    _cache_accesses = True
 
     @staticmethod
     def _validate_child(position, child):
@@ -96,12 +96,15 @@ class ScopingNode(Node):
 
         '''
         super(ScopingNode, self)._refine_copy(other)
-        self._symbol_table = other.symbol_table.deep_copy()
+        # The copy of each symbol, indexed by the original symbol.
+        symbol_map = {}
+        self._symbol_table = other.symbol_table.deep_copy(symbol_map)
         # pylint: disable=protected-access
         self._symbol_table._node = self  # Associate to self
 
         # Update of children references to point to the equivalent symbols in
-        # the new symbol table attached to self.
+        # the new symbol table attached to self (using the map rather than
+        # searching the list of symbols for each reference).
         # TODO #1377 Unfortunately Loop nodes currently store the associated
         # loop variable in a `_variable` property rather than as a child so we
         # must handle those separately. Also, in the LFRic API a Loop does not
@@ -114,12 +117,11 @@ class ScopingNode(Node):
         from psyclone.psyir.nodes.loop import Loop
         for node in self.walk((Reference, Loop)):
             if isinstance(node, Reference):
-                if node.symbol in other.symbol_table.symbols:
-                    node.symbol = self.symbol_table.lookup(node.symbol.name)
+                if node.symbol in symbol_map:
+                    node.symbol = symbol_map[node.symbol]
             if isinstance(node, Loop) and node._variable:
-                if node.variable in other.symbol_table.symbols:
-                    node.variable = self.symbol_table.lookup(
-                        node.variable.name)
+                if node.variable in symbol_map:
+                    node.variable = symbol_map[node.variable]
 
     @property
     def symbol_table(self):
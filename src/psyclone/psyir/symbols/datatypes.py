@@ -272,6 +272,8 @@ class ArrayType(DataType):
 
     #: namedtuple used to store lower and upper limits of an array dimension
     ArrayBounds = namedtuple("ArrayBounds", ["lower", "upper"])
+    # Give the nested class its full name so that it can be pickled.
+    ArrayBounds.__qualname__ = "ArrayType.ArrayBounds"
 
     def __init__(self, datatype, shape):
 
@@ -511,6 +513,8 @@ class StructureType(DataType):
     # (named tuple).
     ComponentType = namedtuple("ComponentType", ["name", "datatype",
                                                  "visibility"])
+    # Give the nested class its full name so that it can be pickled.
+    ComponentType.__qualname__ = "StructureType.ComponentType"
 
     def __init__(self):
         self._components = OrderedDict()
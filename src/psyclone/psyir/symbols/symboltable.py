@@ -52,6 +52,59 @@ from psyclone.psyir.symbols.typed_symbol import TypedSymbol
 from psyclone.errors import InternalError
 
 
+class _SymbolDict(OrderedDict):
+    '''The ordered dictionary of the symbols in a SymbolTable, indexed by
+    their normalised names. For each root name that has been passed to
+    SymbolTable.next_available_name() it also records how many of the
+    candidate names (the root name followed by the root name with the
+    suffixes "_1", "_2", ...) are known to be in the dictionary. Since
+    adding an entry can only lengthen this sequence, the record is only
+    discarded when an entry is removed.
+
+    '''
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The number of consecutive candidate names in this dictionary,
+        # indexed by the normalised root name.
+        self.name_counts = {}
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.name_counts.clear()
+
+    def pop(self, *args):
+        # pylint: disable=arguments-differ
+        self.name_counts.clear()
+        return super().pop(*args)
+
+    def popitem(self, last=True):
+        self.name_counts.clear()
+        return super().popitem(last)
+
+    def clear(self):
+        self.name_counts.clear()
+        super().clear()
+
+    def __copy__(self):
+        # The new dictionary must not share the counts of this one.
+        return _SymbolDict(self)
+
+    def count_names(self, root_name):
+        '''
+        :param str root_name: a normalised root name.
+
+        :returns: the number of consecutive candidate names, starting with \
+            the root name itself, that are in this dictionary.
+        :rtype: int
+
+        '''
+        idx = self.name_counts.get(root_name, 0)
+        while (f"{root_name}_{idx}" if idx else root_name) in self:
+            idx += 1
+        self.name_counts[root_name] = idx
+        return idx
+
+
 class SymbolTable():
     # pylint: disable=too-many-public-methods
     '''Encapsulates the symbol table and provides methods to add new
@@ -78,7 +131,7 @@ class SymbolTable():
         # Dict of Symbol objects with the symbol names as keys. Make
         # this ordered so that different versions of Python always
         # produce code with declarations in the same order.
-        self._symbols = OrderedDict()
+        self._symbols = _SymbolDict()
         # Ordered list of the arguments.
         self._argument_list = []
         # Dict of tags. Some symbols can be identified with a tag.
@@ -174,6 +227,34 @@ class SymbolTable():
                     return search_next.symbol_table
         return None
 
+    def _scope_tables(self, scope_limit=None):
+        '''Generates this symbol table followed by the symbol tables of the
+        enclosing scopes, innermost first. This allows the tables to be
+        searched in turn without merging their contents.
+
+        :param scope_limit: optional Node which limits the search space \
+            to the symbol tables of the nodes within the given scope.
+        :type scope_limit: :py:class:`psyclone.psyir.nodes.Node` or \
+            `NoneType`
+
+        :returns: the symbol tables in scope.
+        :rtype: Iterator[:py:class:`psyclone.psyir.symbols.SymbolTable`]
+
+        :raises TypeError: if the supplied scope_limit is not a Node.
+
+        '''
+        if scope_limit is not None:
+            # pylint: disable=import-outside-toplevel
+            from psyclone.psyir.nodes import Node
+            if not isinstance(scope_limit, Node):
+                raise TypeError(
+                    f"The scope_limit argument '{scope_limit}', is not of "
+                    f"type `Node`.")
+        current = self
+        while current:
+            yield current
+            current = current.parent_symbol_table(scope_limit)
+
     def get_symbols(self, scope_limit=None):
         '''Return symbols from this symbol table and all symbol tables
         associated with ancestors of the node that this symbol table
@@ -195,12 +276,10 @@ class SymbolTable():
 
         '''
         all_symbols = OrderedDict()
-        current = self
-        while current:
-            for symbol_name, symbol in current.symbols_dict.items():
+        for table in self._scope_tables(scope_limit):
+            for symbol_name, symbol in table.symbols_dict.items():
                 if symbol_name not in all_symbols:
                     all_symbols[symbol_name] = symbol
-            current = current.parent_symbol_table(scope_limit)
         return all_symbols
 
     def get_tags(self, scope_limit=None):
@@ -223,12 +302,10 @@ class SymbolTable():
 
         '''
         all_tags = OrderedDict()
-        current = self
-        while current:
-            for tag, symbol in current.tags_dict.items():
+        for table in self._scope_tables(scope_limit):
+            for tag, symbol in table.tags_dict.items():
                 if tag not in all_tags:
                     all_tags[tag] = symbol
-            current = current.parent_symbol_table(scope_limit)
         return all_tags
 
     def shallow_copy(self):
@@ -250,7 +327,7 @@ class SymbolTable():
         new_st._default_visibility = self.default_visibility
         return new_st
 
-    def deep_copy(self):
+    def deep_copy(self, symbol_map=None):
         '''Create a copy of the symbol table with new instances of the
         top-level data structures and also new instances of the symbols
         contained in these data structures. Modifying a symbol attribute
@@ -260,16 +337,28 @@ class SymbolTable():
         The only attribute not copied is the _node reference to the scope,
         since that scope can only have one symbol table associated to it.
 
+        :param symbol_map: optional dictionary which, if supplied, is \
+            updated with the new instance of each symbol, indexed by the \
+            original symbol. This allows references to the original \
+            symbols to be updated without searching this symbol table.
+        :type symbol_map: Optional[ \
+            Dict[:py:class:`psyclone.psyir.symbols.Symbol`, \
+                 :py:class:`psyclone.psyir.symbols.Symbol`]]
+
         :returns: a deep copy of this symbol table.
         :rtype: :py:class:`psyclone.psyir.symbols.SymbolTable`
 
         '''
         # pylint: disable=protected-access
         new_st = type(self)()
+        if symbol_map is None:
+            symbol_map = {}
 
         # Make a copy of each symbol in the symbol table
         for symbol in self.symbols:
-            new_st.add(symbol.copy())
+            new_symbol = symbol.copy()
+            new_st.add(new_symbol)
+            symbol_map[symbol] = new_symbol
 
         # Prepare the new argument list
         new_arguments = []
@@ -463,21 +552,17 @@ class SymbolTable():
                 f"SymbolTable but found '{type(other_table).__name__}'.")
 
         if shadowing:
-            symbols = self._symbols
+            tables = [self]
         else:
-            # If symbol shadowing is not permitted, the list of symbols names
-            # that can't be used includes all the symbols from all the ancestor
+            # If symbol shadowing is not permitted, the names that can't be
+            # used include those of all the symbols in all the ancestor
             # symbol tables.
-            symbols = self.get_symbols()
-
-        # Construct the set of existing names.
-        existing_names = set(symbols.keys())
+            tables = list(self._scope_tables())
 
         if other_table:
-            # If a second symbol table has been supplied, include its entries
-            # in the list of names to exclude.
-            other_names = set(other_table.symbols_dict.keys())
-            existing_names = existing_names.union(other_names)
+            # If a second symbol table has been supplied, also exclude the
+            # names of its entries.
+            tables.append(other_table)
 
         if root_name is not None:
             if not isinstance(root_name, str):
@@ -486,12 +571,22 @@ class SymbolTable():
                     f"but found '{type(root_name).__name__}'.")
         if not root_name:
             root_name = Config.get().psyir_root_name
-        candidate_name = root_name
-        idx = 1
-        while self._normalize(candidate_name) in existing_names:
-            candidate_name = f"{root_name}_{idx}"
+
+        # The new name is the first of root_name, root_name_1, root_name_2,
+        # ... that is not in any of the tables. Each table records how many
+        # of these names it contains in sequence and so the search can
+        # start after the longest such sequence.
+        norm_root_name = self._normalize(root_name)
+        idx = 0
+        for table in tables:
+            if isinstance(table.symbols_dict, _SymbolDict):
+                idx = max(idx, table.symbols_dict.count_names(norm_root_name))
+        while True:
+            candidate_name = f"{root_name}_{idx}" if idx else root_name
+            norm_name = self._normalize(candidate_name)
+            if not any(norm_name in table.symbols_dict for table in tables):
+                return candidate_name
             idx += 1
-        return candidate_name
 
     def add(self, new_symbol, tag=None):
         '''Add a new symbol to the symbol table if the symbol name is not
@@ -519,7 +614,8 @@ class SymbolTable():
                            f"name '{new_symbol.name}'.")
 
         if tag:
-            if tag in self.get_tags():
+            if any(tag in table.tags_dict
+                   for table in self._scope_tables()):
                 raise KeyError(
                     f"This symbol table, or an outer scope ancestor symbol "
                     f"table, already contains the tag '{tag}' for the symbol"
@@ -620,34 +716,39 @@ class SymbolTable():
                 f"Expected the name argument to the lookup() method to be "
                 f"a str but found '{type(name).__name__}'.")
 
-        try:
-            symbol = self.get_symbols(scope_limit)[self._normalize(name)]
-            if visibility:
-                if not isinstance(visibility, list):
-                    vis_list = [visibility]
-                else:
-                    vis_list = visibility
-                if symbol.visibility not in vis_list:
-                    vis_names = []
-                    # Take care here in case the 'visibility' argument
-                    # is of the wrong type
-                    for vis in vis_list:
-                        if not isinstance(vis, Symbol.Visibility):
-                            raise TypeError(
-                                f"the 'visibility' argument to lookup() must "
-                                f"be an instance (or list of instances) of "
-                                f"Symbol.Visibility but got "
-                                f"'{type(vis).__name__}' when searching for "
-                                f"symbol '{name}'")
-                        vis_names.append(vis.name)
-                    raise SymbolError(
-                        f"Symbol '{name}' exists in the Symbol Table but has "
-                        f"visibility '{symbol.visibility.name}' which does not"
-                        f" match with the requested visibility: {vis_names}")
-            return symbol
-        except KeyError as err:
-            raise KeyError(f"Could not find '{name}' in the Symbol Table.") \
-                from err
+        # Search each table in scope in turn (rather than merging them) as
+        # this is the most frequent operation on a symbol table.
+        key = self._normalize(name)
+        for table in self._scope_tables(scope_limit):
+            symbol = table.symbols_dict.get(key)
+            if symbol is not None:
+                break
+        else:
+            raise KeyError(f"Could not find '{name}' in the Symbol Table.")
+
+        if visibility:
+            if not isinstance(visibility, list):
+                vis_list = [visibility]
+            else:
+                vis_list = visibility
+            if symbol.visibility not in vis_list:
+                vis_names = []
+                # Take care here in case the 'visibility' argument
+                # is of the wrong type
+                for vis in vis_list:
+                    if not isinstance(vis, Symbol.Visibility):
+                        raise TypeError(
+                            f"the 'visibility' argument to lookup() must "
+                            f"be an instance (or list of instances) of "
+                            f"Symbol.Visibility but got "
+                            f"'{type(vis).__name__}' when searching for "
+                            f"symbol '{name}'")
+                    vis_names.append(vis.name)
+                raise SymbolError(
+                    f"Symbol '{name}' exists in the Symbol Table but has "
+                    f"visibility '{symbol.visibility.name}' which does not"
+                    f" match with the requested visibility: {vis_names}")
+        return symbol
 
     def lookup_with_tag(self, tag, scope_limit=None):
         '''Look up a symbol by its tag. The lookup can be limited by
@@ -673,11 +774,11 @@ class SymbolTable():
                 f"Expected the tag argument to the lookup_with_tag() method "
                 f"to be a str but found '{type(tag).__name__}'.")
 
-        try:
-            return self.get_tags(scope_limit)[tag]
-        except KeyError as err:
-            raise KeyError(f"Could not find the tag '{tag}' in the Symbol "
-                           f"Table.") from err
+        for table in self._scope_tables(scope_limit):
+            if tag in table.tags_dict:
+                return table.tags_dict[tag]
+        raise KeyError(f"Could not find the tag '{tag}' in the Symbol "
+                       f"Table.")
 
     def __contains__(self, key):
         '''Check if the given key is part of the Symbol Table.
@@ -1303,6 +1404,15 @@ class SymbolTable():
         # Re-insert modified symbol
         self.add(symbol)
 
+        # The variable accesses cached in the PSyIR refer to the symbol
+        # by its name, so any that may contain it are discarded.
+        if self.node:
+            # pylint: disable=import-outside-toplevel
+            from psyclone.psyir.nodes import Node
+            self.node._invalidate_caches()
+            for node in self.node.walk(Node):
+                node._cached_accesses = None
+
     def has_wildcard_imports(self):
         '''
         Searches this symbol table and then up through any parent symbol
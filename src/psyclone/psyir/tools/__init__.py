@@ -36,10 +36,15 @@
 '''Tool module, containing all generic (API independent) tools.
 '''
 
-from psyclone.psyir.tools.dependency_tools import DTCode, DependencyTools
+from psyclone.psyir.tools.dependency_tools import DTCode, DependencyTools, \
+    LoopParallelisationReport
+from psyclone.psyir.tools.forward_dependence import \
+    ForwardDependenceAnalysis
+from psyclone.psyir.tools.structural_key import NodeInterner, StructuralKey
 
 # The entities in the __all__ list are made available to import directly from
 # this package e.g.:
 # from psyclone.psyir.tools import DependencyTools
 
-__all__ = ['DTCode', 'DependencyTools']
+__all__ = ['DTCode', 'DependencyTools', 'ForwardDependenceAnalysis',
+           'LoopParallelisationReport', 'NodeInterner', 'StructuralKey']
@@ -47,10 +47,11 @@ from psyclone.configuration import Config
 from psyclone.core import (AccessType, SymbolicMaths,
                            VariablesAccessInfo)
 from psyclone.errors import InternalError, LazyString
-from psyclone.psyir.nodes import Loop
+from psyclone.psyir.nodes import Loop, Node, Routine
 from psyclone.psyir.backend.fortran import FortranWriter
-from psyclone.psyir.backend.sympy_writer import SymPyWriter
+from psyclone.psyir.backend.sympy_builder import SymPyBuilder
 from psyclone.psyir.backend.visitor import VisitorError
+from psyclone.psyir.tools.structural_key import StructuralKey
 
 
 class DTCode(IntEnum):
@@ -122,6 +123,109 @@ class Message:
         return [str(i) for i in self._var_names]
 
 
+# ============================================================================
+class LoopParallelisationReport:
+    '''This class stores the result of analysing all loops of a routine
+    for parallelisation (see `DependencyTools.can_loops_be_parallelised`).
+    It maps each loop to whether it can be parallelised and to the
+    messages that were created while analysing it. PSyIR nodes are not
+    hashable, so the loops are looked up by identity.
+
+    '''
+    def __init__(self):
+        # Maps the id of each loop to a tuple of the loop, whether it can
+        # be parallelised and the list of messages.
+        self._results = {}
+
+    # ------------------------------------------------------------------------
+    def _add(self, loop, parallelisable, messages):
+        '''Adds the result of analysing a loop.
+
+        :param loop: the loop that was analysed.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+        :param bool parallelisable: whether the loop can be parallelised.
+        :param messages: the messages created while analysing the loop.
+        :type messages: List[:py:class:`psyclone.psyir.tools.\
+            dependency_tools.Message`]
+
+        '''
+        self._results[id(loop)] = (loop, parallelisable, messages)
+
+    # ------------------------------------------------------------------------
+    def _get_result(self, loop):
+        ''':param loop: a loop that has been analysed.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: the stored result for the loop.
+        :rtype: Tuple[:py:class:`psyclone.psyir.nodes.Loop`, bool, \
+            List[:py:class:`psyclone.psyir.tools.dependency_tools.Message`]]
+
+        :raises KeyError: if the loop has not been analysed.
+
+        '''
+        result = self._results.get(id(loop))
+        if result is None or result[0] is not loop:
+            raise KeyError(f"The loop '{loop.node_str(colour=False)}' has "
+                           f"not been analysed.")
+        return result
+
+    # ------------------------------------------------------------------------
+    def __contains__(self, loop):
+        return (id(loop) in self._results and
+                self._results[id(loop)][0] is loop)
+
+    # ------------------------------------------------------------------------
+    def __iter__(self):
+        ''':returns: an iterator over all analysed loops (in the order in \
+            which they appear in the routine).
+        :rtype: Iterator[:py:class:`psyclone.psyir.nodes.Loop`]
+        '''
+        return (result[0] for result in self._results.values())
+
+    # ------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._results)
+
+    # ------------------------------------------------------------------------
+    def is_parallelisable(self, loop):
+        ''':param loop: a loop that has been analysed.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: whether the loop can be parallelised.
+        :rtype: bool
+
+        :raises KeyError: if the loop has not been analysed.
+
+        '''
+        return self._get_result(loop)[1]
+
+    # ------------------------------------------------------------------------
+    def get_messages(self, loop):
+        ''':param loop: a loop that has been analysed.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+
+        :returns: the messages that were created while analysing the loop, \
+            the same as `DependencyTools.get_all_messages` returns after \
+            `can_loop_be_parallelised` has been called for the loop.
+        :rtype: List[:py:class:`psyclone.psyir.tools.dependency_tools.\
+            Message`]
+
+        :raises KeyError: if the loop has not been analysed.
+
+        '''
+        return self._get_result(loop)[2]
+
+    # ------------------------------------------------------------------------
+    @property
+    def parallelisable_loops(self):
+        ''':returns: all loops that can be parallelised (in the order in \
+            which they appear in the routine).
+        :rtype: List[:py:class:`psyclone.psyir.nodes.Loop`]
+        '''
+        return [loop for loop, parallelisable, _ in self._results.values()
+                if parallelisable]
+
+
 # ============================================================================
 class DependencyTools():
     '''This class provides some useful dependency tools, allowing a user to
@@ -166,6 +270,10 @@ class DependencyTools():
             self._language_writer = FortranWriter()
         else:
             self._language_writer = language_writer
+        # Stores the results of comparing pairs of accesses while all loops
+        # of a routine are analysed (see can_loops_be_parallelised). It is
+        # None otherwise.
+        self._dependency_cache = None
         self._clear_messages()
 
     # -------------------------------------------------------------------------
@@ -374,7 +482,7 @@ class DependencyTools():
         # pylint: disable=too-many-return-statements
         sym_maths = SymbolicMaths.get()
         try:
-            sympy_expressions, symbol_map = SymPyWriter.\
+            sympy_expressions, symbol_map = SymPyBuilder.\
                 get_sympy_expressions_and_symbol_map([index_read,
                                                      index_written])
         except VisitorError:
@@ -573,6 +681,29 @@ class DependencyTools():
 
         return False
 
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _get_index_key(access):
+        '''Returns a key for the indices of an access, so that accesses
+        using the same indices (e.g. several accesses to `a(i,j+1)`) can
+        be found with a dictionary or set lookup.
+
+        :param access: the access information for a single access.
+        :type access: :py:class:`psyclone.core.access_info.AccessInfo`
+
+        :returns: a key for the indices of the access, or None if an \
+            index is not a PSyIR node.
+        :rtype: Optional[Tuple[Tuple[ \
+            :py:class:`psyclone.psyir.tools.StructuralKey`, ...], ...]]
+
+        '''
+        key = []
+        for component in access.component_indices:
+            if not all(isinstance(index, Node) for index in component):
+                return None
+            key.append(tuple(StructuralKey(index) for index in component))
+        return tuple(key)
+
     # -------------------------------------------------------------------------
     def _array_access_parallelisable(self, loop_variables, var_info):
         '''Tries to determine if the access pattern for an array
@@ -617,15 +748,38 @@ class DependencyTools():
             return True
 
         all_write_accesses = var_info.all_write_accesses
+        # The result of the comparison of two accesses only depends on
+        # their indices, so any accesses using the same indices as an
+        # access that has already been compared are skipped.
+        index_keys = [self._get_index_key(access) for access in var_info]
 
         for write_access in all_write_accesses:
+            compared = set()
+            write_key = None
+            if self._dependency_cache is not None:
+                write_key = self._get_index_key(write_access)
             # We need to compare each write access with any other access,
             # including itself (to detect write-write race conditions:
             # a((i-2)**2) = b(i): i=1 and i=3 would write to a(1))
-            for other_access in var_info:
-                if not self._is_loop_carried_dependency(loop_variables,
-                                                        write_access,
-                                                        other_access):
+            for other_access, index_key in zip(var_info, index_keys):
+                if index_key is not None:
+                    if index_key in compared:
+                        continue
+                    compared.add(index_key)
+                if write_key is not None and index_key is not None:
+                    # When all loops of a routine are analysed, the same
+                    # pair of indices is often compared for other loops
+                    # (with the same loop variables) as well.
+                    cache_key = (tuple(loop_variables), write_key, index_key)
+                    independent = self._dependency_cache.get(cache_key)
+                    if independent is None:
+                        independent = self._is_loop_carried_dependency(
+                            loop_variables, write_access, other_access)
+                        self._dependency_cache[cache_key] = independent
+                else:
+                    independent = self._is_loop_carried_dependency(
+                        loop_variables, write_access, other_access)
+                if not independent:
                     # There is a dependency. Try to give precise error
                     # messages:
                     # We need to use default parameters, since otherwise
@@ -751,6 +905,37 @@ class DependencyTools():
                             f"instance of class Loop but got "
                             f"'{type(loop).__name__}'")
 
+        return self._is_loop_parallelisable(loop, None, only_nested_loops,
+                                            test_all_variables,
+                                            signatures_to_ignore)
+
+    # -------------------------------------------------------------------------
+    def _is_loop_parallelisable(self, loop, loop_vars, only_nested_loops,
+                                test_all_variables, signatures_to_ignore):
+        # pylint: disable=too-many-arguments
+        '''This function implements `can_loop_be_parallelised` (see there
+        for a description of the parameters) once the loop variables of
+        the loop nest are known.
+
+        :param loop: the loop node to be analysed.
+        :type loop: :py:class:`psyclone.psyir.nodes.Loop`
+        :param loop_vars: the names of the variables of the loop and of all \
+            loops inside it (in the order returned by `walk`), or None if \
+            they still need to be collected.
+        :type loop_vars: Optional[List[str]]
+        :param bool only_nested_loops: if True, a loop must have an inner \
+            loop in order to be considered parallelisable.
+        :param bool test_all_variables: if True, it will test if all \
+            variable accesses can be parallelised.
+        :param signatures_to_ignore: list of signatures for which to skip \
+            the access checks.
+        :type signatures_to_ignore: \
+            Optional[List[:py:class:`psyclone.core.Signature`]]
+
+        :returns: True if the loop can be parallelised.
+        :rtype: bool
+
+        '''
         # Check if the loop type should be parallelised, e.g. to avoid
         # parallelising inner loops which might not have enough work. This
         # is supposed to be a fast first check to avoid collecting variable
@@ -764,7 +949,8 @@ class DependencyTools():
             signatures_to_ignore = []
 
         # Collect all variables used as loop variable:
-        loop_vars = [loop.variable.name for loop in loop.walk(Loop)]
+        if loop_vars is None:
+            loop_vars = [loop.variable.name for loop in loop.walk(Loop)]
 
         result = True
         # Now check all variables used in the loop
@@ -804,6 +990,79 @@ class DependencyTools():
 
         return result
 
+    # -------------------------------------------------------------------------
+    def can_loops_be_parallelised(self, routine,
+                                  only_nested_loops=True,
+                                  test_all_variables=False,
+                                  signatures_to_ignore=None):
+        '''This function analyses all loops in a routine to see if they can
+        be safely parallelised. Each loop is analysed in the same way as by
+        `can_loop_be_parallelised`, but the loops are analysed in a single
+        bottom-up pass (inner loops before the loops containing them), which
+        shares information between the loops:
+
+        - the loop variables of a loop nest are composed from those of the
+          inner loops;
+        - the variable accesses of a loop are composed from the (cached)
+          accesses of its inner loops;
+        - the result of comparing two array accesses is reused for all
+          other accesses using the same indices in any loop with the same
+          loop variables (e.g. in all `jk`, `jj`, `ji` loop nests).
+
+        The messages of each loop are stored in the returned report, and
+        `get_all_messages` returns the messages of the last loop analysed.
+
+        :param routine: the routine whose loops are analysed.
+        :type routine: :py:class:`psyclone.psyir.nodes.Routine`
+        :param bool only_nested_loops: if True, a loop must have an inner\
+                                       loop in order to be considered\
+                                       parallelisable (default: True).
+        :param bool test_all_variables: if True, it will test if all variable\
+                                        accesses can be parallelised,\
+                                        otherwise it will stop after the first\
+                                        variable is found that can not be\
+                                        parallelised.
+        :param signatures_to_ignore: list of signatures for which to skip \
+                                     the access checks.
+        :type signatures_to_ignore: list of :py:class:`psyclone.core.Signature`
+
+        :returns: a report with the result and the messages for each loop.
+        :rtype: :py:class:`psyclone.psyir.tools.LoopParallelisationReport`
+
+        :raises TypeError: if the supplied node is not a Routine.
+
+        '''
+        if not isinstance(routine, Routine):
+            raise TypeError(f"can_loops_be_parallelised: node must be an "
+                            f"instance of class Routine but got "
+                            f"'{type(routine).__name__}'")
+        all_loops = routine.walk(Loop)
+        # The loop variables of the loops directly inside each loop (by id)
+        inner_loop_vars = {id(loop): [] for loop in all_loops}
+        results = {}
+        self._dependency_cache = {}
+        try:
+            # In the reversed pre-order each loop comes after all the loops
+            # that it contains.
+            for loop in reversed(all_loops):
+                loop_vars = [loop.variable.name] + inner_loop_vars[id(loop)]
+                outer_loop = loop.ancestor(Loop)
+                if outer_loop and id(outer_loop) in inner_loop_vars:
+                    inner_loop_vars[id(outer_loop)][0:0] = loop_vars
+                self._clear_messages()
+                parallelisable = self._is_loop_parallelisable(
+                    loop, loop_vars, only_nested_loops, test_all_variables,
+                    signatures_to_ignore)
+                results[id(loop)] = (parallelisable, self._messages)
+        finally:
+            self._dependency_cache = None
+
+        report = LoopParallelisationReport()
+        # pylint: disable=protected-access
+        for loop in all_loops:
+            report._add(loop, *results[id(loop)])
+        return report
+
     # -------------------------------------------------------------------------
     def get_input_parameters(self, node_list, variables_info=None):
         # pylint: disable=no-self-use
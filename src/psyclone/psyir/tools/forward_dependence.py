@@ -0,0 +1,180 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+''' This module provides the ForwardDependenceAnalysis class which finds
+    the first following node with which each of a number of nodes (e.g.
+    taskloops) has a data dependence.'''
+
+from bisect import bisect_left, bisect_right
+
+from psyclone.core import VariablesAccessInfo
+from psyclone.psyir.nodes import Loop, Schedule
+
+
+class ForwardDependenceAnalysis():
+    '''
+    Finds the forward dependence of nodes in a region of code, i.e. the
+    first of the supplied candidate nodes that follows a node and accesses
+    a variable that the node accesses, with at least one of the two
+    accesses being a write (a RaW, WaR or WaW dependence), or the first
+    supplied barrier that follows the node.
+
+    The variable accesses of each node are computed once. Those of a node
+    are those of its descendants, except that the accesses of any Loop or
+    Schedule are not included (only those of their children), so that the
+    loop variable of a loop is not considered to be written. The candidates
+    that access each variable are then indexed by their position in the
+    tree so that the forward dependence of a node is found with a binary
+    search for each of the variables it accesses, rather than by examining
+    every node that follows it.
+
+    The analysis must be recreated if the tree is modified.
+
+    :param candidates: the nodes that can be a forward dependence because \
+        of their variable accesses.
+    :type candidates: List[:py:class:`psyclone.psyir.nodes.Node`]
+    :param barriers: the nodes that can be a forward dependence \
+        irrespective of variable accesses (e.g. synchronisation points).
+    :type barriers: Optional[List[:py:class:`psyclone.psyir.nodes.Node`]]
+    :param ignored_names: an optional function that returns the names of \
+        the variables whose accesses are ignored when checking for a \
+        dependence with the supplied candidate.
+    :type ignored_names: Optional[Callable[ \
+        [:py:class:`psyclone.psyir.nodes.Node`], Set[str]]]
+
+    '''
+    def __init__(self, candidates, barriers=None, ignored_names=None):
+        self._accesses = {}
+        self._candidates = sorted(candidates,
+                                  key=lambda node: node.abs_position)
+        self._positions = [node.abs_position for node in self._candidates]
+        self._barriers = sorted(barriers or [],
+                                key=lambda node: node.abs_position)
+        self._barrier_positions = [node.abs_position
+                                   for node in self._barriers]
+        # For each signature, the (ordered) indices of the candidates that
+        # access it and of the candidates that write it.
+        self._readers_writers = {}
+        self._writers = {}
+        for index, candidate in enumerate(self._candidates):
+            ignored = ignored_names(candidate) if ignored_names else ()
+            for signature, written in self.accesses(candidate).items():
+                if str(signature) in ignored:
+                    continue
+                self._readers_writers.setdefault(signature, []).append(index)
+                if written:
+                    self._writers.setdefault(signature, []).append(index)
+
+    def accesses(self, node):
+        '''
+        :param node: the node for which to find the variable accesses.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: whether each variable accessed by the descendants of the \
+            node (other than by Loop and Schedule nodes) is written.
+        :rtype: Dict[:py:class:`psyclone.core.Signature`, bool]
+
+        '''
+        result = {}
+        stack = list(reversed(node.children))
+        while stack:
+            child = stack.pop()
+            if isinstance(child, (Loop, Schedule)):
+                stack.extend(reversed(child.children))
+                continue
+            # The accesses of any other node include those of all of its
+            # descendants and so are only computed once for each such node.
+            if id(child) not in self._accesses:
+                self._accesses[id(child)] = (
+                    child, {signature: info.is_written() for signature, info
+                            in VariablesAccessInfo(child).items()})
+            for signature, written in self._accesses[id(child)][1].items():
+                result[signature] = result.get(signature, False) or written
+        return result
+
+    def forward_dependence(self, node, excluded=None, is_barrier=None):
+        '''
+        Finds the forward dependence of the supplied node.
+
+        :param node: the node for which to find the forward dependence.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+        :param excluded: an optional function that returns whether the \
+            supplied candidate or barrier must be skipped.
+        :type excluded: Optional[Callable[ \
+            [:py:class:`psyclone.psyir.nodes.Node`], bool]]
+        :param is_barrier: an optional function that returns whether the \
+            supplied barrier acts as a barrier for the node (by default \
+            all barriers do).
+        :type is_barrier: Optional[Callable[ \
+            [:py:class:`psyclone.psyir.nodes.Node`], bool]]
+
+        :returns: the first candidate following the node with which it has \
+            a dependence, or the first barrier following the node if that \
+            comes before, or None if there is neither.
+        :rtype: Optional[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        position = node.abs_position
+        start = bisect_right(self._positions, position)
+        first = len(self._candidates)
+        for signature, written in self.accesses(node).items():
+            # If the node writes the variable then any access is a
+            # dependence, otherwise only a write is.
+            indices = (self._readers_writers if written else
+                       self._writers).get(signature, [])
+            index = bisect_left(indices, start)
+            while index < len(indices) and indices[index] < first:
+                if not (excluded and
+                        excluded(self._candidates[indices[index]])):
+                    first = indices[index]
+                    break
+                index += 1
+        dependence = None
+        if first < len(self._candidates):
+            dependence = self._candidates[first]
+        index = bisect_right(self._barrier_positions, position)
+        while index < len(self._barriers):
+            if (dependence is not None and
+                    self._barrier_positions[index] > self._positions[first]):
+                break
+            barrier = self._barriers[index]
+            if not (excluded and excluded(barrier)) and \
+                    (is_barrier is None or is_barrier(barrier)):
+                return barrier
+            index += 1
+        return dependence
+
+
+# For AutoAPI documentation generation
+__all__ = ["ForwardDependenceAnalysis"]
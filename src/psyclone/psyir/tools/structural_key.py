@@ -0,0 +1,144 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+''' This module provides the StructuralKey class, which allows PSyIR
+    subtrees to be used as dictionary keys (or in sets) based on their
+    structure, and the NodeInterner class, which uses it to map equal
+    subtrees to a single representative (hash-consing).'''
+
+from psyclone.psyir.nodes import Node
+
+
+class StructuralKey():
+    '''
+    Wraps a PSyIR node so that it can be used as a dictionary key or a set
+    element. Two keys are equal if the nodes they wrap are equal (see
+    `Node.__eq__`), and the hash of a key is the structural hash of its
+    node (see `Node.structural_hash`), so comparing keys with different
+    hashes does not require the subtrees to be compared.
+
+    The hash is computed when the key is created, so the node must not be
+    modified while the key is in use (as with any other dictionary key).
+
+    :param node: the PSyIR node to wrap.
+    :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+    :raises TypeError: if the supplied node is not a PSyIR Node.
+
+    '''
+    __slots__ = ("_node", "_hash")
+
+    def __init__(self, node):
+        if not isinstance(node, Node):
+            raise TypeError(f"A StructuralKey can only be created for a PSyIR "
+                            f"Node but got '{type(node).__name__}'.")
+        self._node = node
+        self._hash = node.structural_hash()
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, StructuralKey):
+            return NotImplemented
+        return (self is other or
+                (self._hash == other._hash and self._node == other._node))
+
+    def __repr__(self):
+        return f"StructuralKey({self._node.node_str(colour=False)})"
+
+    @property
+    def node(self):
+        '''
+        :returns: the PSyIR node wrapped by this key.
+        :rtype: :py:class:`psyclone.psyir.nodes.Node`
+
+        '''
+        return self._node
+
+
+class NodeInterner():
+    '''
+    Maps equal PSyIR subtrees to a single representative, the first of
+    them that was interned (hash-consing). This can be used to remove
+    duplicates, e.g. from a list of index expressions, so that each of
+    them is analysed only once:
+
+    >>> interner = NodeInterner()
+    >>> unique = [index for index in indices
+    ...           if interner.intern(index) is index]
+
+    The interned nodes must not be modified while the interner is in use.
+
+    '''
+    def __init__(self):
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return StructuralKey(node) in self._nodes
+
+    def intern(self, node):
+        '''
+        Returns the representative of the supplied node, i.e. the first
+        node equal to it that was interned, which is the node itself if
+        no equal node has been interned before.
+
+        :param node: the node to intern.
+        :type node: :py:class:`psyclone.psyir.nodes.Node`
+
+        :returns: the representative of the supplied node.
+        :rtype: :py:class:`psyclone.psyir.nodes.Node`
+
+        '''
+        return self._nodes.setdefault(StructuralKey(node), node)
+
+    @staticmethod
+    def unique(nodes):
+        '''
+        Removes duplicates (nodes that are equal to a node before them)
+        from the supplied nodes.
+
+        :param nodes: the nodes from which to remove duplicates.
+        :type nodes: Iterable[:py:class:`psyclone.psyir.nodes.Node`]
+
+        :returns: the first of each group of equal nodes, in the order \
+            in which they were supplied.
+        :rtype: List[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
+        interner = NodeInterner()
+        return [node for node in nodes if interner.intern(node) is node]
@@ -299,8 +299,8 @@ class ArrayRange2LoopTrans(Transformation):
         # which happens to only contain a single operator (MATMUL)
         # because at this time all other operators in the PSyIR can be
         # performed elementwise.
-        if [operation for operation in node.rhs.walk(Operation)
-                if operation.operator in [BinaryOperation.Operator.MATMUL]]:
+        if any(operation.operator in [BinaryOperation.Operator.MATMUL]
+               for operation in node.rhs.iter_walk(Operation)):
             raise TransformationError(
                 f"Error in {self.name} transformation. The rhs of the "
                 f"supplied Assignment node '{node.rhs}' contains the MATMUL "
@@ -168,7 +168,7 @@ class ChunkLoopTrans(LoopTrans):
             raise TransformationError("Cannot apply a ChunkLoopTrans to "
                                       "a loop with a step size of 0.")
 
-        if len(node.loop_body.walk(CodeBlock)) != 0:
+        if node.loop_body.first_of(CodeBlock) is not None:
             raise TransformationError("Cannot apply a ChunkLoopTrans to "
                                       "a loop which contains a CodeBlock "
                                       "node.")
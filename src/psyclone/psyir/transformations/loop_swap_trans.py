@@ -147,7 +147,7 @@ class LoopSwapTrans(LoopTrans):
 
         for boundary in (node_outer.start_expr, node_outer.stop_expr,
                          node_outer.step_expr):
-            symbols = [ref.symbol for ref in boundary.walk(Reference)]
+            symbols = [ref.symbol for ref in boundary.iter_walk(Reference)]
             if node_inner.variable in symbols:
                 raise TransformationError(
                     f"Error in LoopSwap transformation: The inner loop "
@@ -157,7 +157,7 @@ class LoopSwapTrans(LoopTrans):
 
         for boundary in (node_inner.start_expr, node_inner.stop_expr,
                          node_inner.step_expr):
-            symbols = [ref.symbol for ref in boundary.walk(Reference)]
+            symbols = [ref.symbol for ref in boundary.iter_walk(Reference)]
             if node_outer.variable in symbols:
                 raise TransformationError(
                     f"Error in LoopSwap transformation: The outer loop "
@@ -108,9 +108,9 @@ class LoopTrans(Transformation):
         if options.get("node-type-check", True):
             # Stop at any instance of Kern to avoid going into the
             # actual kernels, e.g. in Nemo inlined kernels
-            flat_list = [item for item in node.walk(object, stop_type=Kern)
-                         if not isinstance(item, Schedule)]
-            for item in flat_list:
+            for item in node.iter_walk(object, stop_type=Kern):
+                if isinstance(item, Schedule):
+                    continue
                 if isinstance(item, self.excluded_node_types):
                     raise TransformationError(
                         f"Nodes of type '{type(item).__name__}' cannot be "
@@ -39,14 +39,14 @@ applied to an OMPParallelDirective to satisfy any task-based dependencies
 created by OpenMP Taskloops.'''
 from __future__ import absolute_import, print_function
 
-from psyclone.core import VariablesAccessInfo
 from psyclone.errors import LazyString, InternalError
 from psyclone.psyGen import Transformation
 from psyclone.psyir import nodes
 from psyclone.psyir.backend.fortran import FortranWriter
-from psyclone.psyir.nodes import Loop, Schedule, \
+from psyclone.psyir.nodes import Loop, \
     OMPDoDirective, OMPTaskloopDirective, OMPSerialDirective, \
     OMPTaskwaitDirective, OMPSingleDirective, OMPParallelDirective
+from psyclone.psyir.tools import ForwardDependenceAnalysis
 from psyclone.psyir.transformations.transformation_error import \
         TransformationError
 
@@ -143,10 +143,13 @@ class OMPTaskwaitTrans(Transformation):
                                       "contain any OMPTaskloopDirectives")
 
         # Check that all of the dependencies are satisfiable
+        analysis = None
+        if taskloops:
+            analysis = OMPTaskwaitTrans.create_analysis(node)
         for taskloop in taskloops:
             # Find the first RaW or WaR dependency for this taskloop.
-            forward_dep = OMPTaskwaitTrans.get_forward_dependence(taskloop,
-                                                                  node)
+            forward_dep = OMPTaskwaitTrans.get_forward_dependence(
+                taskloop, node, analysis)
             if forward_dep is None:
                 continue
             # Check if the taskloop and its forward dependence are in the
@@ -177,11 +180,29 @@ class OMPTaskwaitTrans(Transformation):
                                         f"{fwr(forward_dep).rstrip(chr(10))}"))
 
     @staticmethod
-    def get_forward_dependence(taskloop, root):
+    def create_analysis(root):
+        '''
+        Creates the analysis used to find the forward dependences of the
+        taskloops in the supplied tree. It must be recreated if the tree is
+        modified.
+
+        :param root: the tree in which to search for forward dependences.
+        :type root: :py:class:`psyclone.psyir.nodes.OMPParallelDirective`
+
+        :returns: the forward-dependence analysis of the tree.
+        :rtype: :py:class:`psyclone.psyir.tools.ForwardDependenceAnalysis`
+
+        '''
+        return ForwardDependenceAnalysis(
+            root.walk((Loop, OMPDoDirective, OMPTaskloopDirective)),
+            barriers=root.walk(OMPTaskwaitDirective))
+
+    @staticmethod
+    def get_forward_dependence(taskloop, root, analysis=None):
         '''
         Returns the next forward dependence for a taskloop using the
         dependence-analysis functionality provided by
-        psyclone.psyir.tools.dependency_tools.
+        psyclone.psyir.tools.forward_dependence.
         Forward dependencies can be of the following types:
         Loop
         OMPDoDirective
@@ -210,6 +231,12 @@ class OMPTaskwaitTrans(Transformation):
         :type taskloop: :py:class:`psyclone.psyir.nodes.OMPTaskloopDirective`
         :param root: the tree in which to search for the forward_dependence.
         :type root: :py:class:`psyclone.psyir.nodes.OMPParallelDirective`
+        :param analysis: the analysis of the tree as created by \
+            create_analysis (it is created if not supplied). This allows \
+            the variable accesses of the nodes in the tree to be reused \
+            when finding the forward dependences of several taskloops.
+        :type analysis: \
+            Optional[:py:class:`psyclone.psyir.tools.ForwardDependenceAnalysis`]
 
         :returns: the forward_dependence of taskloop.
         :rtype: :py:class:`psyclone.f2pygen.Node`
@@ -222,17 +249,6 @@ class OMPTaskwaitTrans(Transformation):
                                       f"be an instance of OMPParallelDirective"
                                       f", but was supplied an instance of "
                                       f"'{type(root).__name__}'")
-        # We only look for specific types
-        node_list = root.walk((Loop, OMPDoDirective, OMPTaskloopDirective,
-                               OMPTaskwaitDirective))
-        # Find the taskloop's variable access info. We need to skip over the
-        # Loop variable writes from the Loop, so we skip the Loop children.
-        taskloop_vars = VariablesAccessInfo()
-        for child in taskloop.walk(nodes.Node):
-            if child is not taskloop and not isinstance(child,
-                                                        (Schedule, Loop)):
-                taskloop_vars.merge(VariablesAccessInfo(child))
-        taskloop_signatures = taskloop_vars.all_signatures
         # Find our parent serial region if it has a barrier
         parent_single = taskloop.ancestor(OMPSingleDirective)
         # Cache the parent single for use in later if statements
@@ -256,57 +272,41 @@ class OMPTaskwaitTrans(Transformation):
                     LazyString(lambda: f"No parent parallel directive was "
                                        f"found for the taskloop region: "
                                        f"{fwriter(taskloop).rstrip(chr(10))}"))
-
-        for node in node_list:
-            if node.abs_position <= taskloop.abs_position:
-                continue
-            # Ignore any children of the taskloop directive
-            anc = node.ancestor(OMPTaskloopDirective)
-            if anc is taskloop:
-                continue
-            node_vars = None
-            if (isinstance(node, OMPTaskwaitDirective) and
-                    (cached_parent_single is
-                     node.ancestor(OMPSingleDirective)) and
-                    cached_parent_single is not None and
-                    cached_parent_single.nowait is False):
-                # If we find a taskwait barrier inside the same
-                # OMPSingleDirective and that OMPSingleDirective has a no
-                # nowait clause, then it acts as a barrier for dependencies
-                # as well, so we return it
-                return node
-            if not isinstance(node, OMPTaskwaitDirective):
-                # For all our other node types we calculate their own
-                # variable accesses
-                node_vars = VariablesAccessInfo()
-                for child in node.walk(nodes.Node):
-                    if child is not node and not isinstance(child,
-                                                            (Schedule, Loop)):
-                        refs = VariablesAccessInfo(child)
-                        if refs is not None:
-                            node_vars.merge(refs)
-            node_signatures = node_vars.all_signatures
-            # Once we have the node's variable accesses, check for collisions
-            for sig1 in taskloop_signatures:
-                # If this signature is not in the node signatures then continue
-                if sig1 not in node_signatures:
-                    continue
-                access1 = taskloop_vars[sig1]
-                access2 = node_vars[sig1]
-                # If both are only read we can ignore this signature
-                # Otherwise, one of them writes so return this node as
-                # we have a WaW, WaR or RaW dependency
-                if access1.is_written() or access2.is_written():
-                    # If we have a different parent serial node, and
-                    # parent_single is not None then our parent_single is our
-                    # dependency, otherwise this node is the dependency
-                    if (taskloop.ancestor(OMPSerialDirective) is not
-                            node.ancestor(OMPSerialDirective) and
-                            parent_single is not None):
-                        return parent_single
-                    return node
-        # If we found no dependencies, then return that!
-        return None
+        if analysis is None:
+            analysis = OMPTaskwaitTrans.create_analysis(root)
+
+        def excluded(node):
+            '''
+            :returns: whether the node is one of the children of the \
+                taskloop directive, which are ignored.
+            :rtype: bool
+            '''
+            return node.ancestor(OMPTaskloopDirective) is taskloop
+
+        def is_barrier(node):
+            '''
+            :returns: whether the taskwait node is inside the same \
+                OMPSingleDirective as the taskloop and that \
+                OMPSingleDirective has no nowait clause, in which case it \
+                acts as a barrier for dependencies as well.
+            :rtype: bool
+            '''
+            return (cached_parent_single is not None and
+                    cached_parent_single is
+                    node.ancestor(OMPSingleDirective) and
+                    cached_parent_single.nowait is False)
+
+        node = analysis.forward_dependence(taskloop, excluded=excluded,
+                                           is_barrier=is_barrier)
+        # If we have a different parent serial node, and parent_single is not
+        # None then our parent_single is our dependency, otherwise this node
+        # is the dependency
+        if (node is not None and not isinstance(node, OMPTaskwaitDirective)
+                and taskloop.ancestor(OMPSerialDirective) is not
+                node.ancestor(OMPSerialDirective) and
+                parent_single is not None):
+            return parent_single
+        return node
 
     @staticmethod
     def _eliminate_unneeded_dependencies(taskloop_positions,
@@ -417,13 +417,18 @@ class OMPTaskwaitTrans(Transformation):
             # Get the forward_dependence position of all of the taskloops
             dependence_position = [None] * len(taskloops)
             dependence_node = [None] * len(taskloops)
+            # The analysis of the tree (which is modified by the previous
+            # task regions) is shared by all of the taskloops in this region.
+            analysis = None
             for i, taskloop in enumerate(taskloops):
                 taskloop_positions[i] = taskloop.abs_position
                 # Only set forward_dep for taskloops with nogroup set
                 forward_dep = None
                 if taskloop.nogroup:
+                    if analysis is None:
+                        analysis = OMPTaskwaitTrans.create_analysis(node)
                     forward_dep = OMPTaskwaitTrans.get_forward_dependence(
-                            taskloop, node)
+                            taskloop, node, analysis)
                     # If the forward_dependence is one of our parents then we
                     # should ignore it
                     if (forward_dep is not None and
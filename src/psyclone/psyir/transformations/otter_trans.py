@@ -36,15 +36,14 @@
 ''' This module contains the implementation of the various Otter
 transformations.'''
 
-from psyclone.core import VariablesAccessInfo
 from psyclone.errors import LazyString, InternalError
 from psyclone.psyGen import Transformation
 from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.psyir.tools import ForwardDependenceAnalysis
 from psyclone.psyir.transformations.chunk_loop_trans import ChunkLoopTrans
 from psyclone.psyir.transformations.loop_trans import LoopTrans
 from psyclone.psyir.transformations.region_trans import RegionTrans
-from psyclone.psyir import nodes
-from psyclone.psyir.nodes import Loop, Schedule, Reference, \
+from psyclone.psyir.nodes import Loop, Reference, \
     OtterTraceSetupNode, OtterParallelNode, OtterTaskNode, \
     OtterLoopNode, OtterLoopIterationNode, \
     OtterSynchroniseChildrenNode, OtterSynchroniseDescendantTasksNode, \
@@ -188,9 +187,65 @@ class OtterSynchroniseRegionTrans(RegionTrans):
         return rval
 
     @staticmethod
-    def get_forward_dependence(taskloop, root):
-        # root is OtterParallelNode
-        # taskloop is a Loop containing OtterTaskNode
+    def create_analysis(root):
+        '''
+        Creates the analysis used to find the forward dependences of the
+        taskloops in the supplied tree. It must be recreated if the tree is
+        modified.
+
+        :param root: the tree in which to search for forward dependences.
+        :type root: :py:class:`psyclone.psyir.nodes.OtterParallelNode`
+
+        :returns: the forward-dependence analysis of the tree.
+        :rtype: :py:class:`psyclone.psyir.tools.ForwardDependenceAnalysis`
+
+        '''
+        def ignored_names(node):
+            '''
+            :returns: the names of the loop variables of the node, which \
+                are ignored when looking for a dependence with it.
+            :rtype: Set[str]
+            '''
+            names = set()
+            if isinstance(node, Loop):
+                # This doesn't seem great...we skip the chunk loop var
+                names.add(
+                    node.loop_body.children[0].children[0].symbol.name)
+            for loop in node.iter_walk(Loop):
+                if loop is not node:
+                    names.add(str(loop.variable.name))
+            return names
+
+        candidates = root.walk(OtterLoopNode)
+        for loop in root.iter_walk(Loop):
+            if loop.first_of(OtterTaskNode) is not None:
+                candidates.append(loop)
+        return ForwardDependenceAnalysis(
+            candidates, barriers=root.walk(OtterSynchroniseChildrenNode),
+            ignored_names=ignored_names)
+
+    @staticmethod
+    def get_forward_dependence(taskloop, root, analysis=None):
+        '''
+        Returns the next forward dependence of a taskloop (a Loop containing
+        an OtterTaskNode): the first following OtterSynchroniseChildrenNode
+        or the first following OtterLoopNode or taskloop with which it has
+        a RaW, WaR or WaW dependence.
+
+        :param taskloop: the taskloop for which to find the forward \
+            dependence.
+        :type taskloop: :py:class:`psyclone.psyir.nodes.Loop`
+        :param root: the tree in which to search for the forward dependence.
+        :type root: :py:class:`psyclone.psyir.nodes.OtterParallelNode`
+        :param analysis: the analysis of the tree as created by \
+            create_analysis (it is created if not supplied).
+        :type analysis: \
+            Optional[:py:class:`psyclone.psyir.tools.ForwardDependenceAnalysis`]
+
+        :returns: the forward dependence of the taskloop, if any.
+        :rtype: Optional[:py:class:`psyclone.psyir.nodes.Node`]
+
+        '''
         # Check supplied the correct type for root
         if not isinstance(root, OtterParallelNode):
             raise TransformationError(f"Expected the root of the tree in which"
@@ -198,20 +253,6 @@ class OtterSynchroniseRegionTrans(RegionTrans):
                                       f"be an instance of OtterParallelNode"
                                       f", but was supplied an instance of "
                                       f"'{type(root).__name__}'")
-        # We only look for specific types
-        node_list = root.walk((OtterLoopNode,
-                               OtterSynchroniseChildrenNode))
-        for loop in root.walk(Loop):
-            if loop.walk(OtterTaskNode):
-                node_list.append(loop)
-        # Find the taskloop's variable access info. We need to skip over the
-        # Loop variable writes from the Loop, so we skip the Loop children.
-        taskloop_vars = VariablesAccessInfo()
-        for child in taskloop.walk(nodes.Node):
-            if child is not taskloop and not isinstance(child,
-                                                        (Schedule, Loop)):
-                taskloop_vars.merge(VariablesAccessInfo(child))
-        taskloop_signatures = taskloop_vars.all_signatures
         # Find our parent parallel region
         parent_parallel = taskloop.ancestor(OtterParallelNode)
         # Raise an error if there is no parent_parallel region
@@ -223,51 +264,13 @@ class OtterSynchroniseRegionTrans(RegionTrans):
                     LazyString(lambda: f"No parent otter parallel node was "
                                        f"found for the taskloop region: "
                                        f"{fwriter(taskloop).rstrip(chr(10))}"))
+        if analysis is None:
+            analysis = OtterSynchroniseRegionTrans.create_analysis(root)
+        # Ignore any children of the taskloop directive (note that this is
+        # a check for equality rather than identity).
         childrenloops = taskloop.walk(Loop)
-        for node in node_list:
-            if node.abs_position <= taskloop.abs_position:
-                continue
-            # Ignore any children of the taskloop directive
-            if node in childrenloops:
-                continue
-            node_vars = None
-            loop_ignore_vars = []
-            # This doesn't seem great...we skip the chunk loop var
-            loop_ignore_vars.append(node.loop_body.children[0].children[0].symbol.name)
-            if (isinstance(node, OtterSynchroniseChildrenNode)):
-                # If we find a synchronise children node, then it acts as a 
-                # barrier for dependencies as well, so we return it
-                return node
-            if not isinstance(node, OtterSynchroniseChildrenNode):
-                # For all our other node types we calculate their own
-                # variable accesses
-                node_vars = VariablesAccessInfo()
-                for child in node.walk(nodes.Node):
-                    if child is not node and not isinstance(child,
-                                                            (Schedule, Loop)):
-                        refs = VariablesAccessInfo(child)
-                        if refs is not None:
-                            node_vars.merge(refs)
-                    elif child is not node and isinstance(child, Loop):
-                        loop_ignore_vars.append(str(child.variable.name))
-            node_signatures = node_vars.all_signatures
-            # Once we have the node's variable accesses, check for collisions
-            for sig1 in taskloop_signatures:
-                # If this signature is not in the node signatures then continue
-                if sig1 not in node_signatures:
-                    continue
-                # If we ignoring this loop variable continue
-                if str(sig1) in loop_ignore_vars:
-                    continue
-                access1 = taskloop_vars[sig1]
-                access2 = node_vars[sig1]
-                # If both are only read we can ignore this signature
-                # Otherwise, one of them writes so return this node as
-                # we have a WaW, WaR or RaW dependency
-                if access1.is_written() or access2.is_written():
-                    return node
-        # If we found no dependencies, then return that!
-        return None
+        return analysis.forward_dependence(
+            taskloop, excluded=lambda node: node in childrenloops)
 
     @staticmethod
     def _eliminate_unneeded_dependencies(taskloop_positions,
@@ -366,18 +369,19 @@ class OtterSynchroniseRegionTrans(RegionTrans):
 
         # Find all of the taskloops
         taskloops = []
-        for loop in node.walk(Loop):
-            if loop.walk(OtterTaskNode):
+        for loop in node.iter_walk(Loop):
+            if loop.first_of(OtterTaskNode) is not None:
                 taskloops.append(loop)
         # Get the positions of all of the taskloops
         taskloop_positions = [-1] * len(taskloops)
         # Get the forward_dependence position of all of the taskloops
         dependence_position = [None] * len(taskloops)
         dependence_node = [None] * len(taskloops)
+        analysis = OtterSynchroniseRegionTrans.create_analysis(node)
         for i, taskloop in enumerate(taskloops):
             taskloop_positions[i] = taskloop.abs_position
             forward_dep = OtterSynchroniseRegionTrans.get_forward_dependence(
-                        taskloop, node)
+                        taskloop, node, analysis)
                 # If the forward_dependence is one of our parents then we
                 # should ignore it
             if (forward_dep is not None and
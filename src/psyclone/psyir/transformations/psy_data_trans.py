@@ -153,7 +153,7 @@ class PSyDataTrans(RegionTrans):
         region_name = invoke.name
         kerns = []
         for node in nodes:
-            kerns.extend(node.walk(Kern))
+            kerns.extend(node.iter_walk(Kern))
 
         if len(kerns) == 1:
             # This PSyData region only has one kernel within it,
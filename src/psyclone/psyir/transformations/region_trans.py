@@ -167,9 +167,9 @@ class RegionTrans(Transformation):
             for child in node_list:
                 # Stop at any instance of Kern to avoid going into the
                 # actual kernels, e.g. in Nemo inlined kernels
-                flat_list = [item for item in child.walk(object, Kern)
-                             if not isinstance(item, Schedule)]
-                for item in flat_list:
+                for item in child.iter_walk(object, Kern):
+                    if isinstance(item, Schedule):
+                        continue
                     if isinstance(item, self.excluded_node_types):
                         raise TransformationError(
                             f"Nodes of type '{type(item).__name__}' cannot be "
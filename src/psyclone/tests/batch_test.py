@@ -0,0 +1,234 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''
+A module to perform pytest tests on the code in the batch.py file, which
+provides the driver for the psyclone-batch tool.
+'''
+
+import os
+import pytest
+
+from psyclone.batch import output_filenames, reset_state, run
+from psyclone.configuration import Config
+from psyclone.core import SymbolicMaths
+from psyclone.profiler import Profiler
+
+
+BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "test_files")
+NEMO_BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "nemo", "test_files")
+DYN03_BASE_PATH = os.path.join(BASE_PATH, "dynamo0p3")
+
+
+def teardown_function():
+    '''Make sure that we wipe the Config object and the profiling options
+    so that subsequent tests get fresh/default ones.
+
+    '''
+    Config._instance = None
+    Profiler.set_options(None)
+
+
+def test_reset_state():
+    '''Check that reset_state() installs a copy of the supplied
+    configuration and resets the other global state.
+
+    '''
+    config = Config.get()
+    default_naming = config.kernel_naming
+    reset_state(config, ["invokes"])
+    assert Config.get() is not config
+    assert Config.get().api == config.api
+    assert Profiler.profile_invokes()
+    # Changes to the active configuration must not affect the pristine one.
+    Config.get().kernel_naming = "single"
+    symbolic = SymbolicMaths.get()
+    reset_state(config, None)
+    assert Config.get().kernel_naming == default_naming
+    assert not Profiler.profile_invokes()
+    assert SymbolicMaths.get() is not symbolic
+
+
+def test_output_filenames():
+    '''Check the names of the files to which the generated code is
+    written.
+
+    '''
+    assert (output_filenames("/a/b/my_file.F90", "nemo", "out") ==
+            (None, os.path.join("out", "my_file.F90")))
+    assert (output_filenames("/a/b/my_alg.x90", "dynamo0.3", "out") ==
+            (os.path.join("out", "my_alg_alg.f90"),
+             os.path.join("out", "my_alg_psy.f90")))
+
+
+def test_run_nemo(capsys, tmpdir):
+    '''Check that psyclone-batch processes all of the supplied NEMO files
+    and reports the time taken for each.
+
+    '''
+    files = [os.path.join(NEMO_BASE_PATH, "explicit_do.f90"),
+             os.path.join(NEMO_BASE_PATH, "code_block.f90")]
+    run(["-api", "nemo", "-o", str(tmpdir)] + files)
+    output, _ = capsys.readouterr()
+    for fname in files:
+        assert f"Processed '{fname}' in " in output
+        assert os.path.isfile(os.path.join(str(tmpdir),
+                                           os.path.basename(fname)))
+    assert "Processed 2 of 2 file(s) in " in output
+
+
+def test_run_dynamo(capsys, tmpdir):
+    '''Check that psyclone-batch writes both the algorithm and PSy layers
+    for an API that has an algorithm layer and that the optimisation
+    script is applied to every file.
+
+    '''
+    files = [os.path.join(DYN03_BASE_PATH, "1_single_invoke.f90"),
+             os.path.join(DYN03_BASE_PATH, "1.0.1_single_named_invoke.f90")]
+    script = os.path.join(DYN03_BASE_PATH, "null_trans.py")
+    run(["-api", "dynamo0.3", "-s", script, "-o", str(tmpdir)] + files)
+    output, _ = capsys.readouterr()
+    assert "Processed 2 of 2 file(s) in " in output
+    for fname in ["1_single_invoke", "1.0.1_single_named_invoke"]:
+        assert os.path.isfile(os.path.join(str(tmpdir), fname+"_alg.f90"))
+        assert os.path.isfile(os.path.join(str(tmpdir), fname+"_psy.f90"))
+
+
+def test_run_failures(capsys, tmpdir):
+    '''Check that a failure on one file is reported and does not prevent
+    subsequent files from being processed (unless -x is specified).
+
+    '''
+    good_file = os.path.join(NEMO_BASE_PATH, "explicit_do.f90")
+    bad_file = os.path.join(NEMO_BASE_PATH, "missing.f90")
+    with pytest.raises(SystemExit) as err:
+        run(["-api", "nemo", "-o", str(tmpdir), bad_file, good_file])
+    assert str(err.value) == "1"
+    output, error = capsys.readouterr()
+    assert f"PSyclone failed on '{bad_file}'" in error
+    assert f"File '{bad_file}' not found" in error
+    assert f"Processed '{good_file}' in " in output
+    assert "Processed 1 of 2 file(s) in " in output
+    assert f"PSyclone failed on the following file(s): ['{bad_file}']" in error
+
+    with pytest.raises(SystemExit):
+        run(["-x", "-api", "nemo", "-o", str(tmpdir), bad_file, good_file])
+    output, _ = capsys.readouterr()
+    assert f"Processed '{good_file}'" not in output
+    assert "Processed 0 of 2 file(s) in " in output
+
+
+def test_run_no_overwrite(capsys):
+    '''Check that psyclone-batch refuses to overwrite the source file.'''
+    fname = os.path.join(NEMO_BASE_PATH, "explicit_do.f90")
+    with pytest.raises(SystemExit):
+        run(["-api", "nemo", "-o", NEMO_BASE_PATH, fname])
+    _, error = capsys.readouterr()
+    assert f"Refusing to overwrite the source file '{fname}'" in error
+
+
+def test_run_invalid_args(capsys, tmpdir):
+    '''Check the errors raised for invalid output directories and API.'''
+    fname = os.path.join(NEMO_BASE_PATH, "explicit_do.f90")
+    missing = os.path.join(str(tmpdir), "missing")
+    with pytest.raises(SystemExit):
+        run(["-api", "nemo", "-o", missing, fname])
+    _, error = capsys.readouterr()
+    assert (f"Specified output directory ({missing}) for '-o' does not "
+            f"exist." in error)
+    with pytest.raises(SystemExit):
+        run(["-api", "nemo", "-o", str(tmpdir), "-okern", missing, fname])
+    _, error = capsys.readouterr()
+    assert (f"Specified output directory ({missing}) for '-okern' does not "
+            f"exist." in error)
+    with pytest.raises(SystemExit):
+        run(["-api", "invalid", "-o", str(tmpdir), fname])
+    _, error = capsys.readouterr()
+    assert "Unsupported API 'invalid' specified." in error
+
+
+def test_run_parallel(capsys, tmpdir):
+    '''Check that files processed by a pool of workers are reported in the
+    order in which they were supplied and that failures are captured.
+
+    '''
+    files = [os.path.join(NEMO_BASE_PATH, "explicit_do.f90"),
+             os.path.join(NEMO_BASE_PATH, "missing.f90"),
+             os.path.join(NEMO_BASE_PATH, "code_block.f90")]
+    with pytest.raises(SystemExit):
+        run(["-j", "2", "-api", "nemo", "-o", str(tmpdir)] + files)
+    output, error = capsys.readouterr()
+    assert output.index(f"Processed '{files[0]}'") < output.index(
+        f"Processed '{files[2]}'")
+    assert f"File '{files[1]}' not found" in error
+    assert "Processed 2 of 3 file(s) in " in output
+    for fname in [files[0], files[2]]:
+        assert os.path.isfile(os.path.join(str(tmpdir),
+                                           os.path.basename(fname)))
+
+
+def test_run_invalid_jobs(capsys, tmpdir):
+    '''Check that an invalid number of jobs is rejected.'''
+    fname = os.path.join(NEMO_BASE_PATH, "explicit_do.f90")
+    with pytest.raises(SystemExit):
+        run(["-j", "0", "-api", "nemo", "-o", str(tmpdir), fname])
+    _, error = capsys.readouterr()
+    assert "The number of jobs must be at least 1 but got 0." in error
+
+
+def test_run_kernel_cache(capsys, tmpdir):
+    '''Check that the kernel cache is shared by all of the files and that
+    it can be cleared.
+
+    '''
+    files = [os.path.join(DYN03_BASE_PATH, "1_single_invoke.f90"),
+             os.path.join(DYN03_BASE_PATH, "1.0.1_single_named_invoke.f90")]
+    cache_dir = tmpdir.mkdir("cache")
+    out_dir = tmpdir.mkdir("out")
+    cache_dir.join("metadata_stale.pkl").write("")
+    run(["-api", "dynamo0.3", "-o", str(out_dir), "--kernel-cache",
+         str(cache_dir), "--clear-kernel-cache"] + files)
+    output, _ = capsys.readouterr()
+    assert "Processed 2 of 2 file(s) in " in output
+    # Both algorithms call the same kernel.
+    assert len(cache_dir.listdir()) == 1
+    assert not cache_dir.join("metadata_stale.pkl").exists()
+    with pytest.raises(SystemExit):
+        run(["-api", "dynamo0.3", "-o", str(out_dir),
+             "--clear-kernel-cache"] + files)
+    _, error = capsys.readouterr()
+    assert ("The --clear-kernel-cache option requires the cache directory "
+            "to be specified with --kernel-cache." in error)
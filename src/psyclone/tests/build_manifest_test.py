@@ -0,0 +1,102 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+
+'''
+A module to perform pytest tests on the code in the build_manifest.py file.
+'''
+
+import json
+
+from psyclone import build_manifest
+from psyclone.build_manifest import BuildManifest
+
+
+def test_file_hash(tmpdir):
+    '''Check that the hash of a file depends on its content and that it is
+    None for a missing file.
+
+    '''
+    afile = tmpdir.join("a.txt")
+    afile.write("abc")
+    digest = BuildManifest.file_hash(str(afile))
+    assert digest == BuildManifest.file_hash(str(afile))
+    afile.write("abd")
+    assert BuildManifest.file_hash(str(afile)) != digest
+    assert BuildManifest.file_hash(str(tmpdir.join("missing"))) is None
+
+
+def test_manifest_record(tmpdir, monkeypatch):
+    '''Check that a recorded manifest is up to date with respect to the
+    same options and files and the reasons reported when it is not.
+
+    '''
+    infile = tmpdir.join("in.f90")
+    infile.write("program a\nend program a\n")
+    outfile = tmpdir.join("out.f90")
+    outfile.write("")
+    filename = str(tmpdir.join("manifest"))
+    manifest = BuildManifest(filename)
+    assert manifest.filename == filename
+    options = {"api": "nemo", "include": ("a", "b")}
+    manifest.record(options, [str(infile)], [str(outfile)])
+    assert manifest.reasons_to_rebuild(options) == []
+    assert tmpdir.listdir(lambda path: path.ext == ".tmp") == []
+    assert (manifest.reasons_to_rebuild({"api": "nemo"}) ==
+            ["the options have changed (include)"])
+    monkeypatch.setattr(build_manifest, "__VERSION__", "0.0.0")
+    reasons = manifest.reasons_to_rebuild(options)
+    assert len(reasons) == 1
+    assert "the PSyclone version has changed (from " in reasons[0]
+    monkeypatch.undo()
+    infile.write("")
+    assert (manifest.reasons_to_rebuild(options) ==
+            [f"the input file '{infile}' has changed"])
+
+
+def test_manifest_invalid(tmpdir):
+    '''Check that a missing or invalid manifest file results in the code
+    being generated.
+
+    '''
+    filename = str(tmpdir.join("manifest"))
+    manifest = BuildManifest(filename)
+    expected = [f"there is no valid manifest '{filename}'"]
+    assert manifest.reasons_to_rebuild({}) == expected
+    with open(filename, "w") as mfile:
+        mfile.write("not json")
+    assert manifest.reasons_to_rebuild({}) == expected
+    with open(filename, "w") as mfile:
+        json.dump({"version": "1"}, mfile)
+    assert manifest.reasons_to_rebuild({}) == expected
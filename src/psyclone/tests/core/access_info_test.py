@@ -166,6 +166,65 @@ def test_variable_access_info():
     assert vai.all_write_accesses == [vai[0], vai[2]]
 
 
+# -----------------------------------------------------------------------------
+def test_variable_access_info_stored_accesses():
+    '''Test that the AccessInfo objects of a SingleVariableAccessInfo are
+    only created when requested, and that they read from (and write to) the
+    data stored in the SingleVariableAccessInfo.
+
+    '''
+    # pylint: disable=protected-access
+    vai = SingleVariableAccessInfo(Signature(("a", "b")))
+    node1 = Node()
+    node2 = Node()
+    vai.add_access_with_location(AccessType.READ, 1, node1, None)
+    indices = ComponentIndices([[], [node1]])
+    vai.add_access_with_location(AccessType.WRITE, 2, node2, indices)
+    # No AccessInfo or (for the scalar access) ComponentIndices instances
+    # have been created yet:
+    assert vai._access_infos == []
+    assert vai._indices == [None, indices]
+    assert str(vai) == "a%b:READ(1),WRITE(2)"
+
+    access = vai[0]
+    assert isinstance(access, AccessInfo)
+    assert vai._access_infos == [access, None]
+    assert vai[0] is access
+    assert vai[-2] is access
+    assert vai[:] == [access, vai[1]]
+    assert vai.all_accesses == [access, vai[1]]
+    with pytest.raises(IndexError) as err:
+        _ = vai[2]
+    assert "Access index 2 is out of range for variable 'a%b'" \
+        in str(err.value)
+
+    assert str(access) == "READ(1)"
+    assert access.node is node1
+    assert access.location == 1
+    # The indices of a scalar access have one entry per component
+    assert access.component_indices.indices_lists == [[], []]
+    assert access.component_indices is access.component_indices
+    assert not access.is_array()
+    assert vai[1].component_indices is indices
+    assert vai[1].is_array()
+
+    # Changes to an access are stored in the SingleVariableAccessInfo
+    access.change_read_to_write()
+    assert vai.is_written()
+    assert not vai.is_read()
+    with pytest.raises(InternalError) as err:
+        access.change_read_to_write()
+    assert ("Trying to change variable to 'WRITE' which does not have "
+            "'READ' access." in str(err.value))
+    new_indices = ComponentIndices([[node2], []])
+    access.component_indices = new_indices
+    assert vai._indices[0] is new_indices
+    with pytest.raises(InternalError) as err:
+        access.component_indices = 123
+    assert "must be an instance of ComponentIndices, got '123'" \
+        in str(err.value)
+
+
 # -----------------------------------------------------------------------------
 def test_variable_access_info_is_array():
     '''Test that the SingleVariableAccesInfo class handles arrays as expected.
@@ -442,6 +501,11 @@ def test_variables_access_info_merge():
     assert e_accesses[0].access_type == AccessType.WRITE
     assert c_accesses[0].location == e_accesses[0].location
 
+    # The accesses are copied without creating any AccessInfo instances
+    # pylint: disable=protected-access
+    assert all(var_info._access_infos == []
+               for var_info in var_accesses2.values())
+
     # Test that the g=h part has a higher location than the
     # c=d data. This makes sure that merge() increases the
     # location number of accesses when merging.
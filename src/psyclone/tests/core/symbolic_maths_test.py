@@ -43,7 +43,10 @@ import pytest
 from sympy import solvers, Symbol
 
 from psyclone.core import SymbolicMaths
+from psyclone.psyir.backend.sympy_builder import SymPyBuilder
 from psyclone.psyir.backend.sympy_writer import SymPyWriter
+from psyclone.psyir.nodes import Literal
+from psyclone.psyir.symbols import DataSymbol, INTEGER_TYPE, SymbolTable
 
 
 def test_sym_maths_get():
@@ -320,6 +323,8 @@ def test_solve_equal_for_error(monkeypatch):
     '''Test that an unexpected SymPy result type raises the expected error. '''
 
     sym_maths = SymbolicMaths.get()
+    # Make sure that the result is not taken from the cache
+    sym_maths.clear_cache()
     # Monkeypatch SymPy's solveset to return a plain Python integer:
     monkeypatch.setattr(solvers, "solveset", lambda _x, _y: 1)
     x_sym = Symbol("X")
@@ -328,6 +333,104 @@ def test_solve_equal_for_error(monkeypatch):
     assert "Unexpected solution '1'' of type '<class 'int'>'" in str(err.value)
 
 
+def test_symbolic_maths_cache(fortran_reader):
+    '''Test that the results of comparing expressions and of solving
+    equations are cached, and that the type of each name (scalar or array)
+    is taken into account.
+
+    '''
+    source = '''program test_prog
+                integer :: i, j, x
+                integer :: a(10)
+                x = i + 1
+                x = 1 + i
+                x = a(i)
+                x = a(i + 1)
+                end program test_prog
+                '''
+    psyir = fortran_reader.psyir_from_source(source)
+    schedule = psyir.children[0]
+    sym_maths = SymbolicMaths.get()
+    sym_maths.clear_cache()
+    assert sym_maths.cache_info()["subtract"].currsize == 0
+
+    assert sym_maths.equal(schedule[0].rhs, schedule[1].rhs)
+    info = sym_maths.cache_info()["subtract"]
+    assert (info.hits, info.misses) == (0, 1)
+    # The same comparison (of different nodes) is found in the cache
+    assert sym_maths.equal(schedule[0].rhs.copy(), schedule[1].rhs.copy())
+    assert sym_maths.never_equal(schedule[2].rhs, schedule[3].rhs) is False
+    info = sym_maths.cache_info()["subtract"]
+    assert (info.hits, info.misses) == (1, 2)
+
+    # An array and a scalar with the same name result in different
+    # entries in the cache
+    scalar_table = SymbolTable()
+    scalar_table.new_symbol("a", symbol_type=DataSymbol,
+                            datatype=INTEGER_TYPE)
+    scalar_table.new_symbol("i", symbol_type=DataSymbol,
+                            datatype=INTEGER_TYPE)
+    scalar = fortran_reader.psyir_from_expression("a", scalar_table)
+    array = schedule[2].rhs
+    assert sym_maths.equal(scalar, scalar.copy())
+    assert sym_maths.equal(array, array.copy())
+    info = sym_maths.cache_info()["subtract"]
+    assert (info.hits, info.misses) == (1, 4)
+
+    # The solutions of an equation are cached, but a copy is returned
+    i_sym = Symbol("i")
+    solution = sym_maths.solve_equal_for(i_sym + 1, 2 * i_sym, i_sym)
+    assert solution == {1}
+    solution.add(2)
+    assert sym_maths.solve_equal_for(i_sym + 1, 2 * i_sym, i_sym) == {1}
+    info = sym_maths.cache_info()["solve_equal_for"]
+    assert (info.hits, info.misses) == (1, 1)
+
+    sym_maths.clear_cache()
+    assert sym_maths.cache_info()["subtract"].currsize == 0
+    assert sym_maths.cache_info()["solve_equal_for"].currsize == 0
+
+
+def test_symbolic_maths_cache_no_sympy(fortran_reader, monkeypatch):
+    '''Test that no SymPy expressions are created when the result of a
+    comparison is found in the cache, that the cache is not affected by
+    later changes to the expressions and that renaming a symbol results
+    in a new entry.
+
+    '''
+    source = '''program test_prog
+                integer :: i, j, x
+                x = i + j
+                x = j + i
+                end program test_prog
+                '''
+    psyir = fortran_reader.psyir_from_source(source)
+    schedule = psyir.children[0]
+    sym_maths = SymbolicMaths.get()
+    sym_maths.clear_cache()
+    lhs = schedule[0].rhs
+    rhs = schedule[1].rhs
+    assert sym_maths.equal(lhs, rhs)
+    monkeypatch.setattr(SymPyBuilder, "convert_to_sympy_expressions", None)
+    assert sym_maths.equal(lhs, rhs)
+    assert sym_maths.equal(lhs.copy(), rhs.copy())
+    info = sym_maths.cache_info()["subtract"]
+    assert (info.hits, info.misses) == (2, 1)
+    monkeypatch.undo()
+    # Changing an expression does not change the cached entry
+    lhs.children[1].replace_with(Literal("1", INTEGER_TYPE))
+    assert not sym_maths.equal(lhs, rhs)
+    info = sym_maths.cache_info()["subtract"]
+    assert (info.hits, info.misses) == (2, 2)
+    # A renamed symbol is not found in the cache
+    schedule.symbol_table.rename_symbol(schedule.symbol_table.lookup("i"),
+                                        "k")
+    assert not sym_maths.equal(lhs, rhs)
+    info = sym_maths.cache_info()["subtract"]
+    assert (info.hits, info.misses) == (2, 3)
+    sym_maths.clear_cache()
+
+
 @pytest.mark.parametrize("expressions", [("max(3, 2, 1)", "max(1, 2, 3)"),
                                          ("max(1, 3)", "3"),
                                          ("max(1, 3)", "max(1, 2, 3)"),
@@ -42,10 +42,11 @@ import pytest
 from psyclone.configuration import Config
 from psyclone.core.access_info import AccessType
 from psyclone.dynamo0p3 import (
-    DynLoop, DynHaloExchange, HaloDepth, _create_depth_list)
+    DynLoop, DynHaloExchange, DynKern, HaloDepth, LFRicHaloAnalysis,
+    _create_depth_list)
 from psyclone.errors import InternalError
 from psyclone.parse.algorithm import parse
-from psyclone.psyGen import PSyFactory, GenerationError
+from psyclone.psyGen import PSyFactory, GenerationError, InvokeSchedule
 from psyclone.tests.lfric_build import LFRicBuild
 from psyclone.transformations import (
     Dynamo0p3RedundantComputationTrans, Dynamo0p3AsyncHaloExchangeTrans)
@@ -658,3 +659,134 @@ def test_stencil_then_w3_read(tmpdir):
             "      END IF" in result)
 
     assert LFRicBuild(tmpdir).code_compiles(psy)
+
+
+def test_halo_analysis(monkeypatch):
+    '''Check that the LFRicHaloAnalysis class provides the same arguments
+    as the dependence search of the schedule, that it keeps track of
+    the halo exchanges that are added and removed and that it finds the
+    accesses of a node without searching the accesses to a field.
+
+    '''
+    _, info = parse(os.path.join(BASE_PATH,
+                                 "4.5.2_multikernel_invokes.f90"),
+                    api=API)
+    psy = PSyFactory(API, distributed_memory=True).create(info)
+    schedule = psy.invokes.invoke_list[0].schedule
+    assert schedule.halo_analysis is None
+    analysis = LFRicHaloAnalysis(schedule)
+    # The analysis is not in use, so the arguments use the dependence
+    # search of the schedule.
+    for node in schedule.walk((DynKern, DynHaloExchange)):
+        for arg in node.args:
+            assert ([id(pair[1]) for pair in analysis.following(arg)] ==
+                    [id(pair[1]) for pair in arg._following_arguments()])
+            assert ([id(pair[1]) for pair in analysis.preceding(arg)] ==
+                    [id(pair[1]) for pair in arg._preceding_arguments()])
+
+    hex_f1 = schedule[7]
+    loop = schedule[8]
+    f1_arg = loop.loop_body[0].args[1]
+    assert analysis.preceding(f1_arg)[0][0] is hex_f1
+    hex_f1.detach()
+    analysis.remove_halo_exchange(hex_f1)
+    assert analysis.following(hex_f1.field) is None
+    assert analysis.preceding(hex_f1.field) is None
+    assert analysis.preceding(f1_arg)[0][0] is schedule[6].loop_body[0]
+    schedule.children.insert(7, hex_f1)
+    analysis.add_halo_exchange(hex_f1, loop)
+    assert analysis.preceding(f1_arg)[0][0] is hex_f1
+    assert analysis.following(hex_f1.field)[0][1] is f1_arg
+
+    with pytest.raises(InternalError) as info:
+        analysis.add_halo_exchange(hex_f1, schedule[9])
+    assert ("The field 'f1' of a new halo exchange is not accessed within "
+            "the loop that follows it." in str(info.value))
+
+    # Removing an unknown halo exchange does nothing.
+    hex_copy = hex_f1.copy()
+    analysis.remove_halo_exchange(hex_copy)
+    assert analysis.preceding(f1_arg)[0][0] is hex_f1
+
+    # Once the positions of the nodes are known, the accesses are not
+    # searched to find the node of an argument.
+    monkeypatch.setattr(analysis, "_accesses",
+                        {"f1": Unsearchable(analysis._accesses["f1"])})
+    assert analysis.preceding(f1_arg)[0][0] is hex_f1
+    assert analysis.following(hex_f1.field)[0][1] is f1_arg
+    assert analysis._find(f1_arg)[1:] == (4, 4)
+
+
+class Unsearchable(list):
+    '''A list of accesses that fails if it is iterated over.'''
+    def __iter__(self):
+        raise AssertionError("the accesses were searched")
+
+
+def test_place_halo_exchanges(monkeypatch):
+    '''Check that the halo exchanges placed with the halo analysis of the
+    schedule are the same as the ones placed with the dependence search
+    of the schedule, that the arguments of the schedule are only
+    collected once for each placement and that the analysis is only in
+    use while the halo exchanges are placed.
+
+    '''
+    rtrans = Dynamo0p3RedundantComputationTrans()
+    schedules = []
+    for use_analysis in [True, False]:
+        _, info = parse(os.path.join(BASE_PATH,
+                                     "4.5.2_multikernel_invokes.f90"),
+                        api=API)
+        psy = PSyFactory(API, distributed_memory=True).create(info)
+        schedule = psy.invokes.invoke_list[0].schedule
+        if not use_analysis:
+            monkeypatch.setattr(LFRicHaloAnalysis, "_find",
+                                lambda self, argument: None)
+        for loop in schedule.walk(DynLoop):
+            rtrans.apply(loop, {"depth": 2})
+        schedules.append(schedule.view(colour=False))
+    assert schedules[0] == schedules[1]
+    assert "HaloExchange[field='f1', type='region', depth=2" in schedules[0]
+    monkeypatch.undo()
+
+    # A session keeps one analysis in use for a sequence of
+    # transformations.
+    _, info = parse(os.path.join(BASE_PATH,
+                                 "4.5.2_multikernel_invokes.f90"),
+                    api=API)
+    psy = PSyFactory(API, distributed_memory=True).create(info)
+    session_schedule = psy.invokes.invoke_list[0].schedule
+    calls = []
+    argument_index = InvokeSchedule._argument_index
+    monkeypatch.setattr(
+        InvokeSchedule, "_argument_index",
+        lambda self: calls.append(self) or argument_index(self))
+    with session_schedule.halo_analysis_session() as analysis:
+        assert session_schedule.halo_analysis is analysis
+        with session_schedule.halo_analysis_session() as nested:
+            assert nested is analysis
+        for loop in session_schedule.walk(DynLoop):
+            rtrans.apply(loop, {"depth": 2})
+    assert calls == [session_schedule]
+    assert session_schedule.halo_analysis is None
+    assert session_schedule.view(colour=False) == schedules[0]
+    monkeypatch.undo()
+
+    calls = []
+    monkeypatch.setattr(
+        InvokeSchedule, "_argument_index",
+        lambda self: calls.append(self) or argument_index(self))
+    loop = schedule.walk(DynLoop)[0]
+    schedule.place_halo_exchanges(schedule.walk(DynLoop), update=True)
+    assert calls == [schedule]
+    assert schedule.view(colour=False) == schedules[0]
+
+    # The analysis is discarded if the placement fails.
+    def fail():
+        assert isinstance(schedule.halo_analysis, LFRicHaloAnalysis)
+        raise GenerationError("placement failed")
+    monkeypatch.setattr(loop, "unique_fields_with_halo_reads", fail)
+    with pytest.raises(GenerationError) as info:
+        loop.create_halo_exchanges()
+    assert "placement failed" in str(info.value)
+    assert schedule.halo_analysis is None
@@ -45,8 +45,10 @@ functions.
 
 from __future__ import absolute_import
 import io
+import json
 import os
 import re
+import shutil
 import stat
 from sys import modules
 import pytest
@@ -56,6 +58,7 @@ from psyclone.configuration import Config
 from psyclone.domain.lfric import LFRicConstants
 from psyclone.errors import GenerationError
 from psyclone.generator import generate, main, write_unicode_file
+from psyclone.nemo import NemoPSy
 from psyclone.parse.algorithm import parse
 from psyclone.parse.utils import ParseError
 from psyclone.profiler import Profiler
@@ -1001,6 +1004,159 @@ def test_main_include_path(capsys):
     assert str(inc_path2) in Config.get().include_paths
 
 
+def test_main_kernel_index_dir(capsys, tmpdir):
+    '''Test that the --kernel-index-dir option results in the index of each
+    kernel search path being stored in the specified directory.
+
+    '''
+    filename = os.path.join(DYN03_BASE_PATH, "1_single_invoke.f90")
+    fake_path = tmpdir.join('does_not_exist')
+    with pytest.raises(SystemExit) as err:
+        main([filename, "-api", "dynamo0.3", "-d", DYN03_BASE_PATH,
+              "--kernel-index-dir", fake_path.strpath])
+    assert str(err.value) == "1"
+    _, output = capsys.readouterr()
+    assert "does_not_exist' does not exist" in output
+    main([filename, "-api", "dynamo0.3", "-d", DYN03_BASE_PATH,
+          "--kernel-index-dir", str(tmpdir)])
+    assert Config.get().kernel_index_dir == str(tmpdir)
+    assert len(tmpdir.listdir()) == 1
+
+
+def test_main_kernel_cache(capsys, tmpdir):
+    '''Test that the --kernel-cache option results in the processed kernels
+    being cached in the specified directory and that --clear-kernel-cache
+    empties it.
+
+    '''
+    filename = os.path.join(DYN03_BASE_PATH, "1_single_invoke.f90")
+    fake_path = tmpdir.join('does_not_exist')
+    with pytest.raises(SystemExit) as err:
+        main([filename, "-api", "dynamo0.3", "--kernel-cache",
+              fake_path.strpath])
+    assert str(err.value) == "1"
+    _, output = capsys.readouterr()
+    assert "does_not_exist' does not exist" in output
+    with pytest.raises(SystemExit) as err:
+        main([filename, "-api", "dynamo0.3", "--clear-kernel-cache"])
+    assert str(err.value) == "1"
+    _, output = capsys.readouterr()
+    assert ("The --clear-kernel-cache option requires the cache directory "
+            "to be specified with --kernel-cache." in output)
+    cache_dir = tmpdir.mkdir("cache")
+    main([filename, "-api", "dynamo0.3", "--kernel-cache", str(cache_dir)])
+    assert Config.get().kernel_cache_dir == str(cache_dir)
+    assert len(cache_dir.listdir()) == 1
+    # Any existing entries are removed when the cache is cleared.
+    cache_dir.join("metadata_stale.pkl").write("")
+    main([filename, "-api", "dynamo0.3", "--kernel-cache", str(cache_dir),
+          "--clear-kernel-cache"])
+    assert len(cache_dir.listdir()) == 1
+    assert not cache_dir.join("metadata_stale.pkl").exists()
+
+
+def test_main_incremental(capsys, tmpdir):
+    '''Test that the --incremental option only results in code being
+    generated if the inputs, options or outputs have changed since the
+    manifest was recorded and that --explain reports why.
+
+    '''
+    shutil.copy(os.path.join(DYN03_BASE_PATH, "1_single_invoke.f90"),
+                str(tmpdir))
+    shutil.copy(os.path.join(DYN03_BASE_PATH, "testkern_mod.F90"),
+                str(tmpdir))
+    alg_file = str(tmpdir.join("1_single_invoke.f90"))
+    kern_file = str(tmpdir.join("testkern_mod.F90"))
+    manifest = str(tmpdir.join("alg.manifest"))
+    opsy = str(tmpdir.join("psy.f90"))
+    # Distributed memory is specified explicitly as its default depends on
+    # whether the configuration file has already been loaded.
+    args = [alg_file, "-api", "dynamo0.3", "-dm", "-oalg",
+            str(tmpdir.join("alg.f90")), "-opsy", opsy, "--incremental",
+            manifest, "--explain"]
+    main(args)
+    output, _ = capsys.readouterr()
+    assert f"Generating code for '{alg_file}' because:" in output
+    assert f"there is no valid manifest '{manifest}'" in output
+    main(args)
+    output, _ = capsys.readouterr()
+    assert (f"Not generating code for '{alg_file}' as it is up to date "
+            f"with respect to '{manifest}'." in output)
+    # Modify the kernel.
+    with open(kern_file, "a") as kfile:
+        kfile.write("! A comment\n")
+    main(args)
+    output, _ = capsys.readouterr()
+    assert f"the input file '{kern_file}' has changed" in output
+    # Change an option.
+    main(args + ["-nodm"])
+    output, _ = capsys.readouterr()
+    assert "the options have changed (dist_mem)" in output
+    # Remove an output.
+    os.remove(opsy)
+    main(args + ["-nodm"])
+    output, _ = capsys.readouterr()
+    assert (f"the output file '{opsy}' is missing or has been modified"
+            in output)
+    assert os.path.isfile(opsy)
+
+
+def test_main_incremental_kernels(capsys, tmpdir):
+    '''Test that transformed kernels are recorded as outputs in the
+    manifest.
+
+    '''
+    alg_file = os.path.join(DYN03_BASE_PATH, "1_single_invoke.f90")
+    script = tmpdir.join("modify.py")
+    script.write("def trans(psy):\n"
+                 "    for invoke in psy.invokes.invoke_list:\n"
+                 "        for kern in invoke.schedule.coded_kernels():\n"
+                 "            kern.modified = True\n"
+                 "    return psy\n")
+    kern_dir = tmpdir.mkdir("kernels")
+    manifest = str(tmpdir.join("alg.manifest"))
+    args = [alg_file, "-api", "dynamo0.3", "-dm", "-s", str(script),
+            "-okern", str(kern_dir), "-oalg", str(tmpdir.join("alg.f90")),
+            "-opsy", str(tmpdir.join("psy.f90")), "--incremental", manifest,
+            "--explain"]
+    main(args)
+    kernel = str(kern_dir.join("testkern_0_mod.f90"))
+    assert os.path.isfile(kernel)
+    with open(manifest, "r") as mfile:
+        content = json.load(mfile)
+    assert kernel in content["outputs"]
+    assert str(script) in content["inputs"]
+    capsys.readouterr()
+    os.remove(kernel)
+    main(args)
+    output, _ = capsys.readouterr()
+    assert (f"the output file '{kernel}' is missing or has been modified"
+            in output)
+
+
+def test_main_incremental_errors(capsys, tmpdir):
+    '''Test the errors raised for invalid uses of the --incremental and
+    --explain options.
+
+    '''
+    alg_file = os.path.join(DYN03_BASE_PATH, "1_single_invoke.f90")
+    with pytest.raises(SystemExit) as err:
+        main([alg_file, "-api", "dynamo0.3", "--explain"])
+    assert str(err.value) == "1"
+    _, output = capsys.readouterr()
+    assert ("The --explain option requires the incremental mode to be "
+            "enabled with --incremental." in output)
+    with pytest.raises(SystemExit) as err:
+        main([alg_file, "-api", "dynamo0.3", "-opsy",
+              str(tmpdir.join("psy.f90")), "--incremental",
+              str(tmpdir.join("alg.manifest"))])
+    assert str(err.value) == "1"
+    _, output = capsys.readouterr()
+    assert ("The --incremental option requires the generated code to be "
+            "written to file (with -opsy and, for APIs with an algorithm "
+            "layer, -oalg)." in output)
+
+
 def test_write_utf_file(tmpdir):
     '''Unit tests for the write_unicode_file utility routine.'''
 
@@ -1021,6 +1177,54 @@ def test_write_utf_file(tmpdir):
         content = infile.read()
     assert test_str in content
 
+    # Third with the string supplied in pieces
+    out_file3 = os.path.join(str(tmpdir), "out3.txt")
+    write_unicode_file(iter(["This is ", "in pieces"]), out_file3)
+    with open(out_file3, "r", encoding="utf-8") as infile:
+        assert infile.read() == "This is in pieces"
+
+    # The file is removed if the generation of the pieces fails
+    def broken_pieces():
+        yield "This is "
+        raise GenerationError("broken")
+    out_file4 = os.path.join(str(tmpdir), "out4.txt")
+    with pytest.raises(GenerationError):
+        write_unicode_file(broken_pieces(), out_file4)
+    assert not os.path.exists(out_file4)
+
+
+def test_main_psy_streamed(monkeypatch, capsys, tmpdir):
+    '''Test that the main function writes the PSy-layer code as it is
+    generated (see PSy.iter_gen) and that an error while the code is
+    being written is reported without leaving a partial file.
+
+    '''
+    test_file = os.path.join(NEMO_BASE_PATH, "explicit_do.f90")
+    _, expected = generate(test_file, api="nemo")
+    psy_file = os.path.join(str(tmpdir), "psy.f90")
+
+    def no_gen(_):
+        raise AssertionError("the code was not streamed")
+    monkeypatch.setattr(NemoPSy, "gen", property(no_gen))
+    main(["-api", "nemo", "-l", "off", "-opsy", psy_file, test_file])
+    with open(psy_file, "r", encoding="utf-8") as infile:
+        assert infile.read() == expected
+    main(["-api", "nemo", "-l", "off", test_file])
+    output, _ = capsys.readouterr()
+    assert expected in output
+
+    def broken_iter_gen(_):
+        yield "module broken\n"
+        raise GenerationError("the generation failed")
+    monkeypatch.setattr(NemoPSy, "iter_gen", broken_iter_gen)
+    os.remove(psy_file)
+    with pytest.raises(SystemExit) as err:
+        main(["-api", "nemo", "-opsy", psy_file, test_file])
+    assert err.value.code == 1
+    _, output = capsys.readouterr()
+    assert "the generation failed" in output
+    assert not os.path.exists(psy_file)
+
 
 def test_utf_char(tmpdir):
     '''Test that the generate method works OK when both the Algorithm and
@@ -0,0 +1,163 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+'''
+A module to perform pytest tests on the code in the kernel_cache.py file.
+'''
+
+import os
+import pytest
+
+from psyclone import kernel_cache
+from psyclone.configuration import Config
+from psyclone.generator import generate
+from psyclone.gocean1p0 import GOKernelSchedule
+from psyclone.kernel_cache import KernelCache
+from psyclone.parse import algorithm
+from psyclone.psyir.backend.fortran import FortranWriter
+from psyclone.tests.utilities import get_invoke
+
+
+BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "test_files")
+
+
+@pytest.fixture(name="cache_dir")
+def cache_dir_fixture(tmpdir, monkeypatch):
+    '''Enables the kernel cache, using a temporary directory.
+
+    :returns: the cache directory.
+    :rtype: str
+
+    '''
+    monkeypatch.setattr(Config.get(), "_kernel_cache_dir", str(tmpdir))
+    return str(tmpdir)
+
+
+def test_key(monkeypatch):
+    '''Check that the key of an entry depends on all of the supplied parts
+    (and on their boundaries) and on the PSyclone and fparser versions.
+
+    '''
+    key = KernelCache.key("some source", b"more")
+    assert key == KernelCache.key("some source", "more")
+    assert key != KernelCache.key("some source", "more ")
+    assert KernelCache.key("ab", "c") != KernelCache.key("a", "bc")
+    monkeypatch.setattr(kernel_cache, "_FPARSER_VERSION", "0.0.0")
+    fparser_key = KernelCache.key("some source", "more")
+    assert fparser_key != key
+    monkeypatch.setattr(kernel_cache, "__VERSION__", "0.0.0")
+    assert KernelCache.key("some source", "more") not in [key, fparser_key]
+    assert (KernelCache.source_hash(b"some source") ==
+            KernelCache.source_hash(b"some source"))
+    assert (KernelCache.source_hash(b"some source") !=
+            KernelCache.source_hash(b"some source "))
+
+
+def test_disabled(tmpdir):
+    '''Check that nothing is stored or retrieved when the cache is not in
+    use.
+
+    '''
+    assert not KernelCache.enabled()
+    KernelCache.store("psyir", "abc", [1, 2])
+    assert KernelCache.load("psyir", "abc") is None
+
+
+def test_store_load_clear(cache_dir):
+    '''Check that entries are stored and retrieved and that clear() only
+    removes cache entries.
+
+    '''
+    assert KernelCache.enabled()
+    assert KernelCache.load("psyir", "abc") is None
+    KernelCache.store("psyir", "abc", [1, 2])
+    KernelCache.store("metadata", "abc", {"a": 1})
+    assert KernelCache.load("psyir", "abc") == [1, 2]
+    assert KernelCache.load("metadata", "abc") == {"a": 1}
+    # An object that cannot be pickled is silently not stored (and no
+    # temporary file is left behind).
+    KernelCache.store("psyir", "def", lambda: 1)
+    assert KernelCache.load("psyir", "def") is None
+    assert len(os.listdir(cache_dir)) == 2
+    # A corrupt entry is treated as a miss.
+    with open(os.path.join(cache_dir, "psyir_abc.pkl"), "w") as cfile:
+        cfile.write("rubbish")
+    assert KernelCache.load("psyir", "abc") is None
+    with open(os.path.join(cache_dir, "keep.txt"), "w") as cfile:
+        cfile.write("")
+    assert KernelCache.clear(cache_dir) == 2
+    assert os.listdir(cache_dir) == ["keep.txt"]
+
+
+def test_cached_metadata(cache_dir, monkeypatch):
+    '''Check that the kernel metadata are retrieved from the cache when
+    code is generated for the second time and that the generated code
+    is unchanged.
+
+    '''
+    alg_file = os.path.join(BASE_PATH, "dynamo0p3", "1_single_invoke.f90")
+    alg, psy = generate(alg_file, api="dynamo0.3")
+    assert any(name.startswith("metadata_")
+               for name in os.listdir(cache_dir))
+    # Make sure that the kernel is not parsed again.
+    monkeypatch.setattr(algorithm, "get_kernel_parse_tree", None)
+    new_alg, new_psy = generate(alg_file, api="dynamo0.3")
+    assert str(new_alg) == str(alg)
+    assert str(new_psy) == str(psy)
+
+
+def test_cached_psyir(cache_dir):
+    '''Check that the PSyIR of a kernel is retrieved from the cache and
+    that it is of the API-specific type.
+
+    '''
+    _, invoke = get_invoke("single_invoke.f90", "gocean1.0", idx=0)
+    kernel = invoke.schedule.coded_kernels()[0]
+    schedule = kernel.get_kernel_schedule()
+    assert any(name.startswith("psyir_") for name in os.listdir(cache_dir))
+    _, invoke = get_invoke("single_invoke.f90", "gocean1.0", idx=0)
+    new_kernel = invoke.schedule.coded_kernels()[0]
+    # The entry is keyed on the hash of the kernel source.
+    assert new_kernel._source_hash is not None
+    # Make sure that the kernel code is neither regenerated from the
+    # fparser1 parse tree nor parsed again.
+    new_kernel._module_code = None
+    new_kernel._fp2_ast = "not parsed"
+    new_schedule = new_kernel.get_kernel_schedule()
+    assert new_schedule is not schedule
+    assert isinstance(new_schedule, GOKernelSchedule)
+    assert new_schedule.name == schedule.name
+    writer = FortranWriter()
+    assert writer(new_schedule.root) == writer(schedule.root)
@@ -10,9 +10,10 @@
 
 # imports
 from __future__ import absolute_import, print_function
+import io
 import os
 import pytest
-from psyclone.line_length import FortLineLength
+from psyclone.line_length import FortLineLength, find_break_point
 from psyclone.generator import generate
 
 # functions
@@ -112,6 +113,58 @@ def test_wrapped():
     assert output_file == EXPECTED_OUTPUT, "output and expected output differ "
 
 
+def test_write():
+    ''' Tests that the write method writes the same code as the process
+    method returns, whichever way the input is split into pieces '''
+    fll = FortLineLength(line_length=30)
+    pieces = [INPUT_FILE[:3], INPUT_FILE[3:40], "", INPUT_FILE[40:]]
+    output = io.StringIO()
+    fll.write(pieces, output)
+    assert output.getvalue() == EXPECTED_OUTPUT
+    output = io.StringIO()
+    fll.write([INPUT_FILE + "    stuff"], output)
+    assert output.getvalue() == fll.process(INPUT_FILE + "    stuff")
+    output = io.StringIO()
+    fll.write([], output)
+    assert output.getvalue() == ""
+
+
+def test_process_processes():
+    ''' Tests that the process method returns the same code when the
+    lines are wrapped by a pool of processes '''
+    fll = FortLineLength(line_length=30)
+    assert fll.process(INPUT_FILE, processes=3) == EXPECTED_OUTPUT
+    # More processes than lines
+    assert fll.process("    stuff", processes=2) == "    stuff"
+
+
+def test_line_type():
+    ''' Tests that lines are classed according to the first of the
+    types that they match, irrespective of case '''
+    fll = FortLineLength()
+    # pylint: disable=protected-access
+    assert fll._get_line_type("  call a(b)") == "statement"
+    assert fll._get_line_type("Integer :: i") == "statement"
+    assert fll._get_line_type(" !$omp parallel") == "openmp_directive"
+    assert fll._get_line_type("!$ACC kernels") == "openacc_directive"
+    assert fll._get_line_type("  ! call a(b)") == "comment"
+    assert fll._get_line_type("a = b") == "unknown"
+    assert fll._get_line_type("  ") == "unknown"
+
+
+def test_find_break_point_start():
+    ''' Tests that find_break_point only considers the part of the line
+    that starts at the supplied index '''
+    line = "a, b, c, d"
+    assert find_break_point(line, 8, [", "]) == 6
+    assert find_break_point(line, 8, [", "], start=2) == 6
+    # A break at the start itself is not allowed
+    with pytest.raises(Exception) as excinfo:
+        find_break_point(line, 8, [", "], start=4)
+    assert "No suitable break point found for line ', c,'" in \
+        str(excinfo.value)
+
+
 def test_wrapped_lower():
     ''' Tests that a lower case file whose lines are longer than the
     specified line length is wrapped appropriately by the
@@ -105,6 +105,27 @@ def test_explicit_do_sched():
     assert isinstance(loops[2].loop_body[0], nemo.NemoKern)
 
 
+def test_iter_gen(parser):
+    ''' Check that NemoPSy.iter_gen generates the same code as NemoPSy.gen
+    but in pieces. '''
+    code = ("module two_routines\n"
+            "contains\n"
+            "subroutine first(a)\n"
+            "  real :: a(10)\n"
+            "  a(:) = 0.0\n"
+            "end subroutine first\n"
+            "subroutine second(b)\n"
+            "  real :: b(10)\n"
+            "  b(:) = 1.0\n"
+            "end subroutine second\n"
+            "end module two_routines\n")
+    psy = PSyFactory(API, distributed_memory=False).create(
+        parser(FortranStringReader(code)))
+    pieces = list(psy.iter_gen())
+    assert len(pieces) > 1
+    assert "".join(pieces) == psy.gen
+
+
 def test_array_valued_function():
     ''' Check that we handle array notation used when there is no implicit
     loop. '''
@@ -49,9 +49,11 @@ from fparser.two import Fortran2003
 from psyclone.domain.lfric.lfric_builtins import BUILTIN_MAP as builtins
 from psyclone.domain.lfric.lfric_builtins import \
     BUILTIN_DEFINITIONS_FILE as fname
+from psyclone.configuration import Config, ConfigurationError
 from psyclone.parse.kernel import KernelType, get_kernel_metadata,\
     get_kernel_interface, KernelProcedure, Descriptor, \
-    BuiltInKernelTypeFactory, get_kernel_filepath, get_kernel_ast
+    BuiltInKernelTypeFactory, get_kernel_filepath, get_kernel_ast, \
+    KernelFileIndex
 from psyclone.parse.utils import ParseError
 from psyclone.errors import InternalError
 
@@ -255,6 +257,124 @@ def test_getkernelfilepath_caseinsensitive2(tmpdir):
     assert "tmp" in result
     assert "test_mod.f90" in result
 
+
+def test_kernelfileindex(tmpdir, monkeypatch):
+    '''Test that KernelFileIndex indexes the Fortran files below the
+    supplied path by (lower-cased) module name and that an index is reused
+    until the indices are cleared or it is found to be out of date when
+    it is revalidated.
+
+    '''
+    KernelFileIndex.clear()
+    os.mkdir(str(tmpdir.join("sub")))
+    for name in ["A_mod.F90", os.path.join("sub", "a_mod.f90"),
+                 os.path.join("sub", "b_mod.f90"), "c_mod.txt"]:
+        with open(str(tmpdir.join(name)), "w") as ffile:
+            ffile.write("")
+    root = str(tmpdir)
+    index = KernelFileIndex.get(root)
+    assert sorted(index.lookup("a_MOD")) == sorted(
+        [os.path.join(root, "A_mod.F90"),
+         os.path.join(root, "sub", "a_mod.f90")])
+    assert index.lookup("b_mod") == [os.path.join(root, "sub", "b_mod.f90")]
+    assert index.lookup("c_mod") == []
+    assert index.is_up_to_date()
+    # The same index is returned until the indices are cleared.
+    assert KernelFileIndex.get(root) is index
+    with open(str(tmpdir.join("sub", "d_mod.f90")), "w") as ffile:
+        ffile.write("")
+    assert not index.is_up_to_date()
+    # The index is not checked again until it is revalidated.
+    assert KernelFileIndex.get(root) is index
+    KernelFileIndex.revalidate()
+    new_index = KernelFileIndex.get(root)
+    assert new_index is not index
+    assert new_index.lookup("d_mod") == [
+        os.path.join(root, "sub", "d_mod.f90")]
+    # An index that is up to date is reused after revalidation without
+    # walking the tree again.
+    KernelFileIndex.revalidate()
+    monkeypatch.setattr(os, "walk", None)
+    assert KernelFileIndex.get(root) is new_index
+    monkeypatch.undo()
+    KernelFileIndex.clear()
+    assert KernelFileIndex.get(root) is not new_index
+
+
+def test_kernelfileindex_parse(monkeypatch):
+    '''Test that the index of a kernel search path is reused (and not
+    created afresh) for each algorithm file that is parsed.
+
+    '''
+    # pylint: disable=import-outside-toplevel
+    from psyclone.parse.algorithm import parse as parse_alg
+    KernelFileIndex.clear()
+    walked = []
+    walk = os.walk
+
+    def counting_walk(root):
+        walked.append(root)
+        return walk(root)
+    monkeypatch.setattr(os, "walk", counting_walk)
+    base_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             os.pardir, "test_files", "dynamo0p3")
+    for alg_file in ["1_single_invoke.f90", "4_multikernel_invokes.f90"]:
+        parse_alg(os.path.join(base_path, alg_file), api="dynamo0.3",
+                  kernel_paths=[base_path])
+    assert walked.count(os.path.abspath(base_path)) == 1
+
+
+def test_kernelfileindex_stored(tmpdir, monkeypatch):
+    '''Test that indices are stored in, and reused from, the kernel-index
+    directory and that a stored index is not used if the directory tree
+    has changed.
+
+    '''
+    KernelFileIndex.clear()
+    kernel_dir = tmpdir.mkdir("kernels")
+    index_dir = tmpdir.mkdir("index")
+    monkeypatch.setattr(Config.get(), "_kernel_index_dir", str(index_dir))
+    with open(str(kernel_dir.join("a_mod.f90")), "w") as ffile:
+        ffile.write("")
+    root = str(kernel_dir)
+    KernelFileIndex.get(root)
+    assert len(os.listdir(str(index_dir))) == 1
+    # Check that the stored index is used by making sure that the
+    # directory tree is not walked.
+    KernelFileIndex.clear()
+    monkeypatch.setattr(os, "walk", None)
+    index = KernelFileIndex.get(root)
+    assert index.lookup("a_mod") == [os.path.join(root, "a_mod.f90")]
+    monkeypatch.undo()
+    # Change the directory tree - the stored index must not be used.
+    monkeypatch.setattr(Config.get(), "_kernel_index_dir", str(index_dir))
+    with open(str(kernel_dir.join("b_mod.f90")), "w") as ffile:
+        ffile.write("")
+    KernelFileIndex.clear()
+    index = KernelFileIndex.get(root)
+    assert index.lookup("b_mod") == [os.path.join(root, "b_mod.f90")]
+    # A corrupt stored index is ignored.
+    index_file = os.path.join(str(index_dir), os.listdir(str(index_dir))[0])
+    with open(index_file, "w") as ffile:
+        ffile.write("not json")
+    KernelFileIndex.clear()
+    index = KernelFileIndex.get(root)
+    assert index.lookup("a_mod") == [os.path.join(root, "a_mod.f90")]
+
+
+def test_kernel_index_dir_config(tmpdir):
+    '''Test the setter for the kernel-index directory.'''
+    config = Config.get()
+    missing = str(tmpdir.join("missing"))
+    with pytest.raises(ConfigurationError) as err:
+        config.kernel_index_dir = missing
+    assert (f"Kernel-index directory '{missing}' does not exist"
+            in str(err.value))
+    config.kernel_index_dir = str(tmpdir)
+    assert config.kernel_index_dir == str(tmpdir)
+    config.kernel_index_dir = None
+    assert config.kernel_index_dir is None
+
 # function get_kernel_ast
 
 
@@ -1306,6 +1306,65 @@ def test_argument_find_read_arguments():
         assert result[idx] == loop.loop_body[0].arguments.args[3]
 
 
+def test_argument_index():
+    '''Check that the dependencies of arguments are found with the
+    argument index of the InvokeSchedule, which is reused until the tree
+    is modified or an argument is renamed, and that the results are the same as when examining all
+    preceding and following nodes.'''
+    _, invoke_info = parse(
+        os.path.join(BASE_PATH,
+                     "15.14.4_builtin_and_normal_kernel_invoke.f90"),
+        api="dynamo0.3")
+    psy = PSyFactory("dynamo0.3", distributed_memory=True).create(invoke_info)
+    schedule = psy.invokes.invoke_list[0].schedule
+    index = schedule._argument_index()
+    assert schedule._argument_index() is index
+    positions, node_arguments = index["m2"]
+    assert positions == sorted(positions)
+    assert all(arg.name == "m2" for _, arg in node_arguments)
+
+    nodes = schedule.walk((Kern, HaloExchange))
+    for node in nodes:
+        following = node.following()
+        preceding = node.preceding(reverse=True)
+        for arg in node.args:
+            assert arg.forward_dependence() is arg._find_argument(following)
+            assert (arg.backward_dependence() is
+                    arg._find_argument(preceding))
+            assert (arg.forward_read_dependencies() ==
+                    arg._find_read_arguments(following))
+            for ignore_halos in [False, True]:
+                assert (arg.forward_write_dependencies(ignore_halos) ==
+                        arg._find_write_arguments(following, ignore_halos))
+                assert (arg.backward_write_dependencies(ignore_halos) ==
+                        arg._find_write_arguments(preceding, ignore_halos))
+
+    # Modifying the tree discards the index
+    m2_read_arg = schedule.children[4].loop_body[0].arguments.args[4]
+    m2_halo_field = schedule.children[3].field
+    assert m2_read_arg.backward_dependence() is m2_halo_field
+    index = schedule._argument_index()
+    # Renaming an argument does not modify the tree but also discards it
+    m2_halo_field._name = "m2_renamed"
+    assert schedule._argument_index() is not index
+    assert "m2_renamed" in schedule._argument_index()
+    assert m2_read_arg.backward_dependence() is not m2_halo_field
+    m2_halo_field._name = "m2"
+    assert m2_read_arg.backward_dependence() is m2_halo_field
+    index = schedule._argument_index()
+    schedule.children[3].detach()
+    assert schedule._argument_index() is not index
+    assert m2_read_arg.backward_dependence() is not m2_halo_field
+
+    # An argument that is not in an InvokeSchedule still finds its
+    # dependencies by examining all nodes.
+    loop = schedule.children[3].detach()
+    assert loop.loop_body[0].arguments.args[4] is m2_read_arg
+    assert m2_read_arg.call.ancestor(InvokeSchedule) is None
+    assert m2_read_arg.backward_dependence() is None
+    assert m2_read_arg.forward_dependence() is None
+
+
 def test_globalsum_arg():
     ''' Check that the globalsum argument is defined as gh_readwrite and
     points to the GlobalSum node '''
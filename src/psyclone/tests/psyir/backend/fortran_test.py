@@ -1011,6 +1011,52 @@ def test_fw_container_4(fortran_writer):
         "end module test\n" in fortran_writer(container))
 
 
+def test_fw_iter_code(fortran_reader, fortran_writer):
+    '''Check that the iter_code method of the FortranWriter class yields
+    the same code as calling the writer, with the code of each routine of
+    a module as a separate piece.
+
+    '''
+    code = (
+        "module test\n"
+        "real :: c\n"
+        "contains\n"
+        "subroutine tmp()\n"
+        "  c = 1.0\n"
+        "end subroutine tmp\n"
+        "subroutine tmp2()\n"
+        "  c = 2.0\n"
+        "end subroutine tmp2\n"
+        "end module test\n"
+        "program prog\n"
+        "  use test\n"
+        "  call tmp()\n"
+        "end program prog\n")
+    psyir = fortran_reader.psyir_from_source(code)
+    module = psyir.children[0]
+    pieces = list(fortran_writer.iter_code(psyir))
+    assert "".join(pieces) == fortran_writer(psyir)
+    assert pieces[0].startswith("module test\n")
+    assert pieces[0].endswith("  contains\n")
+    assert pieces[1].startswith("  subroutine tmp()\n")
+    assert pieces[1].endswith("  end subroutine tmp\n")
+    assert pieces[2].startswith("  subroutine tmp2()\n")
+    assert pieces[3] == "\nend module test\n"
+    assert pieces[4] == fortran_writer(psyir.children[1])
+    assert len(pieces) == 5
+
+    # A comment before a module is a separate piece.
+    module.preceding_comment = "My module"
+    pieces = list(fortran_writer.iter_code(psyir))
+    assert pieces[0] == "! My module\n"
+    assert "".join(pieces) == fortran_writer(psyir)
+    # A module with an inline comment is a single piece.
+    module.inline_comment = "End of my module"
+    pieces = list(fortran_writer.iter_code(module))
+    assert pieces == [fortran_writer(module)]
+    assert pieces[0].endswith("end module test  ! End of my module\n")
+
+
 def test_fw_routine(fortran_reader, fortran_writer, monkeypatch, tmpdir):
     '''Check the FortranWriter class outputs correct code when a routine node
     is found. Also tests that an exception is raised if routine.name does not
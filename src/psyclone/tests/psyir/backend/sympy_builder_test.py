@@ -0,0 +1,212 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+''' Module containing py.test tests for the SymPy builder.'''
+
+import pytest
+from sympy import Eq, Function, Lt, Max, Mod, Symbol
+from sympy.parsing.sympy_parser import parse_expr
+
+from psyclone.psyir.backend.sympy_builder import SymPyBuilder
+from psyclone.psyir.backend.sympy_writer import SymPyWriter
+from psyclone.psyir.backend.visitor import VisitorError
+from psyclone.psyir.nodes import Call, Literal, Reference
+from psyclone.psyir.symbols import (BOOLEAN_TYPE, CHARACTER_TYPE, DataSymbol,
+                                    INTEGER_TYPE, RoutineSymbol)
+
+
+def test_sym_builder_constructor():
+    '''Test that the constructor accepts an optional dictionary.
+    '''
+    sympy_builder = SymPyBuilder({'some': 'symbol'})
+    assert sympy_builder._sympy_type_map['some'] == 'symbol'
+    # Also test that not specifying a type map as argument works:
+    sympy_builder = SymPyBuilder()
+    assert sympy_builder._sympy_type_map == {}
+
+
+def test_sym_builder_literals():
+    '''Test that booleans are converted to Python bools (like SymPy
+    does when parsing `True`), and that characters are rejected.
+    '''
+    sympy_builder = SymPyBuilder()
+    assert sympy_builder(Literal("true", BOOLEAN_TYPE)) is True
+    assert sympy_builder(Literal("false", BOOLEAN_TYPE)) is False
+
+    with pytest.raises(TypeError) as err:
+        sympy_builder(Literal("bla", CHARACTER_TYPE))
+    assert "SymPy cannot handle strings like 'bla'." in str(err.value)
+
+
+@pytest.mark.parametrize("expr", ["2", "123_4", "123_xx", "1.23D5",
+                                  "3.1415926535897932384626", "0.01E-3",
+                                  "i + 2 * j - 1", "-i ** 2 / j",
+                                  "f(i, j + 1) - f(j, i)",
+                                  "MAX(i, 1)", "MIN(1, 2, i)",
+                                  "MOD(i, 2)", "EXP(1.0)",
+                                  "SQRT(x) + CEILING(x)", "LBOUND(f, 1)",
+                                  "a%x", "b(i)%x", "a%x(i)", "b(j)%x(i)",
+                                  "b(i)%c(b_c)", "a_c + a%c(i)",
+                                  "b(b_c)%c(i)", "b(i)%c(j)%d",
+                                  "a_b_c + a_b_c_1 + a%b%c",
+                                  "my_func(i, j)"])
+def test_sym_builder_same_as_writer(fortran_reader, expr):
+    '''Test that the builder creates the same SymPy expressions and type
+    map as parsing the output of the SymPyWriter, including the renaming
+    of members.
+    '''
+    # A dummy program to easily create the PSyIR for the
+    # expressions we need. We just take the RHS of the assignments
+    source = f'''program test_prog
+                use my_mod
+                type(my_type) :: a, b(10)
+                integer :: i, j, a_c, b_c, a_b_c, a_b_c_1, f(10, 10)
+                real :: x
+                x = {expr}
+                end program test_prog '''
+
+    psyir = fortran_reader.psyir_from_source(source)
+    expr = psyir.children[0].children[0].rhs
+    assert (SymPyBuilder.get_sympy_expressions_and_symbol_map([expr]) ==
+            SymPyWriter.get_sympy_expressions_and_symbol_map([expr]))
+
+
+def test_sym_builder_structure_and_operators(fortran_reader):
+    '''Test that the structure of the PSyIR is preserved (which is not
+    the case when parsing a string containing `%`), and that relational
+    and logical operators are supported.
+    '''
+    source = '''program test_prog
+                use my_mod
+                type(my_type) :: a
+                integer :: i, j
+                logical :: l
+                i = 2 * a%b
+                l = i == j
+                l = i < j .and. .not. l
+                end program test_prog '''
+
+    psyir = fortran_reader.psyir_from_source(source)
+    exprs = [assign.rhs for assign in psyir.children[0].children]
+    sympy_list, type_map = \
+        SymPyBuilder.get_sympy_expressions_and_symbol_map(exprs)
+    i, j, lsym = type_map["i"], type_map["j"], type_map["l"]
+    assert sympy_list[0] == 2 * Mod(Symbol("a"), Symbol("a_b"))
+    assert sympy_list[0] != parse_expr("2*a%a_b", type_map)
+    assert sympy_list[1] == Eq(i, j)
+    assert sympy_list[2] == Lt(i, j) & ~lsym
+
+    # A function call is an unknown SymPy function:
+    call = Call.create(RoutineSymbol("my_func"),
+                       [Reference(DataSymbol("i", INTEGER_TYPE))])
+    assert (SymPyBuilder.convert_to_sympy_expressions([call]) ==
+            [Function("my_func")(i)])
+
+
+def test_sym_builder_type_map(fortran_reader):
+    '''Test that the type map is extended with the (renamed) members, and
+    that the convenience function `convert_to_sympy_expressions` works.
+    '''
+    source = '''program test_prog
+                use my_mod
+                type(my_type) :: a
+                integer :: i, j, a_b
+                i = MAX(a%b + a%c(1), a_b)
+                end program test_prog '''
+
+    psyir = fortran_reader.psyir_from_source(source)
+    expr = psyir.children[0].children[0].rhs
+    type_map = SymPyWriter.create_type_map([expr])
+    sympy_builder = SymPyBuilder(type_map)
+    result = sympy_builder(expr)
+    assert type_map == {"a": Symbol("a"), "a_b": Symbol("a_b"),
+                        "a_b_1": Symbol("a_b_1"), "a_c": Function("a_c")}
+    assert result == Max(Mod(Symbol("a"), Symbol("a_b_1")) +
+                         Mod(Symbol("a"), Function("a_c")(1)),
+                         Symbol("a_b"))
+    assert SymPyBuilder.convert_to_sympy_expressions([expr]) == [result]
+
+
+def test_sym_builder_codeblock(fortran_reader):
+    '''Test that the content of a CodeBlock is parsed by SymPy.
+    '''
+    source = '''program test_prog
+                use my_mod
+                integer :: i
+                i = a%get_size() + 1
+                i = (/ 1, 2 /)
+                end program test_prog '''
+
+    psyir = fortran_reader.psyir_from_source(source)
+    exp1 = psyir.children[0].children[0].rhs
+    exp2 = psyir.children[0].children[1].rhs
+    assert (SymPyBuilder.convert_to_sympy_expressions([exp1]) ==
+            [parse_expr("a%get_size() + 1")])
+    with pytest.raises(VisitorError) as err:
+        SymPyBuilder.convert_to_sympy_expressions([exp2])
+    assert "Visitor Error: Invalid SymPy expression" in str(err.value)
+
+
+def test_sym_builder_errors(fortran_reader):
+    '''Tests that unsupported PSyIR (array ranges and named arguments)
+    raises the expected VisitorError.
+    '''
+    source = '''program test_prog
+                real :: x, a(10), b(10)
+                x = a(:) * b(:)
+                x = SIZE(a, dim=1)
+                end program test_prog '''
+
+    psyir = fortran_reader.psyir_from_source(source)
+    exprs = [assign.rhs for assign in psyir.children[0].children]
+
+    with pytest.raises(VisitorError) as err:
+        SymPyBuilder.convert_to_sympy_expressions([exprs[0]])
+    assert ("Unsupported node 'Range' found: SymPy expressions can only be "
+            "created for Fortran expressions without array ranges."
+            in str(err.value))
+    with pytest.raises(VisitorError) as err:
+        SymPyBuilder.convert_to_sympy_expressions([exprs[1]])
+    assert ("Named arguments are not supported by SymPy, but found "
+            "'[None, 'dim']' in operation 'Operator.SIZE'." in str(err.value))
+
+    # The frontend creates a CodeBlock for a function call with named
+    # arguments, so create the Call explicitly:
+    call = Call.create(RoutineSymbol("my_func"),
+                       [Reference(DataSymbol("i", INTEGER_TYPE)),
+                        ("arg", Literal("1", INTEGER_TYPE))])
+    with pytest.raises(VisitorError) as err:
+        SymPyBuilder.convert_to_sympy_expressions([call])
+    assert ("Named arguments are not supported by SymPy, but found "
+            "'[None, 'arg']' in the call to 'my_func'." in str(err.value))
@@ -234,6 +234,69 @@ def test_psyirvisitor_lower_dsl_concepts():
         "modifications." in str(excinfo.value))
 
 
+def test_psyirvisitor_visit_in_place():
+    ''' Test that a visitor that does not modify the tree visits the
+    provided node directly when it does not need to be lowered and
+    otherwise a copy of it (or of the whole tree if there is anything to
+    lower). '''
+
+    class MyDSLNode(Statement):
+        ''' DSL Concept that lowers to a return statement '''
+        _text_name = "MyDSLNode"
+
+        def lower_to_language_level(self):
+            ''' MyDSLNode lowers to a return statement. '''
+            self.replace_with(Return())
+
+    class MyVisitor(PSyIRVisitor):
+        ''' Simple Visitor that records the nodes that it visits. '''
+        _VISITS_IN_PLACE = True
+
+        def __init__(self):
+            super().__init__()
+            self.visited = []
+
+        def node_node(self, node):
+            ''' Generic node visitor '''
+            self.visited.append(node)
+            return "".join(self._visit(child) for child in node.children)
+
+    visitor = MyVisitor()
+    container = Container("my_mod")
+    routine = Routine("my_sub")
+    container.addchild(routine)
+    statement = Return()
+    routine.addchild(statement)
+
+    # Nothing to lower so the original nodes are visited
+    visitor(routine)
+    assert visitor.visited[0] is routine
+    assert visitor.visited[1] is statement
+
+    # Nodes that the visitor modifies are visited in a copy of the sub-tree
+    # that is still connected to the same ancestors
+    visitor.visited = []
+    visitor._MODIFIED_NODE_TYPES = (Return, )
+    visitor(routine)
+    assert visitor.visited[0] is not routine
+    assert visitor.visited[0].parent is container
+    assert visitor.visited[0].symbol_table.parent_symbol_table() is \
+        container.symbol_table
+    assert visitor.visited[1] is not statement
+    assert container.children == [routine]
+    assert routine.children[0] is statement
+
+    # Nodes that need to be lowered are visited in a copy of the whole tree
+    visitor.visited = []
+    visitor._MODIFIED_NODE_TYPES = ()
+    routine.addchild(MyDSLNode())
+    visitor(routine)
+    assert visitor.visited[0] is not routine
+    assert visitor.visited[0].parent is not container
+    assert isinstance(visitor.visited[0].parent, Container)
+    assert isinstance(routine.children[1], MyDSLNode)
+
+
 def test_psyirvisitor_visit_no_method1():
     '''Check that an exception is raised if the method for the Node class
     does not exist.
@@ -298,6 +361,71 @@ def test_psyirvisitor_visit_all_parents():
         "" in str(excinfo.value))
 
 
+def test_psyirvisitor_dispatch_table():
+    '''Check that the method that handles each class of node is looked up
+    once for each class of visitor and then cached, and that an
+    AttributeError raised by that method is not mistaken for the method
+    not existing.
+
+    '''
+    class MyNode(Node):
+        '''Subclass of Node that is handled by the node_node method.'''
+
+    class MyVisitor(PSyIRVisitor):
+        '''Visitor that handles any Node.'''
+        def node_node(self, _):
+            ''' Match with class Node. '''
+            return "node"
+
+    class MyOtherVisitor(MyVisitor):
+        '''Visitor that raises an AttributeError for MyNode.'''
+        def mynode_node(self, _):
+            ''' Raise an AttributeError for testing purposes '''
+            raise AttributeError("object has no attribute 'mynode_node'")
+
+    assert MyVisitor()(MyNode()) == "node"
+    # pylint: disable=protected-access
+    assert (PSyIRVisitor._dispatch_tables[MyVisitor][MyNode] ==
+            (["mynode_node", "node_node"], 1))
+    assert MyOtherVisitor not in PSyIRVisitor._dispatch_tables
+    with pytest.raises(AttributeError) as excinfo:
+        MyOtherVisitor()(MyNode())
+    assert "has no attribute 'mynode_node'" in str(excinfo.value)
+    assert (PSyIRVisitor._dispatch_tables[MyOtherVisitor][MyNode] ==
+            (["mynode_node", "node_node"], 0))
+    # A handler set on an instance takes precedence over the cached one
+    visitor = MyVisitor()
+    visitor.mynode_node = lambda _: "instance"
+    assert visitor(MyNode()) == "instance"
+    assert MyVisitor()(MyNode()) == "node"
+
+
+def test_psyirvisitor_dispatch_table_miss():
+    '''Check that a class of node without a handler is not cached, so
+    that a handler that is set on the visitor instance or added to the
+    visitor class later is found.
+
+    '''
+    class MyNode(Node):
+        '''Subclass of Node that is handled by the node_node method.'''
+
+    class MyVisitor(PSyIRVisitor):
+        '''Visitor without any handlers.'''
+
+    visitor = MyVisitor()
+    with pytest.raises(VisitorError):
+        visitor(MyNode())
+    # pylint: disable=protected-access
+    assert MyNode not in PSyIRVisitor._dispatch_tables[MyVisitor]
+    visitor.mynode_node = lambda _: "instance"
+    assert visitor(MyNode()) == "instance"
+    with pytest.raises(VisitorError):
+        MyVisitor()(MyNode())
+    MyVisitor.node_node = lambda self, _: "class"
+    assert MyVisitor()(MyNode()) == "class"
+    assert visitor(MyNode()) == "instance"
+
+
 def test_psyirvisitor_visit_skip_nodes():
     '''Check that when the skip_nodes variable is set to true then child
     nodes are called irrespective of whether a parent node has a
@@ -40,16 +40,19 @@
 
 import sys
 import os
+import pickle
 import re
 import pytest
 
 from psyclone.domain.lfric.transformations import LFRicLoopFuseTrans
+from psyclone.core import AccessType, Signature, VariablesAccessInfo
 from psyclone.errors import InternalError, GenerationError
 from psyclone.parse.algorithm import parse
 from psyclone.psyGen import PSyFactory, Kern
+from psyclone.psyir.frontend.fortran import FortranReader
 from psyclone.psyir.nodes import Schedule, Reference, Container, Routine, \
     Assignment, Return, Loop, Literal, Statement, node, KernelSchedule, \
-    BinaryOperation, ArrayReference, Call, Range
+    BinaryOperation, ArrayReference, Call, Range, IfBlock
 from psyclone.psyir.nodes.node import ChildrenList, Node, \
     _graphviz_digraph_class
 from psyclone.psyir.symbols import DataSymbol, SymbolError, \
@@ -332,6 +335,71 @@ def test_node_abs_position_error():
     assert "Error in search for Node position in the tree" in str(err.value)
 
 
+def test_node_position_cache(fortran_reader):
+    ''' Check that the pre-order numbering of a tree is cached by its root
+    node, that it is discarded whenever any children list in the tree is
+    modified and that it is not copied or pickled. '''
+    code = ("subroutine test(a, n)\n"
+            "  integer :: n, i, j\n"
+            "  real :: a(n)\n"
+            "  do i = 1, n\n"
+            "    a(i) = 1.0\n"
+            "  end do\n"
+            "  do j = 1, n\n"
+            "    a(j) = a(j) + 2.0\n"
+            "  end do\n"
+            "end subroutine test\n")
+    psyir = fortran_reader.psyir_from_source(code)
+    routine = psyir.children[0]
+
+    def check_positions():
+        ''' Checks the cached positions against a walk of the tree. '''
+        for position, current in enumerate(psyir.walk(Node)):
+            assert current.abs_position == position
+
+    assert psyir._position_cache is None
+    check_positions()
+    cache = psyir._position_cache
+    assert cache is not None
+    assert routine._position_cache is None
+    # The numbering is reused.
+    loop1, loop2 = routine.walk(Loop)
+    assert loop1.abs_position < loop2.abs_position
+    assert psyir._position_cache is cache
+    # Modifying the tree at any depth discards the numbering.
+    assignment = loop2.loop_body.children[0]
+    assignment.rhs.children.reverse()
+    assert psyir._position_cache is None
+    check_positions()
+    loop2.loop_body.addchild(assignment.copy())
+    assert psyir._position_cache is None
+    check_positions()
+    routine.children.insert(0, routine.children.pop())
+    assert psyir._position_cache is None
+    check_positions()
+    assert loop2.abs_position < loop1.abs_position
+    assert loop1.following()[0] is loop1.children[0]
+    assert loop1.preceding(reverse=True)[0] is loop2.walk(Node)[-1]
+    # A detached subtree is numbered independently.
+    loop1.detach()
+    check_positions()
+    assert loop1.abs_position == 0
+    assert loop1.loop_body.abs_position == 4
+    cache = loop1._position_cache
+    assert cache is not None
+    # Copies and pickled trees do not share the numbering.
+    assert loop1.copy()._position_cache is None
+    sched = Schedule(children=[Return()])
+    assert sched.children[0].abs_position == 1
+    assert sched._position_cache is not None
+    assert pickle.loads(pickle.dumps(sched))._position_cache is None
+    # The numbering of a subtree is discarded when it is attached to
+    # another tree.
+    routine.addchild(loop1)
+    assert loop1._position_cache is None
+    check_positions()
+
+
 def test_node_root():
     '''
     Test that the Node class root method returns the correct instance
@@ -591,6 +659,47 @@ def test_node_is_valid_location():
     assert not anode.is_valid_location(schedule.children[3], position="after")
 
 
+def test_walk():
+    ''' Test that walk, iter_walk and first_of visit the nodes in the same
+    (depth-first) order and respect the stop_type argument. '''
+    code = ("subroutine test()\n"
+            "  integer :: i, j, a(10, 10)\n"
+            "  do i = 1, 10\n"
+            "    do j = 1, 10\n"
+            "      a(i, j) = i + j\n"
+            "    end do\n"
+            "  end do\n"
+            "  a(1, 1) = 0\n"
+            "end subroutine test\n")
+    routine = FortranReader().psyir_from_source(code).children[0]
+    loops = routine.walk(Loop)
+    assert len(loops) == 2
+    assert loops[1].parent.parent is loops[0]
+    refs = routine.walk(Reference)
+    assert [ref.name for ref in refs] == ["a", "i", "j", "i", "j", "a"]
+    assert all(new is old for new, old in
+               zip(routine.iter_walk(Reference), refs))
+    assert len(list(routine.iter_walk(Reference))) == len(refs)
+    # A tuple of types.
+    nodes = routine.walk((Loop, Literal))
+    assert isinstance(nodes[0], Loop)
+    assert isinstance(nodes[1], Literal)
+    assert list(routine.iter_walk((Loop, Literal))) == nodes
+    # Recursion is stopped at (but includes) any instance of stop_type.
+    assert routine.walk(Loop, stop_type=Loop) == [loops[0]]
+    assert list(routine.iter_walk(Loop, stop_type=Loop)) == [loops[0]]
+    stopped = routine.walk(Reference, stop_type=Loop)
+    assert [ref.name for ref in stopped] == ["a"]
+    assert loops[0].walk(Reference, stop_type=Loop) == []
+    # The node itself is included.
+    assert list(loops[1].iter_walk(Loop)) == [loops[1]]
+    assert routine.first_of(Reference) is refs[0]
+    assert routine.first_of(Assignment, stop_type=Loop) is \
+        routine.children[1]
+    assert routine.first_of(Return) is None
+    assert loops[0].first_of(Loop) is loops[0]
+
+
 def test_node_ancestor():
     ''' Test the Node.ancestor() method. '''
     _, invoke = get_invoke("single_invoke.f90", "gocean1.0", idx=0,
@@ -985,6 +1094,81 @@ def test_children_is_orphan_same_parent():
             in str(error.value))
 
 
+def test_children_replace_range():
+    ''' Test the bulk splice and replace_range operations of the
+    ChildrenList. '''
+    schedule = Schedule()
+    old = [Return() for _ in range(4)]
+    schedule.children.extend(old)
+    schedule.structural_hash()
+
+    new = [Return(), Return()]
+    schedule.children.splice(1, new)
+    assert schedule.children == [old[0]] + new + old[1:]
+    assert all(child.parent is schedule for child in schedule.children)
+    assert [child.position for child in schedule.children] == list(range(6))
+    assert schedule._structural_hash is None
+
+    # Replace the two new items with a single one, negative indices are
+    # supported as for a slice.
+    other = Return()
+    removed = schedule.children.replace_range(1, -3, [other])
+    assert removed == new
+    assert all(item.parent is None for item in removed)
+    assert schedule.children == [old[0], other] + old[1:]
+
+    # Nothing happens when an empty range is replaced with no items
+    assert schedule.children.replace_range(2, 2, []) == []
+    assert len(schedule.children) == 5
+
+    # An item can only be added once
+    item = Return()
+    with pytest.raises(GenerationError) as error:
+        schedule.children.splice(0, [item, item])
+    assert ("Item 'Return' can't be added more than once as child of "
+            "'Schedule'." in str(error.value))
+    assert item.parent is None
+
+    # The new items must be orphans
+    with pytest.raises(GenerationError) as error:
+        schedule.children.splice(0, [Return(), old[0]])
+    assert "because it is not an orphan" in str(error.value)
+
+    # The new and the displaced items are validated before the list is
+    # modified.
+    loop = Loop.create(DataSymbol("idx", INTEGER_TYPE),
+                       Literal("0", INTEGER_TYPE), Literal("1", INTEGER_TYPE),
+                       Literal("2", INTEGER_TYPE), [Return()])
+    with pytest.raises(GenerationError) as error:
+        loop.children.splice(3, [Return()])
+    assert "Item 'Return' can't be child 3 of 'Loop'." in str(error.value)
+    with pytest.raises(GenerationError) as error:
+        loop.children.splice(1, [Literal("3", INTEGER_TYPE)])
+    assert "Item 'Literal' can't be child 3 of 'Loop'." in str(error.value)
+    assert len(loop.children) == 4
+    start = Literal("5", INTEGER_TYPE)
+    removed = loop.children.replace_range(0, 1, [start])
+    assert removed[0].value == "0"
+    assert loop.start_expr is start
+
+
+def test_children_pickle():
+    ''' Test that a tree of nodes can be pickled and that the ChildrenList
+    of each node in the restored tree is connected to that node and still
+    validates new children. '''
+    schedule = Schedule()
+    schedule.addchild(Statement())
+    schedule.addchild(Statement())
+    new_schedule = pickle.loads(pickle.dumps(schedule))
+    assert isinstance(new_schedule.children, ChildrenList)
+    assert len(new_schedule.children) == 2
+    assert new_schedule.children[0].parent is new_schedule
+    with pytest.raises(GenerationError) as error:
+        new_schedule.children.append(Node())
+    assert ("Item 'Node' can't be child 2 of 'Schedule'"
+            in str(error.value))
+
+
 def test_children_setter():
     ''' Test that the children setter sets-up accepts lists or raises
     the appropriate issue. '''
@@ -1305,6 +1489,54 @@ def test_following_preceding():
             [container, routine1, assign1, a_ref, multiply2, b_ref])
 
 
+def test_iter_following_preceding(fortran_reader, monkeypatch):
+    '''Test that the iter_following and iter_preceding methods in the Node
+    class yield the same nodes as the following and preceding methods,
+    without using the pre-order numbering of the whole tree.
+
+    '''
+    code = '''module test_mod
+    contains
+    subroutine sub1(a, b)
+      real :: a(10), b
+      integer :: i
+      do i = 1, 10
+        if (a(i) > b) then
+          a(i) = b * 2.0
+        else
+          b = a(i) + 1.0
+        end if
+      end do
+    end subroutine sub1
+    subroutine sub2(c)
+      real :: c
+      c = c + 1.0
+    end subroutine sub2
+    end module test_mod'''
+    container = fortran_reader.psyir_from_source(code).children[0]
+    all_nodes = container.walk(Node)
+    # Compare the identities, as equal nodes (e.g. the two references to
+    # 'a(i)') compare equal.
+    for current in all_nodes:
+        for routine in [True, False]:
+            assert ([id(n) for n in current.iter_following(routine)] ==
+                    [id(n) for n in current.following(routine)])
+            for reverse in [True, False]:
+                assert ([id(n) for n in current.iter_preceding(reverse,
+                                                               routine)] ==
+                        [id(n) for n in current.preceding(reverse, routine)])
+
+    # The iterators only visit the nodes that are requested.
+    def fail(_):
+        raise AssertionError("_position_index must not be used")
+    monkeypatch.setattr(Node, "_position_index", fail)
+    assign = container.walk(Assignment)[0]
+    assert next(assign.iter_following()) is assign.lhs
+    assert next(assign.iter_preceding(reverse=True)) is assign.parent
+    assert next(assign.iter_preceding()) is assign.ancestor(Routine)
+    assert next(all_nodes[-1].iter_following(), None) is None
+
+
 def test_equality():
     '''Test the equality function of the Node class'''
     # Use same symbol table to avoid pollution from the ScopingNode
@@ -1340,3 +1572,189 @@ def test_equality():
                               Literal("2", INTEGER_TYPE))
     parent1.addchild(three)
     assert parent1 != parent2
+
+
+def test_structural_hash(fortran_reader):
+    '''Test that the structural hash of equal nodes is the same, that it
+    is cached and that it is discarded when the tree below a node or a
+    referenced symbol is modified.
+
+    '''
+    psyir = fortran_reader.psyir_from_source('''
+        subroutine test(a, b, i, j)
+          use my_mod, only: my_type
+          type(my_type) :: s
+          integer :: i, j, a(10, 10), b(10, 10)
+          a(i, j) = b(i, j) + s%x(i)
+        end subroutine test''')
+    assign = psyir.children[0].children[0]
+    expr1 = assign.rhs
+    expr2 = expr1.copy()
+    assert expr1 == expr2
+    assert expr1.structural_hash() == expr2.structural_hash()
+    # Equal subtrees in different places have the same hash
+    assert (assign.lhs.structural_hash() !=
+            expr1.children[0].structural_hash())
+    assert (assign.lhs.indices[0].structural_hash() ==
+            expr1.children[0].indices[0].structural_hash())
+    # The hash is cached, but not copied
+    assert expr1._structural_hash == expr1.structural_hash()
+    assert expr1.copy()._structural_hash is None
+
+    # Modifying a descendant discards the hash of all ancestors
+    index = expr2.children[0].indices[1]
+    index.replace_with(
+        BinaryOperation.create(BinaryOperation.Operator.ADD, index.copy(),
+                               Literal("1", INTEGER_TYPE)))
+    assert expr2._structural_hash is None
+    assert expr2.children[0]._structural_hash is None
+    assert expr1.structural_hash() != expr2.structural_hash()
+    assert expr1 != expr2
+    expr2.children[0].indices[1].replace_with(index)
+    assert expr1.structural_hash() == expr2.structural_hash()
+    assert expr1 == expr2
+
+    # As does changing the symbol of a reference
+    symbol = index.symbol
+    index.symbol = DataSymbol("k", INTEGER_TYPE)
+    assert expr2._structural_hash is None
+    assert expr1.structural_hash() != expr2.structural_hash()
+    assert expr1 != expr2
+    index.symbol = symbol
+    assert expr1.structural_hash() == expr2.structural_hash()
+
+    # Literals, operators and member names are part of the hash
+    lit1 = Literal("1", INTEGER_TYPE)
+    lit2 = Literal("2", INTEGER_TYPE)
+    assert lit1.structural_hash() != lit2.structural_hash()
+    add = BinaryOperation.create(BinaryOperation.Operator.ADD,
+                                 lit1.copy(), lit2.copy())
+    sub = BinaryOperation.create(BinaryOperation.Operator.SUB,
+                                 lit1.copy(), lit2.copy())
+    assert add.structural_hash() != sub.structural_hash()
+    member = expr1.children[1].member
+    assert (member.structural_hash() ==
+            expr2.children[1].member.structural_hash())
+    member._component_name = "y"
+    member._invalidate_caches()
+    assert expr1.structural_hash() != expr2.structural_hash()
+
+
+def test_equality_structural_hash():
+    '''Test that nodes with different cached structural hashes are not
+    compared in Node.__eq__.
+
+    '''
+    one = Literal("1", INTEGER_TYPE)
+    two = Literal("2", INTEGER_TYPE)
+    parent1 = BinaryOperation.create(BinaryOperation.Operator.ADD,
+                                     one.copy(), two.copy())
+    parent2 = parent1.copy()
+    assert parent1 == parent2
+    # Fake hashes to show that a different structural hash is used to
+    # decide that the nodes are not equal (if both are known).
+    parent1._structural_hash = 1
+    assert parent1 == parent2
+    parent2._structural_hash = 2
+    assert parent1 != parent2
+    parent2._structural_hash = 1
+    assert parent1 == parent2
+
+
+def test_cached_reference_accesses(fortran_reader, monkeypatch):
+    '''Test that the variable accesses of loops, if-blocks and schedules are
+    cached, that they are the same as the accesses that are not cached, and
+    that they are discarded when the tree is modified.
+
+    '''
+    # pylint: disable=protected-access
+    code = '''subroutine test()
+      integer :: i, j, n
+      real :: a(10), b(10), c
+      do i = 1, n
+        a(i) = b(i) + c
+        if (c > 0.0) then
+          b(i) = c
+        end if
+      end do
+      c = a(1)
+    end subroutine test'''
+    routine = fortran_reader.psyir_from_source(code).children[0]
+    loop = routine.children[0]
+    ifblock = loop.loop_body.children[1]
+
+    def all_accesses(var_accesses):
+        ''':returns: all accesses (with their locations) as a string.'''
+        return "; ".join(str(var_accesses[sig])
+                         for sig in var_accesses.all_signatures)
+
+    for cls in [Schedule, Loop, IfBlock]:
+        monkeypatch.setattr(cls, "_cache_accesses", False)
+    uncached = all_accesses(VariablesAccessInfo(routine))
+    assert routine._cached_accesses is None
+    monkeypatch.undo()
+
+    var_accesses = VariablesAccessInfo(routine)
+    assert all_accesses(var_accesses) == uncached
+    cached = routine._cached_accesses
+    assert cached is not None
+    assert loop._cached_accesses is not None
+    assert ifblock._cached_accesses is not None
+    assert ifblock.if_body._cached_accesses is not None
+    # The loop body is handled by the loop itself, and statements are
+    # not cached.
+    assert loop.loop_body._cached_accesses is None
+    assert routine.children[1]._cached_accesses is None
+
+    # The cached accesses are copied and then used again
+    var_accesses.add_access(Signature("x"), AccessType.READ, routine)
+    assert Signature("x") not in cached
+    assert all_accesses(VariablesAccessInfo(routine)) == uncached
+    assert routine._cached_accesses is cached
+    assert (str(VariablesAccessInfo(loop)) ==
+            "a: WRITE, b: READ+WRITE, c: READ, i: READ+WRITE, n: READ")
+    assert routine.copy()._cached_accesses is None
+
+    # Changing the symbol of a reference discards the cached accesses of
+    # the ancestors of the reference.
+    symbol_j = routine.symbol_table.lookup("j")
+    ifblock.if_body.children[0].rhs.symbol = symbol_j
+    for ancestor in [ifblock.if_body, ifblock, loop, routine]:
+        assert ancestor._cached_accesses is None
+    assert "j:READ(4)" in all_accesses(VariablesAccessInfo(routine))
+
+    # And so does modifying the children of a node
+    routine.children[1].detach()
+    assert routine._cached_accesses is None
+    assert loop._cached_accesses is not None
+    assert "a:WRITE(1),READ(4)" not in str(VariablesAccessInfo(routine))
+
+    # Changing the loop variable
+    loop.variable = symbol_j
+    assert loop._cached_accesses is None
+    assert routine._cached_accesses is None
+    assert "i: READ, j: READ+WRITE" in str(VariablesAccessInfo(routine))
+
+    # Renaming a symbol discards all cached accesses in its scope
+    routine.symbol_table.rename_symbol(routine.symbol_table.lookup("c"), "d")
+    for ancestor in [ifblock, loop, routine]:
+        assert ancestor._cached_accesses is None
+    assert "d: READ" in str(VariablesAccessInfo(routine))
+
+
+def test_cached_reference_accesses_kernel():
+    '''Test that the variable accesses of kernels (which are based on the
+    kernel metadata) and their ancestors are not cached.
+
+    '''
+    # pylint: disable=protected-access
+    psy, invoke = get_invoke("1_single_invoke.f90", api="dynamo0.3", idx=0)
+    # The LFRic loop bounds are only created at code-generation time
+    # pylint: disable=pointless-statement
+    psy.gen
+    schedule = invoke.schedule
+    var_accesses = VariablesAccessInfo(schedule)
+    assert not var_accesses._cacheable
+    assert "f1: READ+WRITE" in str(var_accesses)
+    assert schedule._cached_accesses is None
+    assert schedule.children[0]._cached_accesses is None
@@ -243,6 +243,41 @@ def test_next_available_name_4():
             "'str'." in str(excinfo.value))
 
 
+def test_next_available_name_counts():
+    '''Test that the number of candidate names that each symbol table is
+    known to contain is used to skip them and that it is discarded when a
+    symbol is removed or renamed (by any means) so that the same names as
+    a linear search are always returned.
+
+    '''
+    schedule_symbol_table, container_symbol_table = create_hierarchy()
+    for name in ["tmp", "tmp_1", "tmp_2", "TMP_4"]:
+        container_symbol_table.add(Symbol(name))
+    schedule_symbol_table.add(Symbol("tmp_3"))
+    assert schedule_symbol_table.next_available_name("tmp") == "tmp_5"
+    # pylint: disable=protected-access
+    assert container_symbol_table._symbols.name_counts == {"tmp": 3}
+    assert schedule_symbol_table._symbols.name_counts == {"tmp": 0}
+    assert schedule_symbol_table.next_available_name(
+        "tmp", shadowing=True) == "tmp"
+    # Removing a symbol (even directly) frees its name
+    del container_symbol_table._symbols["tmp_1"]
+    assert container_symbol_table._symbols.name_counts == {}
+    assert schedule_symbol_table.next_available_name("tmp") == "tmp_1"
+    container_symbol_table.add(Symbol("tmp_1"))
+    assert schedule_symbol_table.next_available_name("tmp") == "tmp_5"
+    container_symbol_table.rename_symbol(
+        container_symbol_table.lookup("tmp_2"), "other")
+    assert schedule_symbol_table.next_available_name("Tmp") == "Tmp_2"
+    container_symbol_table.remove(container_symbol_table.lookup("tmp"))
+    assert schedule_symbol_table.next_available_name("tmp") == "tmp"
+    # A shallow copy of a table does not share its counts
+    table_copy = container_symbol_table.shallow_copy()
+    table_copy.add(Symbol("tmp"))
+    assert table_copy.next_available_name("tmp") == "tmp_2"
+    assert container_symbol_table.next_available_name("tmp") == "tmp"
+
+
 def test_new_symbol_5():
     '''Check that next_available_name in the SymbolTable class behaves as
     expected with the shadowing flag being a) explicitly set to
@@ -754,6 +789,39 @@ def test_lookup_4():
                 in str(info.value))
 
 
+def test_lookup_scope_chain(monkeypatch):
+    '''Check that lookup(), lookup_with_tag(), add() and
+    next_available_name() search the symbol tables in scope in turn,
+    innermost first, without merging them.
+
+    '''
+    schedule_symbol_table, container_symbol_table = create_hierarchy()
+    # Shadow symbol2 in the inner scope
+    inner_symbol2 = DataSymbol("Symbol2", INTEGER_TYPE)
+    schedule_symbol_table.add(inner_symbol2)
+    monkeypatch.setattr(SymbolTable, "get_symbols", None)
+    monkeypatch.setattr(SymbolTable, "get_tags", None)
+    # pylint: disable=protected-access
+    assert (list(schedule_symbol_table._scope_tables()) ==
+            [schedule_symbol_table, container_symbol_table])
+    assert schedule_symbol_table.lookup("symbol2") is inner_symbol2
+    assert (container_symbol_table.lookup("symbol2") is
+            container_symbol_table.lookup_with_tag("symbol2_tag"))
+    assert (schedule_symbol_table.lookup_with_tag("symbol2_tag") is
+            container_symbol_table.lookup("symbol2"))
+    assert schedule_symbol_table.next_available_name("symbol1") == \
+        "symbol1_1"
+    with pytest.raises(KeyError) as info:
+        schedule_symbol_table.add(Symbol("new"), tag="symbol2_tag")
+    assert "already contains the tag 'symbol2_tag'" in str(info.value)
+    # The scope_limit argument is checked even if the symbol is found in
+    # the first table
+    with pytest.raises(TypeError) as info:
+        schedule_symbol_table.lookup("symbol1", scope_limit="node")
+    assert ("The scope_limit argument 'node', is not of type `Node`."
+            in str(info.value))
+
+
 def test_lookup_with_tag_1():
     '''Test that the lookup_with_tag method retrieves symbols from the symbol
     table if the tag exists, otherwise it raises an error.'''
@@ -1335,6 +1403,13 @@ def test_deep_copy():
     assert symtab2.lookup("symbol2").interface.container_symbol is \
         symtab2.lookup("my_mod")
 
+    # The new instance of each symbol is returned in the supplied map
+    symbol_map = {}
+    symtab3 = symtab.deep_copy(symbol_map)
+    assert len(symbol_map) == 3
+    for symbol in [mod, sym1, sym2]:
+        assert symbol_map[symbol] is symtab3.lookup(symbol.name)
+
     # Add new symbols and rename symbols in both symbol tables and check
     # they are not added/renamed in the other symbol table
     symtab.add(Symbol("st1"))
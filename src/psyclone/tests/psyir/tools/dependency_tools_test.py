@@ -42,9 +42,11 @@ import pytest
 from fparser.common.readfortran import FortranStringReader
 
 from psyclone.configuration import Config
-from psyclone.core import Signature, VariablesAccessInfo
+from psyclone.core import (ComponentIndices, Signature,
+                           VariablesAccessInfo)
 from psyclone.errors import InternalError
 from psyclone.psyGen import PSyFactory
+from psyclone.psyir.nodes import Loop
 from psyclone.psyir.backend.fortran import FortranWriter
 from psyclone.psyir.tools.dependency_tools import DependencyTools, DTCode
 from psyclone.tests.utilities import get_invoke
@@ -252,6 +254,128 @@ def test_arrays_parallelise(fortran_reader):
     assert msg.var_names == ["mask(ji,jj)", "mask(ji,jj + 1)"]
 
 
+# -----------------------------------------------------------------------------
+def test_loops_be_parallelised(fortran_reader, monkeypatch):
+    '''Tests that can_loops_be_parallelised analyses all loops of a routine
+    in the same way as can_loop_be_parallelised, and that the comparison of
+    array accesses is shared between the loops.
+    '''
+    source = '''program test
+                integer ji, jj, jk
+                integer, parameter :: jpi=5, jpj=10, jpk=3
+                real, dimension(jpi,jpj,jpk) :: mask, umask
+                do jk = 1, jpk   ! loop 0
+                   do jj = 1, jpj
+                      do ji = 1, jpi
+                         mask(ji, jj, jk) = umask(ji, jj, jk)
+                      end do
+                   end do
+                end do
+                do jk = 1, jpk   ! loop 3
+                   do jj = 1, jpj
+                      do ji = 1, jpi
+                         mask(ji, jj, jk) = mask(ji, jj+1, jk)
+                      end do
+                   end do
+                   do jj = 1, jpj
+                      do ji = 1, jpi
+                         mask(ji, jj, jk) = umask(ji, jj, jk)
+                      end do
+                   end do
+                end do
+                end program test'''
+    psyir = fortran_reader.psyir_from_source(source)
+    routine = psyir.children[0]
+    loops = routine.walk(Loop)
+    dep_tools = DependencyTools()
+
+    with pytest.raises(TypeError) as err:
+        dep_tools.can_loops_be_parallelised(loops[0])
+    assert ("node must be an instance of class Routine but got 'Loop'"
+            in str(err.value))
+
+    for test_all_variables in [False, True]:
+        report = dep_tools.can_loops_be_parallelised(
+            routine, test_all_variables=test_all_variables)
+        assert len(report) == len(loops)
+        assert list(report) == loops
+        for loop in loops:
+            assert loop in report
+            expected = dep_tools.can_loop_be_parallelised(
+                loop, test_all_variables=test_all_variables)
+            assert report.is_parallelisable(loop) is expected
+            assert ([str(msg) for msg in report.get_messages(loop)] ==
+                    [str(msg) for msg in dep_tools.get_all_messages()])
+    # The stencil access only prevents parallelising the `jj` loop:
+    assert report.parallelisable_loops == [loops[0], loops[1], loops[3],
+                                           loops[6]]
+    assert "mask(ji,jj + 1,jk)" in str(report.get_messages(loops[4])[0])
+
+    # A loop that has not been analysed:
+    other = loops[0].copy()
+    assert other not in report
+    with pytest.raises(KeyError) as err:
+        report.is_parallelisable(other)
+    assert "has not been analysed" in str(err.value)
+
+    # Count the number of comparisons of array accesses: the identical
+    # accesses to 'mask' in the last `jj` loop and in loop 0 must not be
+    # compared again.
+    count = []
+    orig_method = DependencyTools._is_loop_carried_dependency
+
+    def counting_method(self, *args):
+        count.append(args[0])
+        return orig_method(self, *args)
+
+    monkeypatch.setattr(DependencyTools, "_is_loop_carried_dependency",
+                        counting_method)
+    report = dep_tools.can_loops_be_parallelised(routine)
+    batch_count = len(count)
+    count.clear()
+    for loop in loops:
+        dep_tools.can_loop_be_parallelised(loop)
+    assert batch_count < len(count)
+    assert dep_tools._dependency_cache is None
+
+
+# ----------------------------------------------------------------------------
+def test_array_access_same_indices(fortran_reader, monkeypatch):
+    '''Tests that an access is only compared with one of several accesses
+    using the same indices.
+    '''
+    source = '''program test
+                integer :: ji, jj
+                real, dimension(10, 10) :: a
+                do jj = 1, 10
+                   do ji = 1, 10
+                      a(ji, jj) = a(ji, jj) * a(ji, jj) + a(ji + 1, jj)
+                   end do
+                end do
+                end program test'''
+    psyir = fortran_reader.psyir_from_source(source)
+    loop = psyir.children[0].children[0]
+    dep_tools = DependencyTools()
+    calls = []
+    original = DependencyTools._is_loop_carried_dependency
+
+    def counting(self, loop_variables, write_access, other_access):
+        calls.append(other_access)
+        return original(self, loop_variables, write_access, other_access)
+
+    monkeypatch.setattr(DependencyTools, "_is_loop_carried_dependency",
+                        counting)
+    assert dep_tools.can_loop_be_parallelised(loop)
+    # The write access is compared with a(ji, jj) and a(ji+1, jj) only.
+    assert len(calls) == 2
+
+    # Indices that are not PSyIR nodes cannot be used in a key
+    access = VariablesAccessInfo(loop)[Signature("a")][0]
+    assert len(DependencyTools._get_index_key(access)) == 1
+    access.component_indices = ComponentIndices([["ji"]])
+    assert DependencyTools._get_index_key(access) is None
+
+
 # -----------------------------------------------------------------------------
 # This list contains the test cases and expected partition information.
 # The first two entries of each 3-tuple are the LHS and RHS. The third
@@ -0,0 +1,130 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+''' Module containing tests for the ForwardDependenceAnalysis class.'''
+
+from psyclone.core import Signature
+from psyclone.psyir.nodes import Assignment, Loop
+from psyclone.psyir.tools import ForwardDependenceAnalysis
+
+
+CODE = '''subroutine test(a, b, c, n)
+  integer :: n, i, j
+  real :: a(n), b(n), c(n)
+  do i = 1, n
+    a(i) = b(i)
+  end do
+  do i = 1, n
+    c(i) = b(i)
+  end do
+  do i = 1, n
+    do j = 1, n
+      b(i) = a(j) + c(j)
+    end do
+  end do
+  do i = 1, n
+    a(i) = c(i)
+  end do
+end subroutine test
+'''
+
+
+def test_accesses(fortran_reader):
+    '''Check that the variable accesses of a node are those of its
+    descendants other than the Loop and Schedule nodes, so that loop
+    variables are not written.
+
+    '''
+    routine = fortran_reader.psyir_from_source(CODE).children[0]
+    loops = routine.walk(Loop)
+    analysis = ForwardDependenceAnalysis(loops[:1])
+    assert analysis.accesses(loops[0]) == {
+        Signature("a"): True, Signature("b"): False, Signature("i"): False,
+        Signature("n"): False}
+    assert analysis.accesses(loops[2]) == {
+        Signature("a"): False, Signature("b"): True, Signature("c"): False,
+        Signature("i"): False, Signature("j"): False, Signature("n"): False}
+    # The accesses of the first loop were computed once, when it was
+    # indexed.
+    assignment = loops[0].loop_body[0]
+    assert analysis._accesses[id(assignment)][0] is assignment
+
+
+def test_forward_dependence(fortran_reader):
+    '''Check that the first following candidate with which a node has a
+    RaW, WaR or WaW dependence is found.
+
+    '''
+    routine = fortran_reader.psyir_from_source(CODE).children[0]
+    loops = routine.children
+    analysis = ForwardDependenceAnalysis(loops)
+    # RaW dependence (a) with the third loop (the second loop only reads
+    # b, as does the first loop).
+    assert analysis.forward_dependence(loops[0]) is loops[2]
+    # WaR dependence (c) with the third loop.
+    assert analysis.forward_dependence(loops[1]) is loops[2]
+    # WaR dependence (a) with the last loop.
+    assert analysis.forward_dependence(loops[2]) is loops[3]
+    assert analysis.forward_dependence(loops[3]) is None
+    # Excluded candidates are skipped.
+    assert analysis.forward_dependence(
+        loops[0], excluded=lambda node: node is loops[2]) is loops[3]
+    # Ignored variables of a candidate do not cause a dependence.
+    analysis = ForwardDependenceAnalysis(
+        loops,
+        ignored_names=lambda node: {"a", "b"} if node is loops[2] else {})
+    assert analysis.forward_dependence(loops[0]) is loops[3]
+
+
+def test_forward_dependence_barriers(fortran_reader):
+    '''Check that a following barrier is the forward dependence if it comes
+    before the first following dependent candidate.
+
+    '''
+    routine = fortran_reader.psyir_from_source(CODE).children[0]
+    loops = routine.children
+    barrier = loops[1].loop_body[0]
+    assert isinstance(barrier, Assignment)
+    analysis = ForwardDependenceAnalysis([loops[0], loops[2], loops[3]],
+                                         barriers=[barrier])
+    assert analysis.forward_dependence(loops[0]) is barrier
+    assert analysis.forward_dependence(
+        loops[0], is_barrier=lambda node: False) is loops[2]
+    assert analysis.forward_dependence(
+        loops[0], excluded=lambda node: node is barrier) is loops[2]
+    # A barrier after the first dependence is not used.
+    assert analysis.forward_dependence(loops[2]) is loops[3]
+    analysis = ForwardDependenceAnalysis([loops[0]], barriers=[barrier])
+    assert analysis.forward_dependence(loops[0]) is barrier
+    assert analysis.forward_dependence(loops[3]) is None
@@ -0,0 +1,94 @@
+# -----------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2022, Science and Technology Facilities Council.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# -----------------------------------------------------------------------------
+
+''' Module containing tests for the StructuralKey and NodeInterner
+classes.'''
+
+import pytest
+
+from psyclone.psyir.nodes import Literal
+from psyclone.psyir.symbols import INTEGER_TYPE
+from psyclone.psyir.tools import NodeInterner, StructuralKey
+
+
+def test_structural_key(fortran_reader):
+    '''Test that StructuralKeys of equal nodes are equal, and that they
+    can be used as dictionary keys.'''
+    psyir = fortran_reader.psyir_from_source('''
+        subroutine test(a, i, j)
+          integer :: i, j, a(10, 10)
+          a(i, j) = a(j, i) + a(i, j)
+        end subroutine test''')
+    assign = psyir.children[0].children[0]
+    lhs = assign.lhs
+    rhs1, rhs2 = assign.rhs.children
+
+    key = StructuralKey(lhs)
+    assert key.node is lhs
+    assert hash(key) == lhs.structural_hash()
+    assert key == StructuralKey(rhs2)
+    assert key != StructuralKey(rhs1)
+    assert key != lhs
+    assert str(key) == "StructuralKey(ArrayReference[name:'a'])"
+
+    counts = {}
+    for node in [lhs, rhs1, rhs2]:
+        counts[StructuralKey(node)] = counts.get(StructuralKey(node), 0) + 1
+    assert counts == {StructuralKey(lhs): 2, StructuralKey(rhs1): 1}
+
+    with pytest.raises(TypeError) as err:
+        StructuralKey("a")
+    assert ("A StructuralKey can only be created for a PSyIR Node but got "
+            "'str'." in str(err.value))
+
+
+def test_node_interner():
+    '''Test that the NodeInterner returns the first of equal nodes, and
+    that it removes duplicates.'''
+    one = Literal("1", INTEGER_TYPE)
+    two = Literal("2", INTEGER_TYPE)
+    one_copy = one.copy()
+
+    interner = NodeInterner()
+    assert len(interner) == 0
+    assert one not in interner
+    assert interner.intern(one) is one
+    assert interner.intern(two) is two
+    assert interner.intern(one_copy) is one
+    assert one_copy in interner
+    assert len(interner) == 2
+
+    assert NodeInterner.unique([one_copy, two, one, two.copy()]) == \
+        [one_copy, two]
+    assert NodeInterner.unique([]) == []
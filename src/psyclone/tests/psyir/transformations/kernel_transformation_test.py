@@ -266,6 +266,34 @@ def test_new_same_kern_single(kernel_outputdir, monkeypatch):
     assert out_files == [new_kernels[1].module_name+".f90"]
 
 
+@pytest.mark.parametrize("link", [True, False])
+def test_new_kern_single_mode(kernel_outputdir, monkeypatch, link):
+    ''' Check that a kernel written with kernel-naming 'single' has the
+    permissions given by the umask, whether or not the file system
+    supports hard links. '''
+    config = Config.get()
+    monkeypatch.setattr(config, "_kernel_naming", "single")
+    if not link:
+        def no_link(_src, _dst):
+            raise OSError("Operation not permitted")
+        monkeypatch.setattr(os, "link", no_link)
+    _, invoke = get_invoke("1_single_invoke.f90", api="dynamo0.3", idx=0)
+    kern = invoke.schedule.coded_kernels()[0]
+    ACCRoutineTrans().apply(kern)
+    old_umask = os.umask(0o027)
+    try:
+        kern.rename_and_write()
+    finally:
+        os.umask(old_umask)
+    # Only the kernel file (and no temporary file) is left
+    out_files = os.listdir(str(kernel_outputdir))
+    assert out_files == [kern.module_name+".f90"]
+    filename = os.path.join(str(kernel_outputdir), out_files[0])
+    assert os.stat(filename).st_mode & 0o777 == 0o750
+    with open(filename, "r") as ffile:
+        assert "subroutine testkern_0_code" in ffile.read()
+
+
 def test_1kern_trans(kernel_outputdir):
     ''' Check that we generate the correct code when an invoke contains
     the same kernel more than once but only one of them is transformed. '''
@@ -39,10 +39,13 @@ import pytest
 
 from psyclone.parse.algorithm import parse
 from psyclone.psyGen import PSyFactory
+from psyclone.psyir.nodes import Loop, OtterSynchroniseChildrenNode, \
+        OtterTaskNode
 from psyclone.psyir.transformations import OtterParallelTrans, \
         OtterTaskloopTrans, OtterTraceSetupTrans, \
         OtterLoopTrans, OtterSynchroniseChildrenTrans, \
-        OtterSynchroniseDescendantsTrans, OtterTraceStartEndTrans
+        OtterSynchroniseDescendantsTrans, OtterTraceStartEndTrans, \
+        OtterSynchroniseRegionTrans, TransformationError
 
 GOCEAN_BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                                 os.pardir, os.pardir, "test_files",
@@ -229,3 +232,54 @@ def test_ottertracestartend_trans_apply():
             '''END DO
       CALL fortran_otterTraceStop'''
     assert correct in code
+
+
+def test_ottersyncregion_trans_apply(fortran_reader):
+    '''Test that the OtterSynchroniseRegionTrans finds the forward
+    dependences of the taskloops and adds the required synchronisation
+    nodes before them.'''
+    code = '''subroutine test(a, b, c, n)
+      integer :: n, i, j
+      real :: a(n), b(n), c(n)
+      do i = 1, n
+        a(i) = b(i)
+      end do
+      do i = 1, n
+        c(i) = b(i)
+      end do
+      do j = 1, n
+        b(j) = a(j) + 1
+      end do
+      do i = 1, n
+        c(i) = a(i) + b(i)
+      end do
+    end subroutine test'''
+    routine = fortran_reader.psyir_from_source(code).children[0]
+    for loop in routine.children[:]:
+        OtterTaskloopTrans().apply(loop)
+    OtterParallelTrans().apply(routine.children[:])
+    parallel = routine.children[0]
+    taskloops = parallel.children[0].children[:]
+    with pytest.raises(TransformationError) as err:
+        OtterSynchroniseRegionTrans.get_forward_dependence(taskloops[0],
+                                                           routine)
+    assert ("be an instance of OtterParallelNode, but was supplied an "
+            "instance of 'Routine'" in str(err.value))
+    analysis = OtterSynchroniseRegionTrans.create_analysis(parallel)
+    deps = [OtterSynchroniseRegionTrans.get_forward_dependence(
+        taskloop, parallel, analysis) for taskloop in taskloops]
+    assert deps[0] is taskloops[2]
+    assert deps[1] is taskloops[2]
+    assert deps[2] is taskloops[3]
+    assert deps[3] is None
+    assert all(loop.first_of(OtterTaskNode) for loop in taskloops)
+
+    OtterSynchroniseRegionTrans().apply(parallel)
+    body = parallel.children[0].children
+    assert [type(node) for node in body] == [
+        Loop, Loop, OtterSynchroniseChildrenNode, Loop,
+        OtterSynchroniseChildrenNode, Loop]
+    # A synchronisation node acts as a barrier.
+    analysis = OtterSynchroniseRegionTrans.create_analysis(parallel)
+    assert OtterSynchroniseRegionTrans.get_forward_dependence(
+        taskloops[0], parallel, analysis) is body[2]
@@ -2162,6 +2162,15 @@ class Dynamo0p3RedundantComputationTrans(LoopTrans):
       redundant computation to be modified, but only if the depth is
       increased.
 
+    * When this transformation is applied to several loops of a schedule
+      within the `halo_analysis_session` of the schedule, the halo
+      exchanges of all the loops are placed with a single analysis of
+      the schedule:
+
+      >>> with schedule.halo_analysis_session():
+      ...     for loop in schedule.walk(DynLoop):
+      ...         rc_trans.apply(loop, {"depth": 2})
+
     '''
     def __str__(self):
         return "Change iteration space to perform redundant computation"